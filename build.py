@@ -4,7 +4,7 @@ from distutils.extension import Extension
 
 ext_modules = [
     Extension(
-        "rpiolib",
+        "pyrpio.rpiolib",
         include_dirs=['/usr/local/include', 'pyrpio/lib'],
         library_dirs=['/usr/local/lib'],
         sources=[
@@ -16,23 +16,23 @@ ext_modules = [
 ]
 
 
-class BuildFailed(Exception):
-    pass
-
-
 class ExtBuilder(build_ext):
+    """
+    The C extension is optional: on failure the package installs without it
+    and pure-Python backends are used instead.
+    """
 
     def run(self):
         try:
             build_ext.run(self)
         except (DistutilsPlatformError, FileNotFoundError):
-            raise BuildFailed('File not found. Could not compile C extension.')
+            self.warn('File not found. Could not compile C extension, skipping.')
 
     def build_extension(self, ext):
         try:
             build_ext.build_extension(self, ext)
         except (CCompilerError, DistutilsExecError, DistutilsPlatformError, ValueError):
-            raise BuildFailed('Could not compile C extension.')
+            self.warn('Could not compile C extension, skipping.')
 
 
 def build(setup_kwargs):
@@ -0,0 +1,58 @@
+""" Lookup tables shared by bit-banged serial engines (MDIO, SPI, I2C).
+    Pin states encode clock and data lines as bit masks (see CdevGPIOPair.CLK/DATA).
+    Each data bit becomes two states: data set with clock low, then clock high.
+"""
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+from pyrpio.gpio import CdevGPIOPair
+
+# Sample (0/1 or bool) -> ASCII digit, for int(..., 2) decode
+_SAMPLE_DIGITS = bytes.maketrans(b'\x00\x01', b'01')
+
+
+@lru_cache(maxsize=None)
+def byte_states(clk: int = CdevGPIOPair.CLK, data: int = CdevGPIOPair.DATA) -> Tuple[Tuple[int, ...], ...]:
+    """ Table of 16 pin states (8 bits MSB first) per byte value.
+        Args:
+            clk (int, optional): Clock state mask. Defaults to CdevGPIOPair.CLK.
+            data (int, optional): Data state mask. Defaults to CdevGPIOPair.DATA.
+        Returns:
+            Tuple[Tuple[int, ...], ...]: 256 entries of 16 states
+    """
+    table = []
+    for byte in range(256):
+        states: List[int] = []
+        for i in range(7, -1, -1):
+            bit = data if (byte >> i) & 1 else 0
+            states += (bit, clk | bit)
+        table.append(tuple(states))
+    return tuple(table)
+
+
+def bit_states(val: int, bits: int, clk: int = CdevGPIOPair.CLK, data: int = CdevGPIOPair.DATA) -> List[int]:
+    """ Serialize value MSB first into pin states, one table lookup per byte.
+        Args:
+            val (int): Value
+            bits (int): Number of bits
+        Returns:
+            List[int]: 2 * bits pin states
+    """
+    table = byte_states(clk, data)
+    states: List[int] = []
+    head = bits % 8
+    if head:
+        states += table[(val >> (bits - head)) & ((1 << head) - 1)][16 - 2 * head:]
+    for shift in range(bits - head - 8, -1, -8):
+        states += table[(val >> shift) & 0xFF]
+    return states
+
+
+def samples_to_int(samples: Iterable[int]) -> int:
+    """ Decode data samples (0/1 or bool, MSB first) into int in one pass.
+        Args:
+            samples (Iterable[int]): Sampled bits, e.g. bytearray
+        Returns:
+            int: Value
+    """
+    digits = bytes(samples).translate(_SAMPLE_DIGITS)
+    return int(digits, 2) if digits else 0
@@ -1,4 +1,5 @@
 # pylint: skip-file
+import array
 import collections
 import ctypes
 import errno
@@ -8,6 +9,11 @@ import os.path
 import select
 import time
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class GPIOError(IOError):
     """Base class for GPIO errors."""
@@ -396,6 +402,14 @@ class _CGpiohandleRequest(ctypes.Structure):
     ]
 
 
+class _CGpiohandleConfig(ctypes.Structure):
+    _fields_ = [
+        ('flags', ctypes.c_uint32),
+        ('default_values', ctypes.c_uint8 * 64),
+        ('padding', ctypes.c_uint32 * 4),
+    ]
+
+
 class _CGpiohandleData(ctypes.Structure):
     _fields_ = [
         ('values', ctypes.c_uint8 * 64),
@@ -419,10 +433,103 @@ class _CGpioeventData(ctypes.Structure):
     ]
 
 
+# GPIO v2 uAPI constants scraped from <linux/gpio.h>, shared by CdevGPIO, CdevGPIOPair and GPIOBank
+_GPIO_V2_GET_LINE_IOCTL = 0xc250b407
+_GPIO_V2_LINE_SET_CONFIG_IOCTL = 0xc110b40d
+_GPIO_V2_LINE_GET_VALUES_IOCTL = 0xc010b40e
+_GPIO_V2_LINE_SET_VALUES_IOCTL = 0xc010b40f
+_GPIO_V2_LINE_FLAG_ACTIVE_LOW = 0x2
+_GPIO_V2_LINE_FLAG_INPUT = 0x4
+_GPIO_V2_LINE_FLAG_OUTPUT = 0x8
+_GPIO_V2_LINE_FLAG_EDGE_RISING = 0x10
+_GPIO_V2_LINE_FLAG_EDGE_FALLING = 0x20
+_GPIO_V2_LINE_FLAG_OPEN_DRAIN = 0x40
+_GPIO_V2_LINE_FLAG_OPEN_SOURCE = 0x80
+_GPIO_V2_LINE_FLAG_BIAS_PULL_UP = 0x100
+_GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN = 0x200
+_GPIO_V2_LINE_FLAG_BIAS_DISABLED = 0x400
+_GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME = 0x800
+_GPIO_V2_LINE_FLAG_EVENT_CLOCK_HTE = 0x1000
+_GPIO_V2_LINE_ATTR_ID_FLAGS = 1
+_GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES = 2
+_GPIO_V2_LINE_ATTR_ID_DEBOUNCE = 3
+_GPIO_V2_LINE_EVENT_RISING_EDGE = 0x1
+_GPIO_V2_LINE_EVENT_FALLING_EDGE = 0x2
+
+
+def _v2_unsupported(e, v2_only=False):
+    # Kernels without v2 uAPI answer its ioctls with ENOTTY or, on older
+    # releases, EINVAL. EINVAL for a request with v2-only options is genuine.
+    return e.errno == errno.ENOTTY or (e.errno == errno.EINVAL and not v2_only)
+
+
+class _CGpioV2LineAttribute(ctypes.Structure):
+    class _U(ctypes.Union):
+        _fields_ = [
+            ('flags', ctypes.c_uint64),
+            ('values', ctypes.c_uint64),
+            ('debounce_period_us', ctypes.c_uint32),
+        ]
+
+    _anonymous_ = ('u',)
+    _fields_ = [
+        ('id', ctypes.c_uint32),
+        ('padding', ctypes.c_uint32),
+        ('u', _U),
+    ]
+
+
+class _CGpioV2LineConfigAttribute(ctypes.Structure):
+    _fields_ = [
+        ('attr', _CGpioV2LineAttribute),
+        ('mask', ctypes.c_uint64),
+    ]
+
+
+class _CGpioV2LineConfig(ctypes.Structure):
+    _fields_ = [
+        ('flags', ctypes.c_uint64),
+        ('num_attrs', ctypes.c_uint32),
+        ('padding', ctypes.c_uint32 * 5),
+        ('attrs', _CGpioV2LineConfigAttribute * 10),
+    ]
+
+
+class _CGpioV2LineRequest(ctypes.Structure):
+    _fields_ = [
+        ('offsets', ctypes.c_uint32 * 64),
+        ('consumer', ctypes.c_char * 32),
+        ('config', _CGpioV2LineConfig),
+        ('num_lines', ctypes.c_uint32),
+        ('event_buffer_size', ctypes.c_uint32),
+        ('padding', ctypes.c_uint32 * 5),
+        ('fd', ctypes.c_int32),
+    ]
+
+
+class _CGpioV2LineValues(ctypes.Structure):
+    _fields_ = [
+        ('bits', ctypes.c_uint64),
+        ('mask', ctypes.c_uint64),
+    ]
+
+
+class _CGpioV2LineEvent(ctypes.Structure):
+    _fields_ = [
+        ('timestamp_ns', ctypes.c_uint64),
+        ('id', ctypes.c_uint32),
+        ('offset', ctypes.c_uint32),
+        ('seqno', ctypes.c_uint32),
+        ('line_seqno', ctypes.c_uint32),
+        ('padding', ctypes.c_uint32 * 6),
+    ]
+
+
 class CdevGPIO(GPIO):
     # Constants scraped from <linux/gpio.h>
     _GPIOHANDLE_GET_LINE_VALUES_IOCTL = 0xc040b408
     _GPIOHANDLE_SET_LINE_VALUES_IOCTL = 0xc040b409
+    _GPIOHANDLE_SET_CONFIG_IOCTL = 0xc054b40a
     _GPIO_GET_CHIPINFO_IOCTL = 0x8044b401
     _GPIO_GET_LINEINFO_IOCTL = 0xc048b402
     _GPIO_GET_LINEHANDLE_IOCTL = 0xc16cb403
@@ -441,7 +548,12 @@ class CdevGPIO(GPIO):
     _GPIOEVENT_EVENT_RISING_EDGE = 0x1
     _GPIOEVENT_EVENT_FALLING_EDGE = 0x2
 
-    def __init__(self, path, line, direction, edge="none", bias="default", drive="default", inverted=False, label=None):
+    # Edge ids returned by read_events (same for v1 and v2 uAPI)
+    EDGE_RISING = 0x1
+    EDGE_FALLING = 0x2
+
+    def __init__(self, path, line, direction, edge="none", bias="default", drive="default", inverted=False, label=None,
+                 debounce_us=0, event_buffer_size=0, event_clock="monotonic", uapi="auto"):
         """**Character device GPIO**
 
         Instantiate a GPIO object and open the character device GPIO with the
@@ -449,6 +561,11 @@ class CdevGPIO(GPIO):
         "/dev/gpiochip0"). Defaults properties can be overridden with keyword
         arguments.
 
+        `fast_read()` and `fast_write(value)` are bound to the open line and
+        reuse preallocated ioctl buffers. They skip argument and direction
+        checks and raise `OSError` directly, for tight bit-bang loops. They are
+        rebound whenever the line is reopened.
+
         Args:
             path (str): GPIO chip character device path.
             line (int, str): GPIO line number or name.
@@ -462,6 +579,16 @@ class CdevGPIO(GPIO):
                          "open_source".
             inverted (bool): GPIO is inverted (active low).
             label (str, None): GPIO line consumer label.
+            debounce_us (int): input debounce period in microseconds, 0 to
+                               disable. Requires v2 uAPI.
+            event_buffer_size (int): kernel edge event FIFO size, 0 for
+                                     default. Requires v2 uAPI.
+            event_clock (str): edge event timestamp clock, can be
+                               "monotonic", "realtime", or "hte" (hardware
+                               timestamp engine). Requires v2 uAPI except
+                               "monotonic".
+            uapi (str): character device uAPI, can be "auto", "v1", or "v2".
+                        "auto" uses v2 if the kernel supports it (5.10+).
 
         Returns:
             CdevGPIO: GPIO object.
@@ -469,9 +596,12 @@ class CdevGPIO(GPIO):
         Raises:
             GPIOError: if an I/O or OS error occurs.
             TypeError: if `path`, `line`, `direction`, `edge`, `bias`, `drive`,
-                       `inverted`, or `label` types are invalid.
-            ValueError: if `direction`, `edge`, `bias`, or `drive` value is
-                        invalid.
+                       `inverted`, `label`, `debounce_us`,
+                       `event_buffer_size`, `event_clock`, or `uapi` types are
+                       invalid.
+            ValueError: if `direction`, `edge`, `bias`, `drive`,
+                        `debounce_us`, `event_buffer_size`, `event_clock`, or
+                        `uapi` value is invalid.
             LookupError: if the GPIO line was not found by the provided name.
 
         """
@@ -485,13 +615,33 @@ class CdevGPIO(GPIO):
         self._drive = None
         self._inverted = None
         self._label = None
-
-        self._open(path, line, direction, edge, bias, drive, inverted, label)
+        self._set_config_supported = True
+        self._uapi = None
+        self._debounce_us = 0
+        self._event_buffer_size = 0
+        self._event_clock = "monotonic"
+        self._line_seqno = None
+        self._dropped_events = 0
+        self._event_buf = None
+        self._event_view = None
+
+        # Reused ioctl buffers, writes index by value
+        self._data = _CGpiohandleData()
+        self._data_value = ctypes.c_uint8.from_buffer(self._data)
+        self._write_data = (_CGpiohandleData(), _CGpiohandleData())
+        self._write_data[1].values[0] = 1
+        self._values = _CGpioV2LineValues(bits=0, mask=0x1)
+        self._write_values = (_CGpioV2LineValues(bits=0, mask=0x1), _CGpioV2LineValues(bits=1, mask=0x1))
+        self._bind_fast_path()
+
+        self._open(path, line, direction, edge, bias, drive, inverted, label,
+                   debounce_us, event_buffer_size, event_clock, uapi)
 
     def __new__(self, path, line, direction, **kwargs):
         return object.__new__(CdevGPIO)
 
-    def _open(self, path, line, direction, edge, bias, drive, inverted, label):
+    def _open(self, path, line, direction, edge, bias, drive, inverted, label,
+              debounce_us=0, event_buffer_size=0, event_clock="monotonic", uapi="auto"):
         if not isinstance(path, str):
             raise TypeError("Invalid path type, should be string.")
 
@@ -528,6 +678,28 @@ class CdevGPIO(GPIO):
         if not isinstance(label, (type(None), str)):
             raise TypeError("Invalid label type, should be None or str.")
 
+        if not isinstance(debounce_us, int):
+            raise TypeError("Invalid debounce type, should be integer.")
+        elif debounce_us < 0:
+            raise ValueError("Invalid debounce, should be non-negative.")
+
+        if not isinstance(event_buffer_size, int):
+            raise TypeError("Invalid event buffer size type, should be integer.")
+        elif event_buffer_size < 0:
+            raise ValueError("Invalid event buffer size, should be non-negative.")
+
+        if not isinstance(event_clock, str):
+            raise TypeError("Invalid event clock type, should be string.")
+        elif event_clock.lower() not in ["monotonic", "realtime", "hte"]:
+            raise ValueError(
+                "Invalid event clock, can be: \"monotonic\", \"realtime\", \"hte\".")
+
+        if not isinstance(uapi, str):
+            raise TypeError("Invalid uapi type, should be string.")
+        elif uapi.lower() not in ["auto", "v1", "v2"]:
+            raise ValueError(
+                "Invalid uapi, can be: \"auto\", \"v1\", \"v2\".")
+
         if isinstance(line, str):
             line = self._find_line_by_name(path, line)
 
@@ -540,10 +712,22 @@ class CdevGPIO(GPIO):
         self._devpath = path
         self._line = line
         self._label = label.encode() if label is not None else b"periphery"
+        self._debounce_us = debounce_us
+        self._event_buffer_size = event_buffer_size
+        self._event_clock = event_clock
+        self._uapi = uapi.lower()
 
         self._reopen(direction, edge, bias, drive, inverted)
 
     def _reopen(self, direction, edge, bias, drive, inverted):
+        if self._uapi != "v1" and self._reopen_v2(direction, edge, bias, drive, inverted):
+            self._bind_fast_path()
+            return
+
+        if self._debounce_us or self._event_buffer_size or self._event_clock != "monotonic":
+            raise GPIOError(
+                None, "Invalid operation: debounce, event buffer size and event clock require GPIO v2 uAPI")
+
         flags = 0
 
         if bias == "pull_up":
@@ -561,9 +745,14 @@ class CdevGPIO(GPIO):
         if inverted:
             flags |= CdevGPIO._GPIOHANDLE_REQUEST_ACTIVE_LOW
 
-        # FIXME this should really use GPIOHANDLE_SET_CONFIG_IOCTL instead of
-        # closing and reopening, especially to preserve output value on
-        # configuration changes
+        # Reconfigure line handle in place, so the line stays requested
+        if self._line_fd is not None and self._edge == "none" and edge == "none" and self._set_config_supported:
+            if self._reconfigure(direction, flags, inverted):
+                self._direction = "in" if direction == "in" else "out"
+                self._bias = bias
+                self._drive = drive
+                self._inverted = inverted
+                return
 
         # Close existing line
         if self._line_fd is not None:
@@ -633,6 +822,157 @@ class CdevGPIO(GPIO):
         self._bias = bias
         self._drive = drive
         self._inverted = inverted
+        self._bind_fast_path()
+
+    def _bind_fast_path(self):
+        # Closures over current line fd and reused buffers, rebound whenever the line is (re)opened
+        ioctl = fcntl.ioctl
+        fd = self._line_fd
+
+        if self._uapi == "v2":
+            read_request = _GPIO_V2_LINE_GET_VALUES_IOCTL
+            read_buf = self._values
+            write_request = _GPIO_V2_LINE_SET_VALUES_IOCTL
+            write_bufs = self._write_values
+
+            def fast_read():
+                ioctl(fd, read_request, read_buf)
+                return bool(read_buf.bits)
+        else:
+            read_request = CdevGPIO._GPIOHANDLE_GET_LINE_VALUES_IOCTL
+            read_buf = self._data
+            read_value = self._data_value
+            write_request = CdevGPIO._GPIOHANDLE_SET_LINE_VALUES_IOCTL
+            write_bufs = self._write_data
+
+            def fast_read():
+                ioctl(fd, read_request, read_buf)
+                return bool(read_value.value)
+
+        def fast_write(value):
+            ioctl(fd, write_request, write_bufs[value])
+
+        self.fast_read = fast_read
+        self.fast_write = fast_write
+
+    def _build_v2_config(self, config, direction, edge, bias, drive, inverted):
+        flags = 0
+
+        if bias == "pull_up":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+        elif bias == "pull_down":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN
+        elif bias == "disable":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_DISABLED
+
+        if inverted:
+            flags |= _GPIO_V2_LINE_FLAG_ACTIVE_LOW
+
+        num_attrs = 0
+        if direction == "in":
+            flags |= _GPIO_V2_LINE_FLAG_INPUT
+
+            if edge in ("rising", "both"):
+                flags |= _GPIO_V2_LINE_FLAG_EDGE_RISING
+            if edge in ("falling", "both"):
+                flags |= _GPIO_V2_LINE_FLAG_EDGE_FALLING
+            if edge != "none" and self._event_clock == "realtime":
+                flags |= _GPIO_V2_LINE_FLAG_EVENT_CLOCK_REALTIME
+            elif edge != "none" and self._event_clock == "hte":
+                flags |= _GPIO_V2_LINE_FLAG_EVENT_CLOCK_HTE
+
+            if self._debounce_us:
+                config.attrs[num_attrs].attr.id = _GPIO_V2_LINE_ATTR_ID_DEBOUNCE
+                config.attrs[num_attrs].attr.debounce_period_us = self._debounce_us
+                config.attrs[num_attrs].mask = 0x1
+                num_attrs += 1
+        else:
+            flags |= _GPIO_V2_LINE_FLAG_OUTPUT
+
+            if drive == "open_drain":
+                flags |= _GPIO_V2_LINE_FLAG_OPEN_DRAIN
+            elif drive == "open_source":
+                flags |= _GPIO_V2_LINE_FLAG_OPEN_SOURCE
+
+            initial_value = True if direction == "high" else False
+            initial_value ^= inverted
+
+            config.attrs[num_attrs].attr.id = _GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES
+            config.attrs[num_attrs].attr.values = int(initial_value)
+            config.attrs[num_attrs].mask = 0x1
+            num_attrs += 1
+
+        config.flags = flags
+        config.num_attrs = num_attrs
+
+    def _reopen_v2(self, direction, edge, bias, drive, inverted):
+        # Flags, output value and debounce go in one request, and the
+        # request is reconfigured in place (incl. edge detection)
+        if self._line_fd is not None and self._uapi == "v2":
+            config = _CGpioV2LineConfig()
+            self._build_v2_config(config, direction, edge, bias, drive, inverted)
+
+            try:
+                fcntl.ioctl(self._line_fd,
+                            _GPIO_V2_LINE_SET_CONFIG_IOCTL, config)
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Setting line config: " + e.strerror)
+        else:
+            request = _CGpioV2LineRequest()
+            request.offsets[0] = self._line
+            request.consumer = self._label
+            request.num_lines = 1
+            request.event_buffer_size = self._event_buffer_size
+            self._build_v2_config(request.config, direction, edge, bias, drive, inverted)
+
+            try:
+                fcntl.ioctl(self._chip_fd,
+                            _GPIO_V2_GET_LINE_IOCTL, request)
+            except (OSError, IOError) as e:
+                # Kernels before 5.10 lack v2 uAPI, fall back to v1 line handles
+                v2_only = self._debounce_us or self._event_buffer_size or self._event_clock != "monotonic"
+                if self._uapi == "auto" and _v2_unsupported(e, v2_only):
+                    self._uapi = "v1"
+                    return False
+                raise GPIOError(e.errno, "Opening line request: " + e.strerror)
+
+            self._line_fd = request.fd
+            self._uapi = "v2"
+
+        if edge != self._edge:
+            self._line_seqno = None
+
+        self._direction = "in" if direction == "in" else "out"
+        self._edge = edge
+        self._bias = bias
+        self._drive = drive
+        self._inverted = inverted
+        return True
+
+    def _reconfigure(self, direction, flags, inverted):
+        config = _CGpiohandleConfig()
+
+        if direction == "in":
+            config.flags = flags | CdevGPIO._GPIOHANDLE_REQUEST_INPUT
+        else:
+            initial_value = True if direction == "high" else False
+            initial_value ^= inverted
+
+            config.flags = flags | CdevGPIO._GPIOHANDLE_REQUEST_OUTPUT
+            config.default_values[0] = initial_value
+
+        try:
+            fcntl.ioctl(self._line_fd,
+                        CdevGPIO._GPIOHANDLE_SET_CONFIG_IOCTL, config)
+        except (OSError, IOError) as e:
+            # Kernels before 5.5 lack GPIOHANDLE_SET_CONFIG_IOCTL, fall back to reopening
+            if e.errno in (errno.ENOTTY, errno.EINVAL):
+                self._set_config_supported = False
+                return False
+            raise GPIOError(
+                e.errno, "Setting line handle config: " + e.strerror)
+
+        return True
 
     def _find_line_by_name(self, path, line):
         # Open GPIO chip
@@ -677,16 +1017,11 @@ class CdevGPIO(GPIO):
     # Methods
 
     def read(self):
-        data = _CGpiohandleData()
-
         try:
-            fcntl.ioctl(self._line_fd,
-                        CdevGPIO._GPIOHANDLE_GET_LINE_VALUES_IOCTL, data)
+            return self.fast_read()
         except (OSError, IOError) as e:
             raise GPIOError(e.errno, "Getting line value: " + e.strerror)
 
-        return bool(data.values[0])
-
     def write(self, value):
         if not isinstance(value, bool):
             raise TypeError("Invalid value type, should be bool.")
@@ -694,13 +1029,8 @@ class CdevGPIO(GPIO):
             raise GPIOError(
                 None, "Invalid operation: cannot write to input GPIO")
 
-        data = _CGpiohandleData()
-
-        data.values[0] = value
-
         try:
-            fcntl.ioctl(self._line_fd,
-                        CdevGPIO._GPIOHANDLE_SET_LINE_VALUES_IOCTL, data)
+            self.fast_write(value)
         except (OSError, IOError) as e:
             raise GPIOError(e.errno, "Setting line value: " + e.strerror)
 
@@ -732,6 +1062,9 @@ class CdevGPIO(GPIO):
         elif self._edge == "none":
             raise GPIOError(None, "Invalid operation: GPIO edge not set")
 
+        if self._uapi == "v2":
+            return self._read_event_v2()
+
         try:
             buf = os.read(self._line_fd, ctypes.sizeof(_CGpioeventData))
         except OSError as e:
@@ -750,6 +1083,97 @@ class CdevGPIO(GPIO):
 
         return EdgeEvent(edge, timestamp)
 
+    def _read_event_v2(self):
+        try:
+            buf = os.read(self._line_fd, ctypes.sizeof(_CGpioV2LineEvent))
+        except OSError as e:
+            raise GPIOError(e.errno, "Reading GPIO event: " + e.strerror)
+
+        event_data = _CGpioV2LineEvent.from_buffer_copy(buf)
+
+        if event_data.id == _GPIO_V2_LINE_EVENT_RISING_EDGE:
+            edge = "rising"
+        elif event_data.id == _GPIO_V2_LINE_EVENT_FALLING_EDGE:
+            edge = "falling"
+        else:
+            edge = "none"
+
+        self._count_seqno(event_data.line_seqno)
+
+        return EdgeEvent(edge, event_data.timestamp_ns)
+
+    def read_events(self, max_events=64, as_numpy=False):
+        """Read up to `max_events` pending edge events with one read into a
+        reused buffer. Blocks until at least one event is pending, see
+        `poll()`.
+
+        Args:
+            max_events (int): maximum number of events to read.
+            as_numpy (bool): return numpy views into the read buffer (uint64
+                             timestamps, uint32 edge ids) instead of arrays.
+                             Views are valid until the next call.
+
+        Returns:
+            tuple: event timestamps in nanoseconds (``array('Q')``) and edge
+            ids (``array('B')``, `EDGE_RISING` or `EDGE_FALLING`).
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            TypeError: if `max_events` type is not int.
+            ValueError: if `max_events` is less than 1.
+            ImportError: if `as_numpy` is set and numpy is not installed.
+
+        """
+        if not isinstance(max_events, int):
+            raise TypeError("Invalid max events type, should be integer.")
+        elif max_events < 1:
+            raise ValueError("Invalid max events, should be positive.")
+
+        if self._direction != "in":
+            raise GPIOError(
+                None, "Invalid operation: cannot read event of output GPIO")
+        elif self._edge == "none":
+            raise GPIOError(None, "Invalid operation: GPIO edge not set")
+        if as_numpy and numpy is None:
+            raise ImportError("numpy is required for as_numpy.")
+
+        # v1 gpioevent_data is 16 bytes (u64 timestamp, u32 id), v2 gpio_v2_line_event is 48 bytes
+        size = ctypes.sizeof(_CGpioV2LineEvent) if self._uapi == "v2" else ctypes.sizeof(_CGpioeventData)
+        nbytes = size * max_events
+        if self._event_buf is None or len(self._event_buf) < nbytes:
+            self._event_buf = bytearray(nbytes)
+            self._event_view = memoryview(self._event_buf)
+
+        try:
+            count = os.readv(self._line_fd, [self._event_view[:nbytes]]) // size
+        except OSError as e:
+            raise GPIOError(e.errno, "Reading GPIO events: " + e.strerror)
+
+        # Fields as strided u64/u32 slices of records
+        words = size // 8
+        view = self._event_view[:count * size]
+        if as_numpy:
+            timestamps = numpy.ndarray((count,), numpy.uint64, self._event_buf, 0, (size,))
+            edges = numpy.ndarray((count,), numpy.uint32, self._event_buf, 8, (size,))
+        else:
+            timestamps = array.array('Q', view.cast('Q')[::words])
+            edges = array.array('B', view.cast('I')[2::2 * words])
+
+        if self._uapi == "v2" and count:
+            line_seqnos = view.cast('I')[5::2 * words]
+            self._count_seqno(line_seqnos[0])
+            # Consecutive within batch unless kernel FIFO overflowed
+            self._dropped_events += (line_seqnos[-1] - line_seqnos[0] - (count - 1)) & 0xFFFFFFFF
+            self._line_seqno = line_seqnos[-1]
+
+        return timestamps, edges
+
+    def _count_seqno(self, line_seqno):
+        # Kernel numbers line events consecutively, gaps are edges dropped on FIFO overflow
+        if self._line_seqno is not None:
+            self._dropped_events += (line_seqno - self._line_seqno - 1) & 0xFFFFFFFF
+        self._line_seqno = line_seqno
+
     def close(self):
         try:
             if self._line_fd is not None:
@@ -768,6 +1192,7 @@ class CdevGPIO(GPIO):
         self._edge = "none"
         self._direction = "in"
         self._line = None
+        self._bind_fast_path()
 
     # Immutable properties
 
@@ -813,6 +1238,40 @@ class CdevGPIO(GPIO):
     def chip_fd(self):
         return self._chip_fd
 
+    @property
+    def uapi(self):
+        """Get the character device uAPI in use, "v1" or "v2".
+
+        :type: str
+        """
+        return self._uapi
+
+    @property
+    def event_buffer_size(self):
+        """Get the requested kernel edge event FIFO size, 0 for default.
+
+        :type: int
+        """
+        return self._event_buffer_size
+
+    @property
+    def line_seqno(self):
+        """Get the line sequence number of the last edge event read (v2 uAPI),
+        or None.
+
+        :type: int, None
+        """
+        return self._line_seqno
+
+    @property
+    def dropped_events(self):
+        """Get the number of edge events dropped by the kernel, counted from
+        gaps in event sequence numbers (v2 uAPI).
+
+        :type: int
+        """
+        return self._dropped_events
+
     @property
     def chip_name(self):
         chip_info = _CGpiochipInfo()
@@ -934,6 +1393,72 @@ class CdevGPIO(GPIO):
 
     inverted = property(_get_inverted, _set_inverted)
 
+    def _get_debounce_us(self):
+        return self._debounce_us
+
+    def _set_debounce_us(self, debounce_us):
+        if not isinstance(debounce_us, int):
+            raise TypeError("Invalid debounce type, should be integer.")
+        if debounce_us < 0:
+            raise ValueError("Invalid debounce, should be non-negative.")
+
+        if self._debounce_us == debounce_us:
+            return
+
+        old, self._debounce_us = self._debounce_us, debounce_us
+        try:
+            self._reopen(self._direction, self._edge,
+                         self._bias, self._drive, self._inverted)
+        except GPIOError:
+            self._debounce_us = old
+            raise
+
+    debounce_us = property(_get_debounce_us, _set_debounce_us)
+    """Get or set the input debounce period in microseconds, 0 to disable.
+    Requires v2 uAPI.
+
+    Raises:
+        GPIOError: if an I/O or OS error occurs.
+        TypeError: if `debounce_us` type is not int.
+        ValueError: if `debounce_us` value is negative.
+
+    :type: int
+    """
+
+    def _get_event_clock(self):
+        return self._event_clock
+
+    def _set_event_clock(self, event_clock):
+        if not isinstance(event_clock, str):
+            raise TypeError("Invalid event clock type, should be string.")
+        if event_clock.lower() not in ["monotonic", "realtime", "hte"]:
+            raise ValueError(
+                "Invalid event clock, can be: \"monotonic\", \"realtime\", \"hte\".")
+
+        if self._event_clock == event_clock:
+            return
+
+        old, self._event_clock = self._event_clock, event_clock
+        try:
+            self._reopen(self._direction, self._edge,
+                         self._bias, self._drive, self._inverted)
+        except GPIOError:
+            self._event_clock = old
+            raise
+
+    event_clock = property(_get_event_clock, _set_event_clock)
+    """Get or set the edge event timestamp clock. Can be "monotonic",
+    "realtime", or "hte" (hardware timestamp engine). Requires v2 uAPI except
+    "monotonic".
+
+    Raises:
+        GPIOError: if an I/O or OS error occurs.
+        TypeError: if `event_clock` type is not str.
+        ValueError: if `event_clock` value is invalid.
+
+    :type: str
+    """
+
     # String representation
 
     def __str__(self):
@@ -982,8 +1507,900 @@ class CdevGPIO(GPIO):
         except GPIOError:
             str_chip_label = "<error>"
 
-        return "GPIO {:d} (name=\"{:s}\", label=\"{:s}\", device={:s}, line_fd={:d}, chip_fd={:d}, direction={:s}, edge={:s}, bias={:s}, drive={:s}, inverted={:s}, chip_name=\"{:s}\", chip_label=\"{:s}\", type=cdev)" \
-            .format(self._line, str_name, str_label, self._devpath, self._line_fd, self._chip_fd, str_direction, str_edge, str_bias, str_drive, str_inverted, str_chip_name, str_chip_label)
+        return "GPIO {:d} (name=\"{:s}\", label=\"{:s}\", device={:s}, line_fd={:d}, chip_fd={:d}, direction={:s}, edge={:s}, bias={:s}, drive={:s}, inverted={:s}, chip_name=\"{:s}\", chip_label=\"{:s}\", type={:s})" \
+            .format(self._line, str_name, str_label, self._devpath, self._line_fd, self._chip_fd, str_direction, str_edge, str_bias, str_drive, str_inverted, str_chip_name, str_chip_label,
+                    "cdev-v2" if self._uapi == "v2" else "cdev")
+
+
+class CdevGPIOPair(object):
+    # Line bits of pin state
+    CLK = 0x2
+    DATA = 0x1
+
+    def __init__(self, path, clk_line, data_line, data_bias="pull_up", label=None):
+        """**Character device GPIO clock/data pair**
+
+        Request a clock line (output) and a bidirectional data line from the
+        GPIO chip at the specified path in a single line handle, so that both
+        lines can be driven with one ioctl. Pin states are integers with bit
+        `CLK` driving the clock line and bit `DATA` driving the data line.
+        Lines start with clock low and data high.
+
+        The v2 character device uAPI is required to configure the lines
+        individually. On older kernels two `CdevGPIO` lines are used instead.
+
+        Args:
+            path (str): GPIO chip character device path.
+            clk_line (int): clock GPIO line number.
+            data_line (int): data GPIO line number.
+            data_bias (str): data line bias, can be "default", "pull_up",
+                             "pull_down", or "disable".
+            label (str, None): GPIO line consumer label.
+
+        Returns:
+            CdevGPIOPair: GPIO pair object.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            TypeError: if `path`, `clk_line`, `data_line`, `data_bias`, or
+                       `label` types are invalid.
+            ValueError: if `data_bias` value is invalid.
+
+        """
+        self._line_fd = None
+        self._chip_fd = None
+        self._clk_gpio = None
+        self._data_gpio = None
+        self._state = CdevGPIOPair.DATA
+        self._data_direction = "high"
+
+        self._open(path, clk_line, data_line, data_bias, label)
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def _open(self, path, clk_line, data_line, data_bias, label):
+        if not isinstance(path, str):
+            raise TypeError("Invalid path type, should be string.")
+
+        if not isinstance(clk_line, int) or not isinstance(data_line, int):
+            raise TypeError("Invalid line type, should be integer.")
+
+        if not isinstance(data_bias, str):
+            raise TypeError("Invalid bias type, should be string.")
+        elif data_bias.lower() not in ["default", "pull_up", "pull_down", "disable"]:
+            raise ValueError(
+                "Invalid bias, can be: \"default\", \"pull_up\", \"pull_down\", \"disable\".")
+
+        if not isinstance(label, (type(None), str)):
+            raise TypeError("Invalid label type, should be None or str.")
+
+        self._devpath = path
+        self._clk_line = clk_line
+        self._data_line = data_line
+        self._data_bias = data_bias
+        self._label = label.encode() if label is not None else b"periphery"
+
+        # Prebuilt values, indexed by pin state
+        self._values = []
+        for state in range(4):
+            values = _CGpioV2LineValues()
+            values.bits = state
+            values.mask = CdevGPIOPair.CLK | CdevGPIOPair.DATA
+            self._values.append(values)
+        self._clk_values = []
+        for state in (0, CdevGPIOPair.CLK):
+            values = _CGpioV2LineValues()
+            values.bits = state
+            values.mask = CdevGPIOPair.CLK
+            self._clk_values.append(values)
+        self._data_values = _CGpioV2LineValues()
+        self._data_values.mask = CdevGPIOPair.DATA
+
+        # Open GPIO chip
+        try:
+            self._chip_fd = os.open(path, 0)
+        except OSError as e:
+            raise GPIOError(e.errno, "Opening GPIO chip: " + e.strerror)
+
+        # Request data (bit 0) and clock (bit 1) lines together
+        request = _CGpioV2LineRequest()
+        request.offsets[0] = data_line
+        request.offsets[1] = clk_line
+        request.consumer = self._label
+        request.num_lines = 2
+        self._build_config(request.config, "high")
+
+        try:
+            fcntl.ioctl(self._chip_fd, _GPIO_V2_GET_LINE_IOCTL, request)
+        except (OSError, IOError) as e:
+            if not _v2_unsupported(e):
+                raise GPIOError(e.errno, "Opening line pair handle: " + e.strerror)
+
+            # Fall back to separate v1 line handles
+            try:
+                os.close(self._chip_fd)
+            except OSError as e:
+                raise GPIOError(e.errno, "Closing GPIO chip: " + e.strerror)
+            self._chip_fd = None
+            self._clk_gpio = CdevGPIO(path, clk_line, "low", label=label)
+            self._data_gpio = CdevGPIO(path, data_line, "high", bias=data_bias, label=label)
+            return
+
+        self._line_fd = request.fd
+
+    def _build_config(self, config, data_direction):
+        data_flags = _GPIO_V2_LINE_FLAG_INPUT if data_direction == "in" else _GPIO_V2_LINE_FLAG_OUTPUT
+
+        if self._data_bias == "pull_up":
+            data_flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+        elif self._data_bias == "pull_down":
+            data_flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN
+        elif self._data_bias == "disable":
+            data_flags |= _GPIO_V2_LINE_FLAG_BIAS_DISABLED
+
+        config.flags = _GPIO_V2_LINE_FLAG_OUTPUT
+
+        config.attrs[0].attr.id = _GPIO_V2_LINE_ATTR_ID_FLAGS
+        config.attrs[0].attr.flags = data_flags
+        config.attrs[0].mask = CdevGPIOPair.DATA
+
+        # Keep clock at current level, initialize data output
+        config.attrs[1].attr.id = _GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES
+        if data_direction == "in":
+            config.attrs[1].attr.values = self._state & CdevGPIOPair.CLK
+            config.attrs[1].mask = CdevGPIOPair.CLK
+        else:
+            config.attrs[1].attr.values = self._state
+            config.attrs[1].mask = CdevGPIOPair.CLK | CdevGPIOPair.DATA
+
+        config.num_attrs = 2
+
+    # Methods
+
+    def write(self, state):
+        """Drive clock and data lines to pin `state` in one operation.
+
+        Args:
+            state (int): pin state, bitwise-OR of `CLK` and `DATA`.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+
+        """
+        if self._line_fd is None:
+            change = self._state ^ state
+            if change & CdevGPIOPair.CLK:
+                self._clk_gpio.write(bool(state & CdevGPIOPair.CLK))
+            if change & CdevGPIOPair.DATA:
+                self._data_gpio.write(bool(state & CdevGPIOPair.DATA))
+            self._state = state
+            return
+
+        try:
+            fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_SET_VALUES_IOCTL, self._values[state])
+        except (OSError, IOError) as e:
+            raise GPIOError(e.errno, "Setting line values: " + e.strerror)
+
+        self._state = state
+
+    def write_clk(self, value):
+        """Drive clock line only, e.g. while data line is an input.
+
+        Args:
+            value (bool): ``True`` for high state, ``False`` for low state.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+
+        """
+        if self._line_fd is None:
+            self._clk_gpio.write(value)
+        else:
+            try:
+                fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_SET_VALUES_IOCTL, self._clk_values[value])
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Setting line values: " + e.strerror)
+
+        self._state = (self._state & CdevGPIOPair.DATA) | (CdevGPIOPair.CLK if value else 0)
+
+    def read_data(self):
+        """Read the state of the data line.
+
+        Returns:
+            bool: ``True`` for high state, ``False`` for low state.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+
+        """
+        if self._line_fd is None:
+            return self._data_gpio.read()
+
+        try:
+            fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_GET_VALUES_IOCTL, self._data_values)
+        except (OSError, IOError) as e:
+            raise GPIOError(e.errno, "Getting line values: " + e.strerror)
+
+        return bool(self._data_values.bits & CdevGPIOPair.DATA)
+
+    def close(self):
+        if self._clk_gpio is not None:
+            self._clk_gpio.close()
+            self._clk_gpio = None
+
+        if self._data_gpio is not None:
+            self._data_gpio.close()
+            self._data_gpio = None
+
+        try:
+            if self._line_fd is not None:
+                os.close(self._line_fd)
+        except OSError as e:
+            raise GPIOError(e.errno, "Closing GPIO line pair: " + e.strerror)
+
+        try:
+            if self._chip_fd is not None:
+                os.close(self._chip_fd)
+        except OSError as e:
+            raise GPIOError(e.errno, "Closing GPIO chip: " + e.strerror)
+
+        self._line_fd = None
+        self._chip_fd = None
+
+    # Immutable properties
+
+    @property
+    def devpath(self):
+        return self._devpath
+
+    @property
+    def fd(self):
+        """Get the line pair file descriptor, or None when falling back to
+        separate v1 line handles.
+
+        :type: int, None
+        """
+        return self._line_fd
+
+    @property
+    def state(self):
+        """Get the last driven pin state.
+
+        :type: int
+        """
+        return self._state
+
+    # Mutable properties
+
+    def _get_data_direction(self):
+        return self._data_direction
+
+    def _set_data_direction(self, direction):
+        if not isinstance(direction, str):
+            raise TypeError("Invalid direction type, should be string.")
+        if direction.lower() not in ["in", "high", "low"]:
+            raise ValueError(
+                "Invalid direction, can be: \"in\", \"high\", \"low\".")
+
+        if self._data_direction == direction:
+            return
+
+        if direction != "in":
+            self._state = (self._state & CdevGPIOPair.CLK) | (CdevGPIOPair.DATA if direction == "high" else 0)
+
+        if self._line_fd is None:
+            self._data_gpio.direction = direction
+        else:
+            config = _CGpioV2LineConfig()
+            self._build_config(config, direction)
+            try:
+                fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_SET_CONFIG_IOCTL, config)
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Setting line pair config: " + e.strerror)
+
+        self._data_direction = direction
+
+    data_direction = property(_get_data_direction, _set_data_direction)
+    """Get or set the data line direction. Can be "in", "high", "low". The
+    clock line stays an output at its current level.
+
+    Raises:
+        GPIOError: if an I/O or OS error occurs.
+        TypeError: if `direction` type is not str.
+        ValueError: if `direction` value is invalid.
+
+    :type: str
+    """
+
+    # String representation
+
+    def __str__(self):
+        return "GPIO pair (clk={:d}, data={:d}, device={:s}, data_direction={:s}, type={:s})" \
+            .format(self._clk_line, self._data_line, self._devpath, self._data_direction,
+                    "cdev" if self._line_fd is None else "cdev-v2")
+
+
+class GPIOBank(object):
+    # Sample byte (0/1) -> ASCII digit and back, for mask conversion
+    _TO_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+    _FROM_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+    def __init__(self, path, lines, direction, bias="default", label=None, uapi="auto"):
+        """**Character device GPIO bank**
+
+        Request several lines from the GPIO chip at the specified path in a
+        single line handle, so that all lines can be sampled or driven
+        atomically with one ioctl. Values are integer masks with bit `i`
+        holding the value of `lines[i]`.
+
+        With the v2 uAPI, masked writes are done by the kernel. With v1
+        handles, unmasked lines are rewritten with their last driven value.
+
+        Args:
+            path (str): GPIO chip character device path.
+            lines (list): GPIO line numbers, at most 64.
+            direction (str): direction of all lines, can be "in", "out",
+                             "high", or "low".
+            bias (str): line bias, can be "default", "pull_up", "pull_down",
+                        or "disable".
+            label (str, None): GPIO line consumer label.
+            uapi (str): character device uAPI, can be "auto", "v1", or "v2".
+                        "auto" uses v2 if the kernel supports it (5.10+).
+
+        Returns:
+            GPIOBank: GPIO bank object.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            TypeError: if `path`, `lines`, `direction`, `bias`, `label`, or
+                       `uapi` types are invalid.
+            ValueError: if `lines`, `direction`, `bias`, or `uapi` value is
+                        invalid.
+
+        """
+        self._line_fd = None
+        self._chip_fd = None
+        self._state = 0
+        self._direction = None
+        self._uapi = None
+
+        self._open(path, lines, direction, bias, label, uapi)
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def _open(self, path, lines, direction, bias, label, uapi):
+        if not isinstance(path, str):
+            raise TypeError("Invalid path type, should be string.")
+
+        if not isinstance(lines, (list, tuple)) or not all(isinstance(line, int) for line in lines):
+            raise TypeError("Invalid lines type, should be list of integers.")
+        elif not 0 < len(lines) <= 64 or len(set(lines)) != len(lines):
+            raise ValueError("Invalid lines, should be 1 to 64 distinct lines.")
+
+        if not isinstance(direction, str):
+            raise TypeError("Invalid direction type, should be string.")
+        elif direction.lower() not in ["in", "out", "high", "low"]:
+            raise ValueError(
+                "Invalid direction, can be: \"in\", \"out\", \"high\", \"low\".")
+
+        if not isinstance(bias, str):
+            raise TypeError("Invalid bias type, should be string.")
+        elif bias.lower() not in ["default", "pull_up", "pull_down", "disable"]:
+            raise ValueError(
+                "Invalid bias, can be: \"default\", \"pull_up\", \"pull_down\", \"disable\".")
+
+        if not isinstance(label, (type(None), str)):
+            raise TypeError("Invalid label type, should be None or str.")
+
+        if not isinstance(uapi, str):
+            raise TypeError("Invalid uapi type, should be string.")
+        elif uapi.lower() not in ["auto", "v1", "v2"]:
+            raise ValueError(
+                "Invalid uapi, can be: \"auto\", \"v1\", \"v2\".")
+
+        self._devpath = path
+        self._lines = list(lines)
+        self._uapi = uapi.lower()
+        self._bias = bias
+        self._label = label.encode() if label is not None else b"periphery"
+        self._all = (1 << len(lines)) - 1
+
+        # Reused ioctl buffers
+        self._data = _CGpiohandleData()
+        self._data_addr = ctypes.addressof(self._data)
+        self._values = _CGpioV2LineValues()
+
+        # Open GPIO chip
+        try:
+            self._chip_fd = os.open(path, 0)
+        except OSError as e:
+            raise GPIOError(e.errno, "Opening GPIO chip: " + e.strerror)
+
+        self._request(direction)
+
+    def _flags(self, direction):
+        flags = CdevGPIO._GPIOHANDLE_REQUEST_INPUT if direction == "in" else CdevGPIO._GPIOHANDLE_REQUEST_OUTPUT
+
+        if self._bias == "pull_up":
+            flags |= CdevGPIO._GPIOHANDLE_REQUEST_BIAS_PULL_UP
+        elif self._bias == "pull_down":
+            flags |= CdevGPIO._GPIOHANDLE_REQUEST_BIAS_PULL_DOWN
+        elif self._bias == "disable":
+            flags |= CdevGPIO._GPIOHANDLE_REQUEST_BIAS_DISABLE
+
+        return flags
+
+    def _initial_state(self, direction):
+        if direction == "high":
+            return self._all
+        elif direction == "low":
+            return 0
+        return self._state
+
+    def _build_v2_config(self, config, direction, state):
+        flags = _GPIO_V2_LINE_FLAG_INPUT if direction == "in" else _GPIO_V2_LINE_FLAG_OUTPUT
+
+        if self._bias == "pull_up":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+        elif self._bias == "pull_down":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_PULL_DOWN
+        elif self._bias == "disable":
+            flags |= _GPIO_V2_LINE_FLAG_BIAS_DISABLED
+
+        config.flags = flags
+        config.num_attrs = 0
+
+        if direction != "in":
+            config.attrs[0].attr.id = _GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES
+            config.attrs[0].attr.values = state
+            config.attrs[0].mask = self._all
+            config.num_attrs = 1
+
+    def _request_v2(self, direction, state):
+        request = _CGpioV2LineRequest()
+        for i, line in enumerate(self._lines):
+            request.offsets[i] = line
+        request.consumer = self._label
+        request.num_lines = len(self._lines)
+        self._build_v2_config(request.config, direction, state)
+
+        try:
+            fcntl.ioctl(self._chip_fd, _GPIO_V2_GET_LINE_IOCTL, request)
+        except (OSError, IOError) as e:
+            # Kernels before 5.10 lack v2 uAPI, fall back to v1 line handle
+            if self._uapi == "auto" and _v2_unsupported(e):
+                self._uapi = "v1"
+                return False
+            raise GPIOError(e.errno, "Opening line bank request: " + e.strerror)
+
+        self._line_fd = request.fd
+        self._uapi = "v2"
+        return True
+
+    def _request(self, direction):
+        state = self._initial_state(direction)
+
+        if self._uapi != "v1" and self._request_v2(direction, state):
+            self._state = state
+            self._direction = "in" if direction == "in" else "out"
+            return
+
+        request = _CGpiohandleRequest()
+        for i, line in enumerate(self._lines):
+            request.lineoffsets[i] = line
+            request.default_values[i] = (state >> i) & 1
+        request.flags = self._flags(direction)
+        request.consumer_label = self._label
+        request.lines = len(self._lines)
+
+        try:
+            fcntl.ioctl(self._chip_fd, CdevGPIO._GPIO_GET_LINEHANDLE_IOCTL, request)
+        except (OSError, IOError) as e:
+            raise GPIOError(e.errno, "Opening line bank handle: " + e.strerror)
+
+        self._line_fd = request.fd
+        self._state = state
+        self._direction = "in" if direction == "in" else "out"
+
+    # Methods
+
+    def read_mask(self):
+        """Sample all lines in one operation.
+
+        Returns:
+            int: line values, bit `i` for `lines[i]`.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+
+        """
+        if self._uapi == "v2":
+            self._values.mask = self._all
+            try:
+                fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_GET_VALUES_IOCTL, self._values)
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Getting line values: " + e.strerror)
+            return self._values.bits
+
+        try:
+            fcntl.ioctl(self._line_fd, CdevGPIO._GPIOHANDLE_GET_LINE_VALUES_IOCTL, self._data)
+        except (OSError, IOError) as e:
+            raise GPIOError(e.errno, "Getting line values: " + e.strerror)
+
+        digits = ctypes.string_at(self._data_addr, len(self._lines))[::-1].translate(GPIOBank._TO_DIGITS)
+        return int(digits, 2)
+
+    def write_mask(self, mask, value):
+        """Drive lines selected by `mask` to `value` in one operation, other
+        lines keep their last driven value.
+
+        Args:
+            mask (int): lines to change, bit `i` for `lines[i]`.
+            value (int): line values, bit `i` for `lines[i]`.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+
+        """
+        if self._direction != "out":
+            raise GPIOError(None, "Invalid operation: cannot write to input GPIO bank")
+
+        state = ((self._state & ~mask) | (value & mask)) & self._all
+
+        if self._uapi == "v2":
+            self._values.bits = state
+            self._values.mask = mask & self._all
+            try:
+                fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_SET_VALUES_IOCTL, self._values)
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Setting line values: " + e.strerror)
+            self._state = state
+            return
+
+        values = format(state, "0{:d}b".format(len(self._lines)))[::-1].encode().translate(GPIOBank._FROM_DIGITS)
+        ctypes.memmove(self._data_addr, values, len(values))
+
+        try:
+            fcntl.ioctl(self._line_fd, CdevGPIO._GPIOHANDLE_SET_LINE_VALUES_IOCTL, self._data)
+        except (OSError, IOError) as e:
+            raise GPIOError(e.errno, "Setting line values: " + e.strerror)
+
+        self._state = state
+
+    def close(self):
+        try:
+            if self._line_fd is not None:
+                os.close(self._line_fd)
+        except OSError as e:
+            raise GPIOError(e.errno, "Closing GPIO line bank: " + e.strerror)
+
+        try:
+            if self._chip_fd is not None:
+                os.close(self._chip_fd)
+        except OSError as e:
+            raise GPIOError(e.errno, "Closing GPIO chip: " + e.strerror)
+
+        self._line_fd = None
+        self._chip_fd = None
+
+    # Immutable properties
+
+    @property
+    def devpath(self):
+        return self._devpath
+
+    @property
+    def fd(self):
+        return self._line_fd
+
+    @property
+    def uapi(self):
+        """Get the character device uAPI in use, "v1" or "v2".
+
+        :type: str
+        """
+        return self._uapi
+
+    @property
+    def lines(self):
+        """Get the line numbers, in mask bit order.
+
+        :type: list
+        """
+        return list(self._lines)
+
+    @property
+    def state(self):
+        """Get the last driven line values mask.
+
+        :type: int
+        """
+        return self._state
+
+    # Mutable properties
+
+    def _get_direction(self):
+        return self._direction
+
+    def _set_direction(self, direction):
+        if not isinstance(direction, str):
+            raise TypeError("Invalid direction type, should be string.")
+        if direction.lower() not in ["in", "out", "high", "low"]:
+            raise ValueError(
+                "Invalid direction, can be: \"in\", \"out\", \"high\", \"low\".")
+
+        state = self._initial_state(direction)
+
+        if self._uapi == "v2":
+            config = _CGpioV2LineConfig()
+            self._build_v2_config(config, direction, state)
+            try:
+                fcntl.ioctl(self._line_fd, _GPIO_V2_LINE_SET_CONFIG_IOCTL, config)
+            except (OSError, IOError) as e:
+                raise GPIOError(e.errno, "Setting line bank config: " + e.strerror)
+            self._state = state
+            self._direction = "in" if direction == "in" else "out"
+            return
+
+        config = _CGpiohandleConfig()
+        config.flags = self._flags(direction)
+        for i in range(len(self._lines)):
+            config.default_values[i] = (state >> i) & 1
+
+        try:
+            fcntl.ioctl(self._line_fd, CdevGPIO._GPIOHANDLE_SET_CONFIG_IOCTL, config)
+        except (OSError, IOError) as e:
+            # Kernels before 5.5 lack GPIOHANDLE_SET_CONFIG_IOCTL, fall back to reopening
+            if e.errno not in (errno.ENOTTY, errno.EINVAL):
+                raise GPIOError(e.errno, "Setting line bank config: " + e.strerror)
+            try:
+                os.close(self._line_fd)
+            except OSError as e:
+                raise GPIOError(e.errno, "Closing existing GPIO line bank: " + e.strerror)
+            self._line_fd = None
+            self._request(direction)
+            return
+
+        self._state = state
+        self._direction = "in" if direction == "in" else "out"
+
+    direction = property(_get_direction, _set_direction)
+    """Get or set the direction of all lines. Can be "in", "out", "high",
+    "low". "out" keeps the last driven values, e.g. when turning a parallel
+    bus around.
+
+    Raises:
+        GPIOError: if an I/O or OS error occurs.
+        TypeError: if `direction` type is not str.
+        ValueError: if `direction` value is invalid.
+
+    :type: str
+    """
+
+    # String representation
+
+    def __str__(self):
+        return "GPIO bank (lines={:s}, device={:s}, line_fd={:d}, direction={:s}, type={:s})" \
+            .format(str(self._lines), self._devpath, self._line_fd, self._direction,
+                    "cdev-v2" if self._uapi == "v2" else "cdev")
+
+
+class GPIOPoller(object):
+    def __init__(self, gpios=None, edge_triggered=False):
+        """**Persistent GPIO edge event poller**
+
+        Long-lived `select.epoll` set of GPIOs. GPIOs are registered once, and
+        each wakeup only reports GPIOs with pending edge events, so waiting on
+        many lines costs O(ready) rather than O(registered).
+
+        For character device GPIOs, the edge events should be consumed with
+        `read_event()` or `read_events()`. For sysfs GPIOs, the edge event
+        should be consumed with `read()`. In edge-triggered mode a GPIO is
+        only reported again after new events arrive, so all pending events
+        should be drained.
+
+        Args:
+            gpios (list, None): GPIO objects to register.
+            edge_triggered (bool): default registration mode, ``True`` for
+                                   edge-triggered (EPOLLET).
+
+        Returns:
+            GPIOPoller: GPIO poller object.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            TypeError: if `edge_triggered` type is not bool.
+
+        """
+        self._epoll = None
+        self._fd_gpio_map = {}
+
+        if not isinstance(edge_triggered, bool):
+            raise TypeError("Invalid edge triggered type, should be bool.")
+
+        self._edge_triggered = edge_triggered
+
+        try:
+            self._epoll = select.epoll()
+        except OSError as e:
+            raise GPIOError(e.errno, "Creating epoll: " + e.strerror)
+
+        for gpio in gpios or []:
+            self.add(gpio)
+
+    def __del__(self):
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._fd_gpio_map)
+
+    def __contains__(self, gpio):
+        return self._fd_gpio_map.get(gpio.fd) is gpio
+
+    # Methods
+
+    def add(self, gpio, edge_triggered=None):
+        """Register a GPIO.
+
+        Args:
+            gpio (GPIO): GPIO object with an edge configured.
+            edge_triggered (bool, None): registration mode, None for the
+                                         poller default.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs, or the GPIO is already
+                       registered.
+
+        """
+        if edge_triggered is None:
+            edge_triggered = self._edge_triggered
+
+        if isinstance(gpio, SysfsGPIO):
+            mask = select.EPOLLPRI | select.EPOLLERR
+        else:
+            mask = select.EPOLLIN | select.EPOLLRDNORM
+        if edge_triggered:
+            mask |= select.EPOLLET
+
+        try:
+            self._epoll.register(gpio.fd, mask)
+        except OSError as e:
+            raise GPIOError(e.errno, "Registering GPIO: " + e.strerror)
+
+        self._fd_gpio_map[gpio.fd] = gpio
+
+    def remove(self, gpio):
+        """Unregister a GPIO. Must be called before the GPIO is closed or
+        its line is reopened (e.g. changing direction or edge of a v1
+        character device GPIO).
+
+        Args:
+            gpio (GPIO): registered GPIO object.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            KeyError: if the GPIO is not registered.
+
+        """
+        fd = gpio.fd
+        if self._fd_gpio_map.get(fd) is not gpio:
+            raise KeyError("GPIO not registered.")
+
+        del self._fd_gpio_map[fd]
+
+        try:
+            self._epoll.unregister(fd)
+        except OSError as e:
+            raise GPIOError(e.errno, "Unregistering GPIO: " + e.strerror)
+
+    def events(self, timeout=None, max_events=-1):
+        """Wait for edge events on registered GPIOs with an optional timeout.
+
+        `timeout` can be a positive number for a timeout in seconds, zero for a
+        non-blocking poll, or negative or None for a blocking poll. Default is
+        a blocking poll.
+
+        Args:
+            timeout (int, float, None): timeout duration in seconds.
+            max_events (int): maximum number of GPIOs to report, -1 for no
+                              limit.
+
+        Returns:
+            list: list of GPIO objects for which an edge event occurred.
+
+        Raises:
+            GPIOError: if an I/O or OS error occurs.
+            TypeError: if `timeout` type is not None, int, or float.
+
+        """
+        if not isinstance(timeout, (int, float, type(None))):
+            raise TypeError(
+                "Invalid timeout type, should be integer, float, or None.")
+
+        if timeout is None or timeout < 0:
+            timeout = -1
+
+        try:
+            events = self._epoll.poll(timeout, max_events)
+        except OSError as e:
+            raise GPIOError(e.errno, "Polling GPIOs: " + e.strerror)
+
+        # Gather GPIOs that had edge events occur
+        results = []
+        for (fd, _) in events:
+            gpio = self._fd_gpio_map[fd]
+
+            results.append(gpio)
+
+            if isinstance(gpio, SysfsGPIO):
+                # Rewind for read
+                try:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                except OSError as e:
+                    raise GPIOError(e.errno, "Rewinding GPIO: " + e.strerror)
+
+        return results
+
+    def fileno(self):
+        """Get the epoll file descriptor, e.g. to wait on all registered GPIOs
+        from an outer event loop.
+
+        Returns:
+            int: epoll file descriptor.
+
+        """
+        return self._epoll.fileno()
+
+    def close(self):
+        if self._epoll is not None and not self._epoll.closed:
+            self._epoll.close()
+        self._fd_gpio_map = {}
+
+    # Immutable properties
+
+    @property
+    def gpios(self):
+        """Get the registered GPIO objects.
+
+        :type: list
+        """
+        return list(self._fd_gpio_map.values())
+
+    @property
+    def edge_triggered(self):
+        """Get the default registration mode.
+
+        :type: bool
+        """
+        return self._edge_triggered
+
+    # String representation
+
+    def __str__(self):
+        if self._epoll is None or self._epoll.closed:
+            return "GPIO poller (closed, edge_triggered={:s})".format(str(self._edge_triggered))
+        return "GPIO poller (gpios={:d}, epoll_fd={:d}, edge_triggered={:s})" \
+            .format(len(self._fd_gpio_map), self.fileno(), str(self._edge_triggered))
 
 
 class SysfsGPIO(GPIO):
@@ -104,6 +104,59 @@ static void mdio_flush(uint8_t clk_pin, uint8_t data_pin)
   }
 }
 
+static void mdio_preamble(uint8_t clk_pin, uint8_t data_pin, uint8_t bits)
+{
+  int i;
+  for (i = 0; i < bits; i++)
+  {
+    mdio_write_bit(clk_pin, data_pin, 1);
+  }
+}
+
+static void mdio_header(uint8_t clk_pin, uint8_t data_pin, uint8_t preamble, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad)
+{
+  // Preamble
+  mdio_preamble(clk_pin, data_pin, preamble);
+  // Header
+  mdio_write_bits(clk_pin, data_pin, sf & 3, 2); // Start frame
+  mdio_write_bits(clk_pin, data_pin, op & 3, 2); // OP Code
+  mdio_write_bits(clk_pin, data_pin, pad, 5);    // Phy addr
+  mdio_write_bits(clk_pin, data_pin, dad, 5);    // Reg addr (C22) / dev type (C45)
+}
+
+void mdio_frame_write(uint8_t clk_pin, uint8_t data_pin, uint8_t preamble, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad, uint16_t val)
+{
+  // Send preamble/header
+  mdio_header(clk_pin, data_pin, preamble, sf, op, pad, dad);
+  // Send the turnaround (10)
+  mdio_write_bits(clk_pin, data_pin, 2, 2);
+  // Send 16-bit value
+  mdio_write_bits(clk_pin, data_pin, val, 16);
+}
+
+uint16_t mdio_frame_read(uint8_t clk_pin, uint8_t data_pin, uint8_t preamble, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad)
+{
+  uint16_t ret;
+  // Send preamble/header
+  mdio_header(clk_pin, data_pin, preamble, sf, op, pad, dad);
+  // Release data pin
+  bcm2835_gpio_fsel(data_pin, BCM2835_GPIO_FSEL_INPT);
+  ndelay(1000);
+  // Read 2-bit turnaround (gives slave time)
+  mdio_read_bits(clk_pin, data_pin, 2);
+  // Read 16-bit value
+  ret = mdio_read_bits(clk_pin, data_pin, 16);
+  // Capture data pin
+  bcm2835_gpio_fsel(data_pin, BCM2835_GPIO_FSEL_OUTP);
+  bcm2835_gpio_write(data_pin, 1);
+  return ret;
+}
+
+void mdio_frame_flush(uint8_t clk_pin, uint8_t data_pin)
+{
+  mdio_flush(clk_pin, data_pin);
+}
+
 void mdio_cmd(uint8_t clk_pin, uint8_t data_pin, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad)
 {
   // Preamble
@@ -10,6 +10,10 @@ int mdio_close(uint8_t clk_pin, uint8_t data_pin);
 
 void mdio_cmd(uint8_t clk_pin, uint8_t data_pin, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad);
 
+void mdio_frame_write(uint8_t clk_pin, uint8_t data_pin, uint8_t preamble, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad, uint16_t val);
+uint16_t mdio_frame_read(uint8_t clk_pin, uint8_t data_pin, uint8_t preamble, uint8_t sf, uint8_t op, uint8_t pad, uint8_t dad);
+void mdio_frame_flush(uint8_t clk_pin, uint8_t data_pin);
+
 uint16_t mdio_c22_read(uint8_t clk_pin, uint8_t data_pin, uint8_t pad, uint8_t dad);
 int mdio_c22_write(uint8_t clk_pin, uint8_t data_pin, uint8_t pad, uint8_t dad, uint16_t val);
 
@@ -6,7 +6,7 @@
 static PyObject *py_mdio_init(PyObject *self, PyObject *args)
 {
   int gpiomem, val;
-  if (!PyArg_ParseTuple(args, "H", &gpiomem))
+  if (!PyArg_ParseTuple(args, "i", &gpiomem))
   {
     return NULL;
   }
@@ -112,4 +112,45 @@ static PyObject *py_mdio_c45_write_dword(PyObject *self, PyObject *args)
   return Py_BuildValue("I", rst);
 }
 
+static PyObject *py_mdio_frame_write(PyObject *self, PyObject *args)
+{
+  uint8_t clk_pin, data_pin, preamble, sf, op, pad, dad;
+  uint16_t val;
+  if (!PyArg_ParseTuple(args, "BBBBBBBH", &clk_pin, &data_pin, &preamble, &sf, &op, &pad, &dad, &val))
+  {
+    return NULL;
+  }
+  Py_BEGIN_ALLOW_THREADS
+  mdio_frame_write(clk_pin, data_pin, preamble, sf, op, pad, dad, val);
+  Py_END_ALLOW_THREADS
+  Py_RETURN_NONE;
+}
+
+static PyObject *py_mdio_frame_read(PyObject *self, PyObject *args)
+{
+  uint8_t clk_pin, data_pin, preamble, sf, op, pad, dad;
+  uint16_t val;
+  if (!PyArg_ParseTuple(args, "BBBBBBB", &clk_pin, &data_pin, &preamble, &sf, &op, &pad, &dad))
+  {
+    return NULL;
+  }
+  Py_BEGIN_ALLOW_THREADS
+  val = mdio_frame_read(clk_pin, data_pin, preamble, sf, op, pad, dad);
+  Py_END_ALLOW_THREADS
+  return Py_BuildValue("H", val);
+}
+
+static PyObject *py_mdio_frame_flush(PyObject *self, PyObject *args)
+{
+  uint8_t clk_pin, data_pin;
+  if (!PyArg_ParseTuple(args, "BB", &clk_pin, &data_pin))
+  {
+    return NULL;
+  }
+  Py_BEGIN_ALLOW_THREADS
+  mdio_frame_flush(clk_pin, data_pin);
+  Py_END_ALLOW_THREADS
+  Py_RETURN_NONE;
+}
+
 #endif
@@ -34,6 +34,9 @@ static PyMethodDef RPIOMethods[] = {
     {"mdio_c45_write", py_mdio_c45_write, METH_VARARGS, "MDIO C45 read word"},
     {"mdio_c45_read_dword", py_mdio_c45_read_dword, METH_VARARGS, "MDIO C45 Write dword"},
     {"mdio_c45_write_dword", py_mdio_c45_write_dword, METH_VARARGS, "MDIO C45 Read dword"},
+    {"mdio_frame_write", py_mdio_frame_write, METH_VARARGS, "MDIO write frame"},
+    {"mdio_frame_read", py_mdio_frame_read, METH_VARARGS, "MDIO read frame"},
+    {"mdio_frame_flush", py_mdio_frame_flush, METH_VARARGS, "MDIO flush"},
     // DONE
     {NULL, NULL, 0, NULL}};
 
@@ -1,10 +1,58 @@
 """ Handle MDIO interface via bitbang and SPI bus. """
-from typing import List, Optional
-from pyrpio.gpio import CdevGPIO
-from pyrpio.spi import SPI
+import math
+import struct
+import sys
+import time
+import warnings
+from array import array
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from pyrpio.bitbang import bit_states, samples_to_int
+from pyrpio.gpio import CdevGPIOPair
+from pyrpio.mdio_batch import MDIOBatch
+from pyrpio.mdio_cache import MDIOCache
+from pyrpio.spi import SPI, SPIBase, SPIMessage
+
+try:
+    from pyrpio import rpiolib
+except ImportError:
+    rpiolib = None
+
+_native_ready = False
+
+
+def _init_native(gpiomem: bool) -> bool:
+    """ Map bcm2835 peripherals for native backend (once per process). """
+    global _native_ready  # pylint: disable=global-statement
+    if rpiolib is not None and not _native_ready:
+        _native_ready = bool(rpiolib.mdio_init(int(gpiomem)))
+    return _native_ready
+
+# Compiled pin states: bit 1 drives clock (MDC), bit 0 drives data (MDIO)
+_MDC = CdevGPIOPair.CLK
+_MDIO = CdevGPIOPair.DATA
+_IDLE = _MDIO
+
+_PREAMBLE = bit_states(0xFFFFFFFF, 32)
+_FLUSH = _PREAMBLE + [_IDLE]
+
+
+# Frame: (st, op, pad, dad, val), val of None reads 16-bit value driven by MMD
+Frame = Tuple[int, int, int, int, Optional[int]]
+
+
+def _contiguous_runs(regs: List[int]) -> List[Tuple[int, int]]:
+    """ Split register addresses into (start, count) runs of consecutive addresses. """
+    runs: List[Tuple[int, int]] = []
+    for reg in regs:
+        if runs and reg == runs[-1][0] + runs[-1][1]:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((reg, 1))
+    return runs
 
-class MDIO:
-    """ Bit-bang MDIO interface. """
+
+class MDIOBase:
+    """ MDIO register access built on backend frame transfers. """
     C22_FRAME = 0x01
     C45_FRAME = 0x00
     OP_C22_WR = 0x01
@@ -13,106 +61,207 @@ class MDIO:
     OP_C45_WR = 0x01
     OP_C45_RD_INC = 0x02
     OP_C45_RD = 0x03
-
-    def __init__(self, clk_pin: int, data_pin: int, path: str, **kwargs):
+    PREAMBLE_FULL = 'full'
+    PREAMBLE_SUPPRESSED = 'suppressed'
+    # CLAUSE22 MMD access control/data registers (indirect C45 access moves address pointer)
+    C22_MMD_CTRL = 0x0D
+    C22_MMD_DATA = 0x0E
+
+    def __init__(self, preamble: str = PREAMBLE_FULL, flush: bool = True, track_address: bool = True,
+                 cache: Optional[MDIOCache] = None):
         """
-        Bit-bang MDIO interface via cdev gpio.
+        Common MDIO bus settings.
         Args:
-            clk_pin (int): GPIO pin of clock
-            data_pin (int): GPIO pin of data
+            preamble (str, optional): 'full' sends 32-bit preamble before every frame.
+                'suppressed' sends it only on first frame after open, then a single idle bit.
+                Only use with PHYs that advertise MF preamble suppression (see c22_preamble_suppression).
+                Defaults to 'full'.
+            flush (bool, optional): Send 32-bit flush after each operation. Defaults to True.
+            track_address (bool, optional): Remember last C45 address per (pad, dad) and skip
+                address frame when unchanged. Disable for devices that reset their address pointer.
+                Addresses of a pad are forgotten on reset writes (C22 reg 0 or MMD reg 0 bit 15),
+                call invalidate_address after other resets (e.g. reset pin).
+                Defaults to True.
+            cache (MDIOCache, optional): Serve reads of cacheable registers from cache. Defaults to None.
         """
-        self.clk_pin = clk_pin
-        self.data_pin = data_pin
-        self.clk_gpio = CdevGPIO(path=path, line=clk_pin, direction="low")
-        self.data_gpio = CdevGPIO(path=path, line=data_pin, direction="high", bias="pull_up")
-        self._clock_delay = kwargs.get('clock_delay', 50)
-        self._setup_delay = kwargs.get('setup_delay', 10)
-        self._read_delay = kwargs.get('read_delay', 1000)
-
-    def open(self):
-        """ Open mdio bus. """
-
-    def close(self):
-        """ Close mdio bus. """
-        self.clk_gpio.close()
-        self.data_gpio.close()
-
-    def _ndelay(self, delay):  # pylint: disable=no-self-use
-        while delay > 0:
-            delay -= 1
-
-    def _write_bit(self, val: int):
-        self._ndelay(self._clock_delay)
-        self.data_gpio.write(bool(val))
-        self._ndelay(self._setup_delay)
-        self.clk_gpio.write(True)
-        self._ndelay(self._clock_delay)
-        self.clk_gpio.write(False)
-
-    def _read_bit(self) -> int:
-        self._ndelay(self._clock_delay)
-        v = int(self.data_gpio.read())
-        self._ndelay(self._setup_delay)
-        self.clk_gpio.write(True)
-        self._ndelay(self._clock_delay)
-        self.clk_gpio.write(False)
-        return v
-
-    def _write_bits(self, val, bits):
-        for i in range(bits - 1, -1, -1):
-            self._write_bit((val >> i) & 1)
-
-    def _read_bits(self, bits) -> int:
-        ret = 0
-        for _ in range(bits - 1, -1, -1):
-            ret <<= 1
-            ret |= self._read_bit()
-        return ret
-
-    def _flush(self):
-        for _ in range(32):
-            self._write_bit(1)
-
-    def _cmd(self, sf, op, pad, dad):
-        # Preamble
-        self._flush()
-        # Header
-        self._write_bits(sf & 3, 2)  # Start frame
-        self._write_bits(op & 3, 2)  # OP Code
-        self._write_bits(pad, 5)  # Phy addr
-        self._write_bits(dad, 5)  # Reg addr(C22) / dev type(C45)
-
-    def _c45_write_addr(self, pad: int, dad: int, reg: int):
-        # Send preamble/header - C45 - ADDR
-        self._cmd(MDIO.C45_FRAME, MDIO.OP_C45_AD, pad, dad)
-        # Send the turnaround(10)
-        self._write_bits(2, 2)
-        # Send 16-bit value
-        self._write_bits(reg, 16)
-        return 0
+        self.preamble = preamble
+        self.flush = flush
+        self.track_address = track_address
+        self.cache = cache
+        self._synced = False
+        self._c45_addrs: Dict[Tuple[int, int], int] = {}
+
+    @property
+    def preamble(self) -> str:
+        """ Preamble policy: 'full' or 'suppressed'. """
+        return self._preamble
+
+    @preamble.setter
+    def preamble(self, preamble: str):
+        if preamble not in (MDIOBase.PREAMBLE_FULL, MDIOBase.PREAMBLE_SUPPRESSED):
+            raise ValueError(f'Invalid preamble, can be: "{MDIOBase.PREAMBLE_FULL}", "{MDIOBase.PREAMBLE_SUPPRESSED}".')
+        self._preamble = preamble
+
+    def _reset_bus_state(self):
+        """ Forget preamble sync, tracked addresses and cached values, e.g. after (re)opening bus. """
+        self._synced = False
+        self._c45_addrs.clear()
+        if self.cache is not None:
+            self.cache.invalidate()
+
+    def _preamble_bits(self) -> int:
+        """ Number of preamble 1's to send before next frame. """
+        if self._synced and self._preamble == MDIOBase.PREAMBLE_SUPPRESSED:
+            return 1
+        self._synced = True
+        return 32
+
+    def _write_frame(self, st: int, op: int, pad: int, dad: int, val: int):
+        """ Send preamble + frame with 16-bit value driven by STA. """
+        raise NotImplementedError()
+
+    def _read_frame(self, st: int, op: int, pad: int, dad: int) -> int:
+        """ Send preamble + header and return 16-bit value driven by MMD. """
+        raise NotImplementedError()
+
+    def _finish(self):
+        """ End of operation: send trailing flush if enabled. """
+        raise NotImplementedError()
+
+    def _transact(self, frames: List[Frame], finish: bool = True) -> List[int]:
+        """ Send frames as one operation (incl. trailing flush unless finish is False)
+            and return values read in order. Backends able to send several frames at once override this.
+        """
+        vals: List[int] = []
+        if not frames:
+            return vals
+        try:
+            for st, op, pad, dad, val in frames:
+                if val is None:
+                    vals.append(self._read_frame(st, op, pad, dad))
+                else:
+                    self._write_frame(st, op, pad, dad, val)
+        except Exception:
+            # Device address pointers unknown after partial operation
+            self._c45_addrs.clear()
+            raise
+        if finish:
+            self._finish()
+        return vals
+
+    def batch(self) -> MDIOBatch:
+        """ Queue register operations and execute them in one pass on exit.
+            with bus.batch() as b:
+                b.read_c45_register(pad, dad, reg)
+                b.modify_c22_register(pad, reg, mask, val)
+            b.results  # in queued order
+            Returns:
+                MDIOBatch: Operation queue
+        """
+        return MDIOBatch(self)
 
-    def _c45_write_val(self, pad: int, dad: int, val: int):
-        # Send preamble/header - C45 - WRITE
-        self._cmd(MDIO.C45_FRAME, MDIO.OP_C45_WR, pad, dad)
-        # Send the turnaround(10)
-        self._write_bits(2, 2)
-        # Send 16-bit value
-        self._write_bits(val, 16)
-        return 0
+    def c22_preamble_suppression(self, pad: int) -> bool:
+        """ Check if PHY advertises MF preamble suppression (CLAUSE22 reg 1 bit 6).
+            Args:
+                pad (int): 5-bit physical address
+            Returns:
+                bool: PHY accepts frames with preamble suppressed
+        """
+        return bool(self.read_c22_register(pad, 1) & 0x40)
 
-    def _c45_read_val(self, pad: int, dad: int) -> int:
-        # Send preamble/header
-        self._cmd(MDIO.C45_FRAME, MDIO.OP_C45_RD, pad, dad)
-        # Release data pin
-        self.data_gpio.direction = "in"
-        self._ndelay(self._read_delay)
-        # Read 2-bit turnaround(gives slave time)
-        self._read_bits(2)
-        # Read 16-bit value
-        ret = self._read_bits(16)
-        # Capture data pin
-        self.data_gpio.direction = "high"
-        return ret
+    def invalidate_address(self, pad: Optional[int] = None, dad: Optional[int] = None):
+        """ Forget tracked C45 address so next access re-sends address frame.
+            Args:
+                pad (int, optional): 5-bit physical address. Defaults to all.
+                dad (int, optional): 5-bit device type. Defaults to all.
+        """
+        if pad is None and dad is None:
+            self._c45_addrs.clear()
+            return
+        for key in [k for k in self._c45_addrs if pad in (None, k[0]) and dad in (None, k[1])]:
+            del self._c45_addrs[key]
+
+    def _c45_addr_frames(self, pad: int, dad: int, reg: int) -> List[Frame]:
+        # Skip address frame if device address pointer already at reg
+        key = (pad, dad)
+        if self.track_address and self._c45_addrs.get(key) == reg:
+            return []
+        if self.track_address:
+            self._c45_addrs[key] = reg
+        # Preamble/header/turnaround/16-bit reg - C45 - ADDR
+        return [(MDIOBase.C45_FRAME, MDIOBase.OP_C45_AD, pad, dad, reg)]
+
+    def _c45_dword_addr_frames(self, pad: int, dad: int, reg: int) -> List[Frame]:
+        # 32-bit address is two address frames, pointer state is device specific
+        self._c45_addrs.pop((pad, dad), None)
+        return [
+            (MDIOBase.C45_FRAME, MDIOBase.OP_C45_AD, pad, dad, reg & 0xFFFF),
+            (MDIOBase.C45_FRAME, MDIOBase.OP_C45_AD, pad, dad, reg >> 16)
+        ]
+
+    @staticmethod
+    def _c45_val_frame(pad: int, dad: int, val: int) -> Frame:
+        # Preamble/header/turnaround/16-bit value - C45 - WRITE
+        return (MDIOBase.C45_FRAME, MDIOBase.OP_C45_WR, pad, dad, val)
+
+    @staticmethod
+    def _c45_read_frame(pad: int, dad: int) -> Frame:
+        # Preamble/header, read turnaround/16-bit value
+        return (MDIOBase.C45_FRAME, MDIOBase.OP_C45_RD, pad, dad, None)
+
+    def _c22_read_frames(self, pad: int, reg: int) -> List[Frame]:
+        if reg == MDIOBase.C22_MMD_DATA:
+            self.invalidate_address(pad)
+        return [(MDIOBase.C22_FRAME, MDIOBase.OP_C22_RD, pad, reg, None)]
+
+    def _c22_write_frames(self, pad: int, reg: int, val: int) -> List[Frame]:
+        # PHY reset (reg 0 bit 15) returns MMD address pointers to their defaults
+        reset = reg == 0 and bool(val & 0x8000)
+        if reset or reg in (MDIOBase.C22_MMD_CTRL, MDIOBase.C22_MMD_DATA):
+            self.invalidate_address(pad)
+        if self.cache is not None:
+            # Indirect MMD write or PHY reset may change any register
+            whole_phy = reset or reg == MDIOBase.C22_MMD_DATA
+            self.cache.invalidate(pad, None if whole_phy else MDIOCache.C22, None if whole_phy else reg)
+        return [(MDIOBase.C22_FRAME, MDIOBase.OP_C22_WR, pad, reg, val)]
+
+    def _c45_read_frames(self, pad: int, dad: int, reg: int) -> List[Frame]:
+        return self._c45_addr_frames(pad, dad, reg) + [self._c45_read_frame(pad, dad)]
+
+    def _c45_write_frames(self, pad: int, dad: int, reg: int, val: int) -> List[Frame]:
+        frames = self._c45_addr_frames(pad, dad, reg) + [self._c45_val_frame(pad, dad, val)]
+        self._c45_written(pad, dad, reg, val)
+        return frames
+
+    def _c45_written(self, pad: int, dad: int, reg: int, val: int):
+        """ Forget tracked state that writing val to reg may change. """
+        # MMD reset (control 1 bit 15) may reset whole package, incl. address pointers
+        reset = reg == 0 and bool(val & 0x8000)
+        if reset:
+            self.invalidate_address(pad)
+        if self.cache is not None:
+            self.cache.invalidate(pad, None if reset else dad, None if reset else reg)
+
+    def _read_through(self, pad: int, dad: int, regs: List[int], read: Callable[[List[int]], List[int]]) -> List[int]:
+        """ Serve regs from cache, read missing ones with read(missing_regs) and cache them. """
+        if self.cache is None:
+            return read(regs)
+        cached = [self.cache.get(pad, dad, reg) for reg in regs]
+        missing = [reg for reg, val in zip(regs, cached) if val is None]
+        fetched = iter(read(missing) if missing else [])
+        vals: List[int] = []
+        for reg, val in zip(regs, cached):
+            if val is None:
+                val = next(fetched)
+                self.cache.put(pad, dad, reg, val)
+            vals.append(val)
+        return vals
+
+    def _c45_run_frames(self, pad: int, dad: int, start: int, count: int) -> List[Frame]:
+        frames = self._c45_addr_frames(pad, dad, start)
+        # Post-read-increment moves address pointer
+        self._c45_addrs.pop((pad, dad), None)
+        return frames + [(MDIOBase.C45_FRAME, MDIOBase.OP_C45_RD_INC, pad, dad, None)] * count
 
     def read_c22_register(self, pad: int, reg: int):
         """ Read reg in CLAUSE22. [01|01|5-bit pad|5-bit reg|XX|16-bit val]
@@ -122,19 +271,8 @@ class MDIO:
             Returns:
                 int: 16-bit register value
         """
-        # Send preamble/header
-        self._cmd(MDIO.C22_FRAME, MDIO.OP_C22_RD, pad, reg)
-        # Release data pin
-        self.data_gpio.direction = "in"
-        self._ndelay(self._read_delay)
-        # Read 2-bit turnaround (gives slave time)
-        self._read_bits(2)
-        # Read 16-bit value
-        ret = self._read_bits(16)
-        # Capture data pin
-        self.data_gpio.direction = "high"
-        self._flush()
-        return ret
+        # Send preamble/header, read turnaround/16-bit value
+        return self._read_through(pad, MDIOCache.C22, [reg], lambda regs: self._transact(self._c22_read_frames(pad, reg)))[0]
 
     def read_c45_register(self, pad: int, dad: int, reg: int):
         """ Read reg in CLAUSE45.
@@ -147,10 +285,7 @@ class MDIO:
             Returns:
                 int: 16-bit register value
         """
-        self._c45_write_addr(pad, dad, reg)
-        val = self._c45_read_val(pad, dad)
-        self._flush()
-        return val
+        return self._read_through(pad, dad, [reg], lambda regs: self._transact(self._c45_read_frames(pad, dad, reg)))[0]
 
     def read_c45_dword_register(self, pad: int, dad: int, reg: int):
         """ Read 32-bit reg in CLAUSE45.
@@ -165,12 +300,9 @@ class MDIO:
             Returns:
                 int: 32-bit register value
         """
-        self._c45_write_addr(pad, dad, reg & 0xFFFF)
-        self._c45_write_addr(pad, dad, reg >> 16)
-        val_lsb = self._c45_read_val(pad, dad)
-        val_msb = self._c45_read_val(pad, dad)
-        self._flush()
-        return (val_msb << 16) & (val_lsb & 0xFFFF)
+        frames = self._c45_dword_addr_frames(pad, dad, reg)
+        val_lsb, val_msb = self._transact(frames + [self._c45_read_frame(pad, dad)] * 2)
+        return (val_msb << 16) | (val_lsb & 0xFFFF)
 
     def write_c22_register(self, pad: int, reg: int, val: int):
         """ Write reg in CLAUSE22. [01|01|5-bit pad|5-bit reg|01|16-bit val]
@@ -179,13 +311,8 @@ class MDIO:
                 reg (int): 5-bit register address
                 val (int): 16-bit register value
         """
-        # Send preamble/header
-        self._cmd(MDIO.C22_FRAME, MDIO.OP_C22_WR, pad, reg)
-        # Send the turnaround (10)
-        self._write_bits(2, 2)
-        # Send 16-bit value
-        self._write_bits(val, 16)
-        self._flush()
+        # Send preamble/header/turnaround/16-bit value
+        self._transact(self._c22_write_frames(pad, reg, val))
 
     def write_c45_register(self, pad: int, dad: int, reg: int, val: int):
         """ Write reg in CLAUSE45.
@@ -197,10 +324,8 @@ class MDIO:
                 reg (int): 16-bit register address
                 val (int): 16-bit register value
         """
-        self._c45_write_addr(pad, dad, reg)
-        rst = self._c45_write_val(pad, dad, val)
-        self._flush()
-        return rst
+        self._transact(self._c45_write_frames(pad, dad, reg, val))
+        return 0
 
     def write_c45_dword_register(self, pad: int, dad: int, reg: int, val: int):
         """ Write 32-bit reg in CLAUSE45.
@@ -214,12 +339,43 @@ class MDIO:
                 reg (int): 32-bit register address
                 val (int): 32-bit register value
         """
-        self._c45_write_addr(pad, dad, reg & 0xFFFF)
-        self._c45_write_addr(pad, dad, reg >> 16)
-        rst = self._c45_write_val(pad, dad, val & 0xFFFF)
-        rst |= self._c45_write_val(pad, dad, val >> 16)
-        self._flush()
-        return rst
+        if self.cache is not None:
+            self.cache.invalidate(pad, dad)
+        frames = self._c45_dword_addr_frames(pad, dad, reg)
+        self._transact(frames + [self._c45_val_frame(pad, dad, val & 0xFFFF), self._c45_val_frame(pad, dad, val >> 16)])
+        return 0
+
+    def modify_c22_register(self, pad: int, reg: int, mask: int, val: int) -> int:
+        """ Read-modify-write bits in mask of reg in CLAUSE22. Write is skipped if bits already set.
+            Args:
+                pad (int): 5-bit physical address
+                reg (int): 5-bit register address
+                mask (int): 16-bit mask of bits to modify
+                val (int): 16-bit value of bits in mask
+            Returns:
+                int: 16-bit register value before modification
+        """
+        with self.batch() as b:
+            b.modify_c22_register(pad, reg, mask, val)
+        return b.results[0]
+
+    def modify_c45_register(self, pad: int, dad: int, reg: int, mask: int, val: int) -> int:
+        """ Read-modify-write bits in mask of reg in CLAUSE45. Write is skipped if bits already set.
+            [00|00|5-bit pad|5-bit dad|XX|16-bit reg]
+            [00|11|5-bit pad|5-bit dad|XX|16-bit val]
+            [00|01|5-bit pad|5-bit dad|01|16-bit modified val] (address pointer still at reg)
+            Args:
+                pad (int): 5-bit physical address
+                dad (int): 5-bit device type
+                reg (int): 16-bit register address
+                mask (int): 16-bit mask of bits to modify
+                val (int): 16-bit value of bits in mask
+            Returns:
+                int: 16-bit register value before modification
+        """
+        with self.batch() as b:
+            b.modify_c45_register(pad, dad, reg, mask, val)
+        return b.results[0]
 
     def read_c22_registers(self, pad: int, regs: List[int]):
         """ Read multiple registers in CLAUSE22.
@@ -229,11 +385,16 @@ class MDIO:
             Return:
                 List[int]: List of 16-bit register values
         """
-        return [self.read_c22_register(pad, reg) for reg in regs]
+        def read(regs: List[int]) -> List[int]:
+            frames: List[Frame] = []
+            for reg in regs:
+                frames += self._c22_read_frames(pad, reg)
+            return self._transact(frames)
+        return self._read_through(pad, MDIOCache.C22, regs, read)
 
     def read_c45_registers(self, pad: int, dad: int, regs: List[int]):
         """ Read multiple registers in CLAUSE45.
-            NOTE: C45 supports read and addr++ but not sure if supported.
+            Runs of consecutive registers are read with post-read-increment (see read_c45_range).
             Args:
                 pad (int): 5-bit physical address
                 dad (int): 5-bit device type
@@ -241,7 +402,79 @@ class MDIO:
             Return:
                 List[int]: List of 16-bit register values
         """
-        return [self.read_c45_register(pad, dad, reg) for reg in regs]
+        return self._read_through(pad, dad, regs, lambda regs: self._read_c45_runs(pad, dad, regs))
+
+    def _read_c45_runs(self, pad: int, dad: int, regs: List[int]) -> List[int]:
+        frames: List[Frame] = []
+        for start, count in _contiguous_runs(regs):
+            if count == 1:
+                frames += self._c45_read_frames(pad, dad, start)
+            else:
+                frames += self._c45_run_frames(pad, dad, start, count)
+        return self._transact(frames)
+
+    def read_c45_range(self, pad: int, dad: int, start: int, count: int):
+        """ Read consecutive registers in CLAUSE45 using post-read-increment.
+            [00|00|5-bit pad|5-bit dad|XX|16-bit start]
+            [00|10|5-bit pad|5-bit dad|XX|16-bit val] x count
+            Args:
+                pad (int): 5-bit physical address
+                dad (int): 5-bit device type
+                start (int): 16-bit first register address
+                count (int): Number of registers
+            Return:
+                List[int]: List of 16-bit register values
+        """
+        if count <= 0:
+            return []
+        if start < 0 or start + count > 0x10000:
+            raise ValueError('Register range must be within 16-bit address space.')
+        return self._read_through(pad, dad, list(range(start, start + count)), lambda regs: self._read_c45_runs(pad, dad, regs))
+
+    def dump_mmd(self, pad: int, dad: int, start: int = 0, stop: int = 0x10000, out: Any = None,
+                 chunk: int = 256, progress: Optional[Callable[[int, int], None]] = None):
+        """ Dump register space of a CLAUSE45 device using post-read-increment runs.
+            Values are streamed chunk by chunk into out and bypass the cache.
+            Args:
+                pad (int): 5-bit physical address
+                dad (int): 5-bit device type
+                start (int, optional): First register address. Defaults to 0.
+                stop (int, optional): Register address after last one. Defaults to 0x10000.
+                out (optional): Preallocated 16-bit buffer supporting slice assignment
+                    (array('H'), numpy array/memmap of uint16) with at least stop - start entries,
+                    or binary file object receiving little-endian values. Defaults to new array('H').
+                chunk (int, optional): Registers per operation. Defaults to 256.
+                progress (Callable, optional): Called with (done, total) registers after each chunk.
+            Return:
+                out (or new array('H')) holding register values start..stop - 1
+        """
+        if not 0 <= start < stop <= 0x10000:
+            raise ValueError('Register range must be within 16-bit address space.')
+        if chunk <= 0:
+            raise ValueError('Chunk must be positive.')
+        total = stop - start
+        if out is None:
+            out = array('H', bytes(2 * total))
+        to_file = hasattr(out, 'write')
+        if not to_file and len(out) < total:
+            raise ValueError(f'Output holds {len(out)} of {total} registers.')
+        done = 0
+        try:
+            while done < total:
+                count = min(chunk, total - done)
+                vals = array('H', self._transact(self._c45_run_frames(pad, dad, start + done, count), finish=False))
+                if to_file:
+                    if sys.byteorder == 'big':
+                        vals.byteswap()
+                    out.write(vals.tobytes())
+                else:
+                    out[done:done + count] = vals
+                done += count
+                if progress is not None:
+                    progress(done, total)
+        finally:
+            self._finish()
+        return out
 
     def read_c45_dword_registers(self, pad: int, dad: int, regs: List[int]):
         """ Read multiple dword registers in CLAUSE45.
@@ -262,7 +495,11 @@ class MDIO:
                 regs (List[int]): List of 5-bit register addreses
                 vals (List[int]): List of 16-bit register values
         """
-        return [self.write_c22_register(pad, reg, val) for reg, val in zip(regs, vals)]
+        frames: List[Frame] = []
+        for reg, val in zip(regs, vals):
+            frames += self._c22_write_frames(pad, reg, val)
+        self._transact(frames)
+        return [None] * len(frames)
 
     def write_c45_registers(self, pad: int, dad: int, regs: List[int], vals: List[int]):
         """ Write multiple registers in CLAUSE45.
@@ -272,7 +509,12 @@ class MDIO:
                 regs (List[int]): List of 16-bit register addreses
                 vals (List[int]): List of 16-bit register values
         """
-        return [self.write_c45_register(pad, dad, reg, val) for reg, val in zip(regs, vals)]
+        pairs = list(zip(regs, vals))
+        frames: List[Frame] = []
+        for reg, val in pairs:
+            frames += self._c45_write_frames(pad, dad, reg, val)
+        self._transact(frames)
+        return [0] * len(pairs)
 
     def write_c45_dword_registers(self, pad: int, dad: int, regs: List[int], vals: List[int]):
         """ Write multiple dword registers in CLAUSE45.
@@ -282,35 +524,284 @@ class MDIO:
                 regs (List[int]): List of 32-bit register addreses
                 vals (List[int]): List of 32-bit register values
         """
-        return [self.write_c45_dword_register(pad, dad, reg, val) for reg, val in zip(regs, vals)]
+        if self.cache is not None:
+            self.cache.invalidate(pad, dad)
+        pairs = list(zip(regs, vals))
+        frames: List[Frame] = []
+        for reg, val in pairs:
+            frames += self._c45_dword_addr_frames(pad, dad, reg)
+            frames += [self._c45_val_frame(pad, dad, val & 0xFFFF), self._c45_val_frame(pad, dad, val >> 16)]
+        self._transact(frames)
+        return [0] * len(pairs)
+
+
+class MDIO(MDIOBase):
+    """ Bit-bang MDIO interface. """
 
+    def __init__(self, clk_pin: int, data_pin: int, path: str, **kwargs):
+        """
+        Bit-bang MDIO interface via cdev gpio.
+        Clock and data lines are requested together so both are set in one ioctl per half-cycle.
+        Args:
+            clk_pin (int): GPIO pin of clock
+            data_pin (int): GPIO pin of data
+            path (str): GPIO chip path
+            backend (str, optional): 'cdev' bit-bangs in Python via cdev gpio.
+                'native' bit-bangs in rpiolib C extension via bcm2835 registers,
+                falling back to 'cdev' if extension is unavailable. Defaults to 'cdev'.
+            gpiomem (bool, optional): Native backend maps /dev/gpiomem instead of /dev/mem. Defaults to True.
+            gpio (CdevGPIOPair, optional): Use given pin pair for cdev backend instead of requesting
+                lines from path (e.g. mdio_sim.SimGPIOPair). Defaults to None.
+            mdc_hz (float, optional): Target MDC frequency. When set, delays are calibrated on open().
+            clock_delay (int, optional): Delay loops per clock half-cycle. Defaults to 50.
+            setup_delay (int, optional): Extra delay loops between data setup and clock rising. Defaults to 10.
+            read_delay (int, optional): Delay loops after releasing data pin. Defaults to 1000.
+            preamble (str, optional): Preamble policy, 'full' or 'suppressed'. Defaults to 'full'.
+            flush (bool, optional): Send 32-bit flush after each operation. Defaults to True.
+            track_address (bool, optional): Skip C45 address frame when unchanged. Defaults to True.
+            cache (MDIOCache, optional): Register value cache. Defaults to None.
+        """
+        super().__init__(
+            preamble=kwargs.get('preamble', MDIOBase.PREAMBLE_FULL),
+            flush=kwargs.get('flush', True),
+            track_address=kwargs.get('track_address', True),
+            cache=kwargs.get('cache')
+        )
+        self.clk_pin = clk_pin
+        self.data_pin = data_pin
+        self.backend = 'cdev'
+        self.gpio: Optional[CdevGPIOPair] = None
+        backend = kwargs.get('backend', 'cdev')
+        if backend not in ('cdev', 'native'):
+            raise ValueError('Invalid backend, can be: "cdev", "native".')
+        if backend == 'native':
+            if _init_native(kwargs.get('gpiomem', True)):
+                self.backend = 'native'
+            else:
+                warnings.warn('Native MDIO backend unavailable, falling back to cdev gpio.', RuntimeWarning)
+        if self.backend == 'cdev':
+            self.gpio = kwargs.get('gpio') or CdevGPIOPair(path=path, clk_line=clk_pin, data_line=data_pin, data_bias="pull_up")
+        self._clock_delay = kwargs.get('clock_delay', 50)
+        self._setup_delay = kwargs.get('setup_delay', 10)
+        self._read_delay = kwargs.get('read_delay', 1000)
+        self._mdc_target: Optional[float] = kwargs.get('mdc_hz')
+        self._mdc_hz: Optional[float] = None
+        self._frames: Dict[Tuple[int, int, int, int, int], List[int]] = {}
+
+    def open(self):
+        """ Open mdio bus. """
+        self._reset_bus_state()
+        if self.backend == 'native':
+            rpiolib.mdio_open(self.clk_pin, self.data_pin)
+        elif self._mdc_target:
+            self.calibrate()
+
+    def close(self):
+        """ Close mdio bus. """
+        if self.backend == 'native':
+            rpiolib.mdio_close(self.clk_pin, self.data_pin)
+        else:
+            self.gpio.close()
+
+    @property
+    def mdc_hz(self) -> Optional[float]:
+        """ MDC frequency achieved by last calibration (None if not calibrated). """
+        return self._mdc_hz
+
+    @property
+    def clock_delay(self) -> int:
+        """ Delay loops per clock half-cycle. """
+        return self._clock_delay
+
+    @property
+    def setup_delay(self) -> int:
+        """ Extra delay loops between data setup and clock rising. """
+        return self._setup_delay
+
+    @property
+    def read_delay(self) -> int:
+        """ Delay loops after releasing data pin. """
+        return self._read_delay
+
+    def calibrate(self, mdc_hz: Optional[float] = None, max_rounds: int = 20) -> float:
+        """ Pick the smallest clock delay that keeps MDC at or below target frequency.
+            Cost of delay loop and GPIO calls is measured by clocking idle (all 1's) frames onto bus.
+            Configured setup_delay is kept and read_delay is only raised to at least one half-cycle.
+            Warns (RuntimeWarning) if target is still exceeded after max_rounds.
+            Args:
+                mdc_hz (float, optional): Target MDC frequency. Defaults to mdc_hz option.
+                max_rounds (int, optional): Maximum rounds to converge on target. Defaults to 20.
+            Returns:
+                float: Achieved MDC frequency in Hz
+        """
+        if self.backend == 'native':
+            raise RuntimeError('Native backend uses fixed delays and cannot be calibrated.')
+        mdc_hz = mdc_hz or self._mdc_target
+        if not mdc_hz or mdc_hz <= 0:
+            raise ValueError('Target MDC frequency must be positive.')
+        if max_rounds < 1:
+            raise ValueError('max_rounds must be at least 1.')
+        self._mdc_target = mdc_hz
+        # Cost of one delay loop iteration
+        loops = 10000
+        loop_ns = max(self._best_time_ns(self._ndelay, loops) / loops, 1e-3)
+        # Cost of one cycle with no clock delay (setup delay included)
+        self._clock_delay = 0
+        cycle_ns = 2 * self._best_time_ns(self._replay, _FLUSH) / len(_FLUSH)
+        delay = max(0, math.ceil((1e9 / mdc_hz - cycle_ns) / (2 * loop_ns)))
+        for _ in range(max_rounds):
+            self._clock_delay = delay
+            # Fastest observed rate must not exceed target
+            achieved = 1e9 * (len(_FLUSH) // 2) / self._best_time_ns(self._replay, _FLUSH)
+            if achieved <= mdc_hz:
+                break
+            delay = max(delay + 1, math.ceil(delay * achieved / mdc_hz))
+        else:
+            warnings.warn(f'MDC calibration did not reach {mdc_hz:.0f} Hz in {max_rounds} rounds '
+                          f'(achieved {achieved:.0f} Hz).', RuntimeWarning)
+        # Give slave at least one half-cycle after releasing data pin
+        self._read_delay = max(self._read_delay, self._clock_delay)
+        self._mdc_hz = achieved
+        return achieved
+
+    @staticmethod
+    def _best_time_ns(fn, arg, repeat: int = 5) -> float:
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            fn(arg)
+            best = min(best, time.perf_counter_ns() - start)
+        return max(best, 1)
 
-class MDIOSPI:
+    def _ndelay(self, delay):  # pylint: disable=no-self-use
+        while delay > 0:
+            delay -= 1
+
+    def _frame(self, st: int, op: int, pad: int, dad: int) -> List[int]:
+        """ Get compiled pin states for frame. Templates are cached per header and preamble length
+            and write frames reserve trailing 16-bit data slot to be patched.
+        """
+        bits = self._preamble_bits()
+        key = (st, op, pad, dad, bits)
+        frame = self._frames.get(key)
+        if frame is None:
+            hdr = (st & 3) << 12 | (op & 3) << 10 | (pad & 0x1F) << 5 | (dad & 0x1F)
+            frame = bit_states((1 << bits) - 1, bits) + bit_states(hdr, 14)
+            if op in self._read_ops(st):
+                # Drop clock before releasing data pin
+                frame.append(_IDLE)
+            else:
+                # Turnaround(10) + 16-bit data slot
+                frame += bit_states(2, 2) + bit_states(0, 16)
+            self._frames[key] = frame
+        return frame
+
+    @staticmethod
+    def _read_ops(st: int):
+        return (MDIO.OP_C22_RD,) if st == MDIO.C22_FRAME else (MDIO.OP_C45_RD, MDIO.OP_C45_RD_INC)
+
+    def _replay(self, states: List[int]):
+        """ Drive pin states onto bus. Data only changes while clock is low. """
+        write = self.gpio.write
+        low_delay = self._clock_delay + self._setup_delay
+        high_delay = self._clock_delay
+        prev = self.gpio.state
+        for state in states:
+            if state != prev:
+                write(state)
+                prev = state
+            delay = high_delay if state & _MDC else low_delay
+            while delay > 0:
+                delay -= 1
+
+    def _replay_read(self) -> int:
+        """ Release data pin and clock in turnaround + 16-bit value. """
+        clk_write = self.gpio.write_clk
+        data_read = self.gpio.read_data
+        clock_delay = self._clock_delay
+        setup_delay = self._setup_delay
+        # Release data pin
+        self.gpio.data_direction = "in"
+        self._ndelay(self._read_delay)
+        samples = bytearray(18)
+        for i in range(18):
+            delay = clock_delay
+            while delay > 0:
+                delay -= 1
+            samples[i] = data_read()
+            delay = setup_delay
+            while delay > 0:
+                delay -= 1
+            clk_write(True)
+            delay = clock_delay
+            while delay > 0:
+                delay -= 1
+            clk_write(False)
+        # Capture data pin
+        self.gpio.data_direction = "high"
+        # Skip turnaround
+        return samples_to_int(samples[2:])
+
+    def _write_frame(self, st: int, op: int, pad: int, dad: int, val: int):
+        if self.backend == 'native':
+            rpiolib.mdio_frame_write(self.clk_pin, self.data_pin, self._preamble_bits(), st, op, pad, dad, val)
+            return
+        frame = self._frame(st, op, pad, dad)
+        frame[-32:] = bit_states(val, 16)
+        self._replay(frame)
+
+    def _read_frame(self, st: int, op: int, pad: int, dad: int) -> int:
+        if self.backend == 'native':
+            return rpiolib.mdio_frame_read(self.clk_pin, self.data_pin, self._preamble_bits(), st, op, pad, dad)
+        self._replay(self._frame(st, op, pad, dad))
+        return self._replay_read()
+
+    def _finish(self):
+        if self.backend == 'native':
+            if self.flush:
+                rpiolib.mdio_frame_flush(self.clk_pin, self.data_pin)
+            return
+        # Flush, or just drop clock
+        self._replay(_FLUSH if self.flush else [_IDLE])
+
+
+class MDIOSPI(MDIOBase):
     """Peform MDIO over SPI interface.
     Requires MOSI and MISO to be tied together with external pull-up
     Chip select is not used either since MDIO packet contains phy_addr
+    Frames are written into a reused SPIMessage instead of per-transfer tx/rx buffers.
     """
-    C22_FRAME = 0x01
-    C45_FRAME = 0x00
-    OP_C22_WR = 0x01
-    OP_C22_RD = 0x02
-    OP_C45_AD = 0x00
-    OP_C45_WR = 0x01
-    OP_C45_RD_INC = 0x02
-    OP_C45_RD = 0x03
 
-    def __init__(self, path: str = '/dev/spidev0.0'):
+    # spidev default bufsiz, max bytes per SPI_IOC_MESSAGE
+    MAX_MESSAGE_BYTES = 4096
+    _U16 = struct.Struct('>H')
+    _U32 = struct.Struct('>I')
+
+    def __init__(self, path: str = '/dev/spidev0.0', preamble: str = MDIOBase.PREAMBLE_FULL,
+                 flush: bool = False, track_address: bool = True, cache: Optional[MDIOCache] = None,
+                 spi: Optional[SPIBase] = None):
         """
             SPI-based MDIO interface.
             Args:
                 path: spidev bus path
+                preamble: Preamble policy, 'full' or 'suppressed' (suppressed sends single 0xFF byte)
+                flush: Send 32-bit flush after each operation
+                track_address: Skip C45 address frame when unchanged
+                cache: Register value cache
+                spi: Use given SPI bus instead of opening path (e.g. mdio_sim.SimSPI)
         """
+        super().__init__(preamble=preamble, flush=flush, track_address=track_address, cache=cache)
         self.path: str = path
-        self._bus: Optional[SPI]
+        self._spi = spi
+        self._bus: Optional[SPIBase] = None
+        self._msg = SPIMessage(MDIOSPI.MAX_MESSAGE_BYTES)
+        # rx offset of each read in message
+        self._rx_offsets = array('H', bytes(2 * self._msg.max_segments))
 
     def open(self, speed_hz: int = 5000):
         """ Open mdio bus. """
-        self._bus = SPI(self.path, 0, speed_hz, extra_flags=SPI.SPI_3WIRE)
+        self._reset_bus_state()
+        self._bus = self._spi or SPI(self.path, 0, speed_hz, extra_flags=SPI.SPI_3WIRE)
 
     def close(self):
         """ Close mdio bus. """
@@ -318,10 +809,52 @@ class MDIOSPI:
 
     def mdio_flush(self):
         """ Flush bus by sending 32 1's """
-        self._bus.transfer(tx_data=(0xFFFFFFFF).to_bytes(4, byteorder='big'), cs_change=False)
+        self._msg.clear()
+        self._put_flush(0)
+        self._send(0)
+
+    def _put_flush(self, pos: int) -> int:
+        MDIOSPI._U32.pack_into(self._msg.tx, pos, 0xFFFFFFFF)
+        self._msg.transmit(pos, 4)
+        return pos + 4
+
+    def _put_frame(self, pos: int, nreads: int, st: int, op: int, pad: int, dad: int, val: Optional[int],
+                   tat: int = 0x2) -> int:
+        """ Write preamble (whole bytes of 1's) + 16-bit header + 16-bit write value into message at pos.
+            Reads add 2-byte receive segment. Returns position after frame.
+        """
+        msg = self._msg
+        tx = msg.tx
+        start = pos
+        if self._preamble_bits() == 32:
+            MDIOSPI._U32.pack_into(tx, pos, 0xFFFFFFFF)
+            pos += 4
+        else:
+            tx[pos] = 0xFF
+            pos += 1
+        hdr = (st & 0x3) << 14 | (op & 0x3) << 12 | (pad & 0x1F) << 7 | (dad & 0x1F) << 2
+        if val is None:
+            # Reads release turnaround (11)
+            MDIOSPI._U16.pack_into(tx, pos, hdr | 0x3)
+            msg.transmit(start, pos + 2 - start)
+            msg.receive(pos + 2, 2)
+            self._rx_offsets[nreads] = pos + 2
+        else:
+            MDIOSPI._U16.pack_into(tx, pos, hdr | (tat & 0x3))
+            MDIOSPI._U16.pack_into(tx, pos + 2, val & 0xFFFF)
+            msg.transmit(start, pos + 4 - start)
+        return pos + 4
+
+    def _send(self, nreads: int) -> List[int]:
+        """ Send message and return read values. """
+        self._bus.transfer_message(self._msg)
+        self._msg.clear()
+        rx = self._msg.rx
+        offsets = self._rx_offsets
+        return [rx[offsets[i]] << 8 | rx[offsets[i] + 1] for i in range(nreads)]
 
     def mdio_xfer(self, st: int, op: int, pad: int, dad: int, tat: int = 0x2, val: int = 0xFFFF):
-        """ Perform low-level 32-bit frame transfer.
+        """ Perform low-level 32-bit frame transfer (single ioctl).
             Args:
                 st (int): 2-bit start field
                 op (int): 2-bit operation field
@@ -331,107 +864,48 @@ class MDIOSPI:
                 val (int): 16-bit write value
         """
         is_read = op in [MDIOSPI.OP_C22_RD, MDIOSPI.OP_C45_RD, MDIOSPI.OP_C45_RD_INC]
-        # Construct 16-bit header
-        # Flush 32-bits
-        self.mdio_flush()
-        # Transfer 16-bit header
-        tat = 0x3 if is_read else tat
-        hdr = (st & 0x3) << 14 | (op & 0x3) << 12 | (pad & 0x1F) << 7 | (dad & 0x1F) << 2 | (tat & 0x3)
-        self._bus.transfer(tx_data=hdr.to_bytes(2, byteorder='big'), cs_change=False)
-        # Read next 16 bits
-        if is_read:
-            rst = self._bus.transfer(rx_data=val.to_bytes(2, byteorder='big'), cs_change=False)
-            val = int.from_bytes(rst, byteorder='big') & 0xFFFF
-        else:
-            self._bus.transfer(tx_data=hdr.to_bytes(2, byteorder='big'), cs_change=False)
-        # self.mdio_flush()
-        return val
+        self._msg.clear()
+        # Transmit preamble + header, then read next 16 bits
+        self._put_frame(0, 0, st, op, pad, dad, None if is_read else val, tat)
+        rst = self._send(1 if is_read else 0)
+        return rst[0] if is_read else val
 
-    def read_c22_register(self, pad: int, reg: int):
-        """ Read reg in CLAUSE22. [01|01|5-bit pad|5-bit reg|XX|16-bit val]
-            Args:
-                pad (int): 5-bit physical address
-                reg (int): 5-bit register address
-            Returns:
-                int: 16-bit register value
-        """
-        val = self.mdio_xfer(MDIOSPI.C22_FRAME, MDIOSPI.OP_C22_RD, pad=pad, dad=reg)
-        return val
+    def _write_frame(self, st: int, op: int, pad: int, dad: int, val: int):
+        self.mdio_xfer(st, op, pad=pad, dad=dad, val=val)
 
-    def read_c45_register(self, pad: int, dad: int, reg: int):
-        """ Read reg in CLAUSE45.
-            [00|00|5-bit pad|5-bit dad|XX|16-bit reg]
-            [00|11|5-bit pad|5-bit dad|XX|16-bit val]
-            Args:
-                pad (int): 5-bit physical address
-                dad (int): 5-bit device type
-                reg (int): 16-bit register address
-            Returns:
-                int: 16-bit register value
-        """
-        self.mdio_xfer(MDIOSPI.C45_FRAME, MDIOSPI.OP_C45_AD, pad=pad, dad=dad, val=reg)
-        val = self.mdio_xfer(MDIOSPI.C45_FRAME, MDIOSPI.OP_C45_RD, pad=pad, dad=dad)
-        return val
+    def _read_frame(self, st: int, op: int, pad: int, dad: int) -> int:
+        return self.mdio_xfer(st, op, pad=pad, dad=dad)
 
-    def write_c22_register(self, pad: int, reg: int, val: int):
-        """ Write reg in CLAUSE22. [01|01|5-bit pad|5-bit reg|01|16-bit val]
-            Args:
-                pad (int): 5-bit physical address
-                reg (int): 5-bit register address
-                val (int): 16-bit register value
-        """
-        self.mdio_xfer(MDIOSPI.C22_FRAME, MDIOSPI.OP_C22_WR, pad=pad, dad=reg, val=val)
+    def _finish(self):
+        if self.flush:
+            self.mdio_flush()
 
-    def write_c45_register(self, pad: int, dad: int, reg: int, val: int):
-        """ Write reg in CLAUSE45.
-            [00|00|5-bit pad|5-bit dad|01|16-bit reg]
-            [00|01|5-bit pad|5-bit dad|01|16-bit val]
-            Args:
-                pad (int): 5-bit physical address
-                dad (int): 5-bit device type
-                reg (int): 16-bit register address
-                val (int): 16-bit register value
-        """
-        self.mdio_xfer(MDIOSPI.C45_FRAME, MDIOSPI.OP_C45_AD, pad=pad, dad=dad, val=reg)
-        self.mdio_xfer(MDIOSPI.C45_FRAME, MDIOSPI.OP_C45_RD, pad=pad, dad=dad, val=val)
-
-    def read_c22_registers(self, pad: int, regs: List[int]):
-        """ Read multiple registers in CLAUSE22.
-            Args:
-                pad (int): 5-bit physical address
-                regs (List[int]): List of 5-bit register addreses
-            Return:
-                List[int]: List of 16-bit register values
-        """
-        return [self.read_c22_register(pad, reg) for reg in regs]
-
-    def read_c45_registers(self, pad: int, dad: int, regs: List[int]):
-        """ Read multiple registers in CLAUSE45.
-            NOTE: C45 supports read and addr++ but not sure if supported.
-            Args:
-                pad (int): 5-bit physical address
-                dad (int): 5-bit device type
-                regs (List[int]): List of 16-bit register addreses
-            Return:
-                List[int]: List of 16-bit register values
-        """
-        return [self.read_c45_register(pad, dad, reg) for reg in regs]
-
-    def write_c22_registers(self, pad: int, regs: List[int], vals: List[int]):
-        """ Write multiple registers in CLAUSE22.
-            Args:
-                pad (int): 5-bit physical address
-                regs (List[int]): List of 5-bit register addreses
-                vals (List[int]): List of 16-bit register values
-        """
-        return [self.write_c22_register(pad, reg, val) for reg, val in zip(regs, vals)]
-
-    def write_c45_registers(self, pad: int, dad: int, regs: List[int], vals: List[int]):
-        """ Write multiple registers in CLAUSE45.
-            Args:
-                pad (int): 5-bit physical address
-                dad (int): 5-bit device type
-                regs (List[int]): List of 16-bit register addreses
-                vals (List[int]): List of 16-bit register values
+    def _transact(self, frames: List[Frame], finish: bool = True) -> List[int]:
+        """ Send frames as SPI_IOC_MESSAGE(N) segments: consecutive transmit phases merge into one
+            segment and each read adds a 2-byte receive segment. Split only at segment/buffer limits.
         """
-        return [self.write_c45_register(pad, dad, reg, val) for reg, val in zip(regs, vals)]
+        vals: List[int] = []
+        if not frames:
+            return vals
+        msg = self._msg
+        msg.clear()
+        pos = nreads = 0
+        try:
+            # Each frame transmits preamble/header(/value), reads receive 16-bit value
+            for st, op, pad, dad, val in frames:
+                if pos + 8 > MDIOSPI.MAX_MESSAGE_BYTES or msg.count + 2 > msg.max_segments:
+                    vals += self._send(nreads)
+                    pos = nreads = 0
+                pos = self._put_frame(pos, nreads, st, op, pad, dad, val)
+                nreads += val is None
+            if self.flush and finish:
+                if pos + 4 > MDIOSPI.MAX_MESSAGE_BYTES or msg.count + 1 > msg.max_segments:
+                    vals += self._send(nreads)
+                    pos = nreads = 0
+                self._put_flush(pos)
+            vals += self._send(nreads)
+        except Exception:
+            # Device address pointers unknown after partial operation
+            self._c45_addrs.clear()
+            raise
+        return vals
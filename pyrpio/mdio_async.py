@@ -0,0 +1,177 @@
+""" asyncio front-end for MDIO buses. """
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+from pyrpio.mdio import MDIOBase
+from pyrpio.mdio_pool import check_op, run_ops
+
+# Queue item: (op, None) for batchable op, (fn, args) for call
+_Item = Tuple[Any, Optional[tuple]]
+
+
+def _execute(bus: MDIOBase, items: List[_Item]) -> List[Tuple[bool, Any]]:
+    """ Run queued items in order: consecutive ops as one batch, calls individually.
+        Ops are validated when queued, so a batch only fails as a whole on bus errors.
+        Returns (ok, result or exception) per item.
+    """
+    out: List[Tuple[bool, Any]] = []
+    i = 0
+    while i < len(items):
+        if items[i][1] is not None:
+            fn, args = items[i]
+            try:
+                out.append((True, fn(bus, *args)))
+            except Exception as e:
+                out.append((False, e))
+            i += 1
+            continue
+        j = i
+        while j < len(items) and items[j][1] is None:
+            j += 1
+        try:
+            out += [(True, rst) for rst in run_ops(bus, [op for op, _ in items[i:j]])]
+        except Exception as e:
+            # Bus error: frames of merged ops share one transaction
+            out += [(False, e)] * (j - i)
+        i = j
+    return out
+
+
+class AsyncMDIO:
+    """ Awaitable register access on an MDIO/MDIOSPI bus.
+        Bus I/O runs on a dedicated executor thread so event loop never blocks.
+        Requests queued while a batch is on the bus are merged into next batch (see MDIOBase.batch).
+    """
+
+    def __init__(self, bus: MDIOBase, max_batch: int = 256):
+        """
+        Args:
+            bus (MDIOBase): Bus to wrap (MDIO or MDIOSPI)
+            max_batch (int, optional): Max queued requests merged into one batch. Defaults to 256.
+        """
+        self.bus = bus
+        self.max_batch = max_batch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='mdio')
+        self._pending: List[Tuple[_Item, asyncio.Future]] = []
+        self._busy = False
+        self._closed = False
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, t, value, traceback):
+        await self.close()
+
+    async def open(self, *args):
+        """ Open mdio bus. """
+        await self.call(lambda bus: bus.open(*args))
+
+    async def close(self):
+        """ Close mdio bus and stop executor. Requests queued before close still run, later ones raise RuntimeError. """
+        closed = self._submit((lambda bus: bus.close(), ()))
+        self._closed = True
+        try:
+            await closed
+        finally:
+            self._executor.shutdown(wait=False)
+
+    def _submit(self, item: _Item) -> asyncio.Future:
+        if self._closed:
+            raise RuntimeError('AsyncMDIO is closed.')
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((item, fut))
+        if not self._busy:
+            self._busy = True
+            # Let coroutines scheduled in same loop iteration join batch
+            loop.call_soon(self._drain, loop)
+        return fut
+
+    def _drain(self, loop: asyncio.AbstractEventLoop):
+        queued, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+        try:
+            task = loop.run_in_executor(self._executor, _execute, self.bus, [item for item, _ in queued])
+        except Exception as e:
+            # Executor unusable (e.g. shut down), fail everything queued so no caller waits forever
+            queued, self._pending = queued + self._pending, []
+            for _, fut in queued:
+                if not fut.done():
+                    fut.set_exception(e)
+            self._busy = False
+            return
+        task.add_done_callback(lambda task: self._done(loop, queued, task))
+
+    def _done(self, loop: asyncio.AbstractEventLoop, queued: List[Tuple[_Item, asyncio.Future]], task: asyncio.Future):
+        if task.cancelled() or task.exception() is not None:
+            out = [(False, task.exception() if not task.cancelled() else asyncio.CancelledError())] * len(queued)
+        else:
+            out = task.result()
+        for (_, fut), (ok, rst) in zip(queued, out):
+            if fut.done():
+                continue
+            if ok:
+                fut.set_result(rst)
+            else:
+                fut.set_exception(rst)
+        if self._pending:
+            self._drain(loop)
+        else:
+            self._busy = False
+
+    async def _op(self, *op: Any):
+        check_op(op)
+        return await self._submit((op, None))
+
+    async def call(self, fn: Callable, *args):
+        """ Run fn(bus, *args) on executor in queue order.
+            Args:
+                fn (Callable): Function taking bus as first argument
+            Returns:
+                Return value of fn
+        """
+        return await self._submit((fn, args))
+
+    async def read_c22_register(self, pad: int, reg: int) -> int:
+        """ Read reg in CLAUSE22 (see MDIOBase.read_c22_register). """
+        return await self._op('read_c22_register', pad, reg)
+
+    async def read_c45_register(self, pad: int, dad: int, reg: int) -> int:
+        """ Read reg in CLAUSE45 (see MDIOBase.read_c45_register). """
+        return await self._op('read_c45_register', pad, dad, reg)
+
+    async def write_c22_register(self, pad: int, reg: int, val: int):
+        """ Write reg in CLAUSE22 (see MDIOBase.write_c22_register). """
+        await self._op('write_c22_register', pad, reg, val)
+
+    async def write_c45_register(self, pad: int, dad: int, reg: int, val: int):
+        """ Write reg in CLAUSE45 (see MDIOBase.write_c45_register). """
+        await self._op('write_c45_register', pad, dad, reg, val)
+
+    async def modify_c22_register(self, pad: int, reg: int, mask: int, val: int) -> int:
+        """ Read-modify-write bits in mask in CLAUSE22. Returns value before modification. """
+        return await self._op('modify_c22_register', pad, reg, mask, val)
+
+    async def modify_c45_register(self, pad: int, dad: int, reg: int, mask: int, val: int) -> int:
+        """ Read-modify-write bits in mask in CLAUSE45. Returns value before modification. """
+        return await self._op('modify_c45_register', pad, dad, reg, mask, val)
+
+    async def read_c22_registers(self, pad: int, regs: List[int]) -> List[int]:
+        """ Read multiple registers in CLAUSE22 (see MDIOBase.read_c22_registers). """
+        return await self.call(MDIOBase.read_c22_registers, pad, regs)
+
+    async def read_c45_registers(self, pad: int, dad: int, regs: List[int]) -> List[int]:
+        """ Read multiple registers in CLAUSE45 (see MDIOBase.read_c45_registers). """
+        return await self.call(MDIOBase.read_c45_registers, pad, dad, regs)
+
+    async def read_c45_range(self, pad: int, dad: int, start: int, count: int) -> List[int]:
+        """ Read consecutive registers in CLAUSE45 (see MDIOBase.read_c45_range). """
+        return await self.call(MDIOBase.read_c45_range, pad, dad, start, count)
+
+    async def write_c22_registers(self, pad: int, regs: List[int], vals: List[int]):
+        """ Write multiple registers in CLAUSE22 (see MDIOBase.write_c22_registers). """
+        await self.call(MDIOBase.write_c22_registers, pad, regs, vals)
+
+    async def write_c45_registers(self, pad: int, dad: int, regs: List[int], vals: List[int]):
+        """ Write multiple registers in CLAUSE45 (see MDIOBase.write_c45_registers). """
+        await self.call(MDIOBase.write_c45_registers, pad, dad, regs, vals)
@@ -0,0 +1,146 @@
+""" Queue MDIO register operations and execute them in one pass. """
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from pyrpio.mdio_cache import MDIOCache
+
+if TYPE_CHECKING:
+    from pyrpio.mdio import Frame, MDIOBase
+
+
+class MDIOBatch:
+    """ Register operations queued on a bus and executed in one pass.
+        Frames of all operations are sent as one transaction (single trailing flush, merged
+        C45 address frames, single ioctl over SPI). Read-modify-writes split the transaction
+        since the written value depends on the value read.
+    """
+    _RD_C22 = 0
+    _RD_C45 = 1
+    _WR_C22 = 2
+    _WR_C45 = 3
+    _RMW_C22 = 4
+    _RMW_C45 = 5
+
+    def __init__(self, bus: 'MDIOBase'):
+        self._bus = bus
+        self._ops: List[Tuple[int, int, int, int, int, int]] = []
+        self._last_write: Dict[Tuple[int, int, int], int] = {}
+        self.results: List[Optional[int]] = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        if t is None:
+            self.execute()
+
+    def __len__(self):
+        return len(self._ops)
+
+    def _queue(self, kind: int, pad: int, dad: int, reg: int, mask: int = 0, val: int = 0) -> int:
+        self._ops.append((kind, pad, dad, reg, mask, val))
+        return len(self._ops) - 1
+
+    def read_c22_register(self, pad: int, reg: int) -> int:
+        """ Queue CLAUSE22 read. Result is 16-bit register value.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._RD_C22, pad, MDIOCache.C22, reg)
+
+    def read_c45_register(self, pad: int, dad: int, reg: int) -> int:
+        """ Queue CLAUSE45 read. Result is 16-bit register value.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._RD_C45, pad, dad, reg)
+
+    def write_c22_register(self, pad: int, reg: int, val: int) -> int:
+        """ Queue CLAUSE22 write. Result is None.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._WR_C22, pad, MDIOCache.C22, reg, val=val)
+
+    def write_c45_register(self, pad: int, dad: int, reg: int, val: int) -> int:
+        """ Queue CLAUSE45 write. Result is None.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._WR_C45, pad, dad, reg, val=val)
+
+    def modify_c22_register(self, pad: int, reg: int, mask: int, val: int) -> int:
+        """ Queue CLAUSE22 read-modify-write of bits in mask. Write is skipped if bits already set.
+            Result is 16-bit register value before modification.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._RMW_C22, pad, MDIOCache.C22, reg, mask, val)
+
+    def modify_c45_register(self, pad: int, dad: int, reg: int, mask: int, val: int) -> int:
+        """ Queue CLAUSE45 read-modify-write of bits in mask. Write is skipped if bits already set.
+            Result is 16-bit register value before modification.
+            Returns:
+                int: Index of result
+        """
+        return self._queue(MDIOBatch._RMW_C45, pad, dad, reg, mask, val)
+
+    def execute(self) -> List[Optional[int]]:
+        """ Execute queued operations and clear queue.
+            Returns:
+                List[Optional[int]]: Result per operation in queued order
+        """
+        # pylint: disable=protected-access
+        bus = self._bus
+        ops, self._ops = self._ops, []
+        results: List[Optional[int]] = [None] * len(ops)
+        frames: List['Frame'] = []
+        pending: List[int] = []
+        unfinished = False
+        # Last op writing each register, values read before it must not be cached
+        self._last_write = {
+            (pad, dad, reg): i for i, (kind, pad, dad, reg, _, _) in enumerate(ops)
+            if kind not in (MDIOBatch._RD_C22, MDIOBatch._RD_C45)
+        }
+        for i, (kind, pad, dad, reg, mask, val) in enumerate(ops):
+            if kind in (MDIOBatch._RD_C22, MDIOBatch._RD_C45) and bus.cache is not None:
+                results[i] = bus.cache.get(pad, dad, reg)
+                if results[i] is not None:
+                    continue
+            if kind in (MDIOBatch._RD_C22, MDIOBatch._RMW_C22):
+                frames += bus._c22_read_frames(pad, reg)
+                pending.append(i)
+            elif kind in (MDIOBatch._RD_C45, MDIOBatch._RMW_C45):
+                frames += bus._c45_read_frames(pad, dad, reg)
+                pending.append(i)
+            elif kind == MDIOBatch._WR_C22:
+                frames += bus._c22_write_frames(pad, reg, val)
+            else:
+                frames += bus._c45_write_frames(pad, dad, reg, val)
+            if kind not in (MDIOBatch._RMW_C22, MDIOBatch._RMW_C45):
+                continue
+            # Value to write depends on value read, no flush in between
+            self._collect(ops, pending, bus._transact(frames, finish=False), results)
+            frames, pending, unfinished = [], [], True
+            new = (results[i] & ~mask) | (val & mask)
+            if new == results[i]:
+                continue
+            if kind == MDIOBatch._RMW_C22:
+                frames += bus._c22_write_frames(pad, reg, new)
+            else:
+                # Address pointer still at reg after read
+                frames.append(bus._c45_val_frame(pad, dad, new))
+                bus._c45_written(pad, dad, reg, new)
+        if frames:
+            self._collect(ops, pending, bus._transact(frames), results)
+        elif unfinished:
+            bus._finish()
+        self.results = results
+        return results
+
+    def _collect(self, ops: List[Tuple[int, int, int, int, int, int]], pending: List[int],
+                 vals: List[int], results: List[Optional[int]]):
+        for i, val in zip(pending, vals):
+            results[i] = val
+            if self._bus.cache is not None:
+                _, pad, dad, reg, _, _ = ops[i]
+                if self._last_write.get((pad, dad, reg), -1) <= i:
+                    self._bus.cache.put(pad, dad, reg, val)
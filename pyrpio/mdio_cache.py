@@ -0,0 +1,81 @@
+""" MDIO register value cache. """
+import time
+from typing import Callable, Dict, Optional, Tuple, Union
+
+
+class MDIOCache:
+    """ Register value cache with per-register policy.
+        Policy is 'static' (cached until invalidated), 'volatile' (never cached)
+        or TTL in seconds. Writes through bus invalidate affected entries.
+    """
+    STATIC = 'static'
+    VOLATILE = 'volatile'
+    # Pseudo device type used for CLAUSE22 entries
+    C22 = -1
+    # PHY identifier and extended status
+    C22_DEFAULT = {2: STATIC, 3: STATIC, 15: STATIC}
+    # Device identifier, devices in package and package identifier (any MMD)
+    C45_DEFAULT = {2: STATIC, 3: STATIC, 5: STATIC, 6: STATIC, 14: STATIC, 15: STATIC}
+
+    def __init__(self, c22: Optional[Dict[int, Union[str, float]]] = None,
+                 c45: Optional[Dict[Union[int, Tuple[int, int]], Union[str, float]]] = None,
+                 default: Union[str, float] = VOLATILE, clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            c22 (dict, optional): Policy per CLAUSE22 reg. Defaults to C22_DEFAULT.
+            c45 (dict, optional): Policy per CLAUSE45 (dad, reg), or reg for any dad. Defaults to C45_DEFAULT.
+            default (str, float, optional): Policy of registers not in tables. Defaults to 'volatile'.
+            clock (Callable, optional): Time source in seconds for TTL. Defaults to time.monotonic.
+        """
+        self.c22 = dict(MDIOCache.C22_DEFAULT if c22 is None else c22)
+        self.c45 = dict(MDIOCache.C45_DEFAULT if c45 is None else c45)
+        self.default = default
+        for policy in [default, *self.c22.values(), *self.c45.values()]:
+            if policy not in (MDIOCache.STATIC, MDIOCache.VOLATILE) and not (isinstance(policy, (int, float)) and policy > 0):
+                raise ValueError(f'Invalid policy {policy!r}, can be: "static", "volatile" or TTL seconds > 0.')
+        self._clock = clock
+        self._values: Dict[Tuple[int, int, int], Tuple[int, Optional[float]]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._values)
+
+    def policy(self, dad: int, reg: int) -> Union[str, float]:
+        """ Policy of register (dad of MDIOCache.C22 for CLAUSE22). """
+        if dad == MDIOCache.C22:
+            return self.c22.get(reg, self.default)
+        return self.c45.get((dad, reg), self.c45.get(reg, self.default))
+
+    def get(self, pad: int, dad: int, reg: int) -> Optional[int]:
+        """ Cached register value or None if missing/expired. """
+        entry = self._values.get((pad, dad, reg))
+        if entry is not None and entry[1] is not None and self._clock() >= entry[1]:
+            del self._values[(pad, dad, reg)]
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def put(self, pad: int, dad: int, reg: int, val: int):
+        """ Store register value read from bus (ignored for volatile registers). """
+        policy = self.policy(dad, reg)
+        if policy == MDIOCache.VOLATILE:
+            return
+        expires = None if policy == MDIOCache.STATIC else self._clock() + policy
+        self._values[(pad, dad, reg)] = (val, expires)
+
+    def invalidate(self, pad: Optional[int] = None, dad: Optional[int] = None, reg: Optional[int] = None):
+        """ Drop cached entries. None matches all.
+            Args:
+                pad (int, optional): 5-bit physical address
+                dad (int, optional): 5-bit device type (MDIOCache.C22 for CLAUSE22)
+                reg (int, optional): Register address
+        """
+        if pad is None and dad is None and reg is None:
+            self._values.clear()
+            return
+        for key in [k for k in self._values if pad in (None, k[0]) and dad in (None, k[1]) and reg in (None, k[2])]:
+            del self._values[key]
@@ -0,0 +1,151 @@
+""" MDIO via FTDI USB-Serial MPSSE engine (FT232H, FT2232H, FT4232H). """
+from typing import List, Optional
+from pyrpio.mdio import Frame, MDIOBase
+from pyrpio.mdio_cache import MDIOCache
+
+try:
+    from pyftdi.ftdi import Ftdi  # pylint: disable=import-error
+except ImportError:
+    Ftdi = None
+
+
+class FtdiMDIO(MDIOBase):
+    """ MDIO clocked by FTDI MPSSE engine.
+        Wiring: ADBUS0 (TCK/SK) to MDC, ADBUS1 (TDO/DO) and ADBUS2 (TDI/DI) tied to MDIO with external pull-up.
+        Frames of an operation or batch are queued as MPSSE commands in one USB write
+        and their read values returned in one USB read.
+    """
+    _MDC = 0x01
+    _MDO = 0x02
+    _MDI = 0x04
+    # MPSSE opcodes (see FTDI AN108)
+    _WRITE_BYTES_NVE_MSB = 0x11
+    _WRITE_BITS_NVE_MSB = 0x13
+    _READ_BYTES_PVE_MSB = 0x20
+    _READ_BITS_PVE_MSB = 0x22
+    _SET_BITS_LOW = 0x80
+    _SEND_IMMEDIATE = 0x87
+    # Keep read data below device TX FIFO so queued commands never stall
+    MAX_READS_PER_XFER = 128
+
+    def __init__(self, url: str = 'ftdi://ftdi:232h:1/1', mdc_hz: float = 1E6,
+                 preamble: str = MDIOBase.PREAMBLE_FULL, flush: bool = True, track_address: bool = True,
+                 cache: Optional[MDIOCache] = None, ftdi=None):
+        """
+        FTDI MPSSE based MDIO interface.
+        Args:
+            url (str, optional): FTDI device url. Defaults to 'ftdi://ftdi:232h:1/1'.
+            mdc_hz (float, optional): MDC frequency. Defaults to 1E6.
+            preamble (str, optional): Preamble policy, 'full' or 'suppressed'. Defaults to 'full'.
+            flush (bool, optional): Send 32-bit flush after each operation. Defaults to True.
+            track_address (bool, optional): Skip C45 address frame when unchanged. Defaults to True.
+            cache (MDIOCache, optional): Register value cache. Defaults to None.
+            ftdi (Ftdi, optional): Use given MPSSE device instead of opening url (e.g. mdio_sim.SimMPSSE).
+        """
+        super().__init__(preamble=preamble, flush=flush, track_address=track_address, cache=cache)
+        self.url = url
+        self._mdc_target = mdc_hz
+        self._mdc_hz: Optional[float] = None
+        self._own_ftdi = ftdi is None
+        self._ftdi = ftdi
+
+    def open(self):
+        """ Open mdio bus. """
+        self._reset_bus_state()
+        if self._own_ftdi:
+            if Ftdi is None:
+                raise ImportError('pyftdi is required for FtdiMDIO.')
+            self._ftdi = Ftdi()
+            self._mdc_hz = self._ftdi.open_mpsse_from_url(
+                self.url, direction=FtdiMDIO._MDC | FtdiMDIO._MDO, initial=FtdiMDIO._MDO, frequency=self._mdc_target
+            )
+        else:
+            self._mdc_hz = self._mdc_target
+        # MDC low, MDIO driven high
+        self._ftdi.write_data(bytes((FtdiMDIO._SET_BITS_LOW, FtdiMDIO._MDO, FtdiMDIO._MDC | FtdiMDIO._MDO)))
+
+    def close(self):
+        """ Close mdio bus. """
+        if self._own_ftdi and self._ftdi is not None:
+            self._ftdi.close()
+            self._ftdi = None
+
+    @property
+    def mdc_hz(self) -> Optional[float]:
+        """ Achieved MDC frequency (after open). """
+        return self._mdc_hz
+
+    @staticmethod
+    def _shift_out(cmd: bytearray, val: int, bits: int):
+        """ Queue bits of value MSB first, data changing on falling edge. """
+        nbytes, rem = divmod(bits, 8)
+        if nbytes:
+            cmd.extend((FtdiMDIO._WRITE_BYTES_NVE_MSB, (nbytes - 1) & 0xFF, (nbytes - 1) >> 8))
+            cmd += (val >> rem).to_bytes(nbytes, byteorder='big')
+        if rem:
+            cmd.extend((FtdiMDIO._WRITE_BITS_NVE_MSB, rem - 1, (val << (8 - rem)) & 0xFF))
+
+    def _frame_cmd(self, cmd: bytearray, st: int, op: int, pad: int, dad: int, val: Optional[int]):
+        """ Queue preamble + frame. Reads release MDIO for turnaround and 16-bit value (3 response bytes). """
+        bits = self._preamble_bits()
+        self._shift_out(cmd, (1 << bits) - 1, bits)
+        hdr = (st & 0x3) << 12 | (op & 0x3) << 10 | (pad & 0x1F) << 5 | (dad & 0x1F)
+        if val is not None:
+            # Turnaround(10) + 16-bit value
+            self._shift_out(cmd, hdr << 18 | 0x2 << 16 | (val & 0xFFFF), 32)
+            return
+        self._shift_out(cmd, hdr, 14)
+        cmd.extend((
+            FtdiMDIO._SET_BITS_LOW, FtdiMDIO._MDO, FtdiMDIO._MDC,
+            FtdiMDIO._READ_BITS_PVE_MSB, 1,
+            FtdiMDIO._READ_BYTES_PVE_MSB, 1, 0,
+            FtdiMDIO._SET_BITS_LOW, FtdiMDIO._MDO, FtdiMDIO._MDC | FtdiMDIO._MDO
+        ))
+
+    def _xfer(self, cmd: bytearray, nreads: int) -> List[int]:
+        if not nreads:
+            self._ftdi.write_data(cmd)
+            return []
+        cmd.append(FtdiMDIO._SEND_IMMEDIATE)
+        self._ftdi.write_data(cmd)
+        rsp = self._ftdi.read_data_bytes(3 * nreads, attempt=16)
+        if len(rsp) != 3 * nreads:
+            raise IOError(f'FTDI MDIO read returned {len(rsp)} of {3 * nreads} bytes.')
+        # Skip turnaround byte
+        return [rsp[i + 1] << 8 | rsp[i + 2] for i in range(0, len(rsp), 3)]
+
+    def _transact(self, frames: List[Frame], finish: bool = True) -> List[int]:
+        """ Queue frames (and trailing flush) as MPSSE commands in as few USB transfers as possible. """
+        vals: List[int] = []
+        if not frames:
+            return vals
+        try:
+            cmd = bytearray()
+            nreads = 0
+            for st, op, pad, dad, val in frames:
+                if val is None and nreads == FtdiMDIO.MAX_READS_PER_XFER:
+                    vals += self._xfer(cmd, nreads)
+                    cmd, nreads = bytearray(), 0
+                self._frame_cmd(cmd, st, op, pad, dad, val)
+                nreads += val is None
+            if finish and self.flush:
+                self._shift_out(cmd, 0xFFFFFFFF, 32)
+            if cmd:
+                vals += self._xfer(cmd, nreads)
+        except Exception:
+            # Device address pointers unknown after partial operation
+            self._c45_addrs.clear()
+            raise
+        return vals
+
+    def _write_frame(self, st: int, op: int, pad: int, dad: int, val: int):
+        self._transact([(st, op, pad, dad, val)], finish=False)
+
+    def _read_frame(self, st: int, op: int, pad: int, dad: int) -> int:
+        return self._transact([(st, op, pad, dad, None)], finish=False)[0]
+
+    def _finish(self):
+        if self.flush:
+            cmd = bytearray()
+            self._shift_out(cmd, 0xFFFFFFFF, 32)
+            self._ftdi.write_data(cmd)
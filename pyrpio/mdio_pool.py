@@ -0,0 +1,184 @@
+""" Run several MDIO buses concurrently, one worker per bus. """
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from pyrpio.mdio import MDIOBase
+
+# Op: (MDIOBatch method name, *args), e.g. ('read_c45_register', pad, dad, reg)
+Op = Tuple[Any, ...]
+
+# Argument (name, max value) per op method
+_OP_ARGS = {
+    'read_c22_register': (('pad', 0x1F), ('reg', 0x1F)),
+    'read_c45_register': (('pad', 0x1F), ('dad', 0x1F), ('reg', 0xFFFF)),
+    'write_c22_register': (('pad', 0x1F), ('reg', 0x1F), ('val', 0xFFFF)),
+    'write_c45_register': (('pad', 0x1F), ('dad', 0x1F), ('reg', 0xFFFF), ('val', 0xFFFF)),
+    'modify_c22_register': (('pad', 0x1F), ('reg', 0x1F), ('mask', 0xFFFF), ('val', 0xFFFF)),
+    'modify_c45_register': (('pad', 0x1F), ('dad', 0x1F), ('reg', 0xFFFF), ('mask', 0xFFFF), ('val', 0xFFFF)),
+}
+
+OPS = tuple(_OP_ARGS)
+
+# Bus owned by worker process
+_worker_bus: Optional[MDIOBase] = None
+
+
+def _open_bus(factory: Callable[..., MDIOBase], args: tuple, kwargs: dict) -> MDIOBase:
+    bus = factory(*args, **kwargs)
+    bus.open()
+    return bus
+
+
+def _worker_init(factory: Callable[..., MDIOBase], args: tuple, kwargs: dict):
+    global _worker_bus  # pylint: disable=global-statement
+    _worker_bus = _open_bus(factory, args, kwargs)
+
+
+def _worker_call(bus: Optional[MDIOBase], fn: Callable, args: tuple):
+    return fn(bus or _worker_bus, *args)
+
+
+def check_op(op: Op):
+    """ Validate op before queuing it, so a batch cannot fail partway on bad arguments.
+        Args:
+            op (Op): (method, *args), method one of OPS
+        Raises:
+            ValueError: Unknown method or argument out of range
+            TypeError: Wrong number or type of arguments
+    """
+    if not op or op[0] not in OPS:
+        raise ValueError(f'Invalid op {op!r}, method can be: {", ".join(OPS)}.')
+    args = _OP_ARGS[op[0]]
+    if len(op) - 1 != len(args):
+        raise TypeError(f'{op[0]} takes {len(args)} arguments ({", ".join(name for name, _ in args)}), got {len(op) - 1}.')
+    for (name, limit), arg in zip(args, op[1:]):
+        if not isinstance(arg, int):
+            raise TypeError(f'Invalid {name} type in op {op!r}, should be integer.')
+        if not 0 <= arg <= limit:
+            raise ValueError(f'Invalid {name} in op {op!r}, must be within 0..{limit:#x}.')
+
+
+def run_ops(bus: MDIOBase, ops: Sequence[Op]) -> List[Optional[int]]:
+    """ Execute op list on bus as one batch (see MDIOBase.batch).
+        Args:
+            bus (MDIOBase): Open bus
+            ops (Sequence[Op]): Ops as (method, *args), method one of OPS (see check_op)
+        Returns:
+            List[Optional[int]]: Results in op order
+    """
+    with bus.batch() as b:
+        for op in ops:
+            getattr(b, op[0])(*op[1:])
+    return b.results
+
+
+def _close_bus(bus: MDIOBase):
+    bus.close()
+
+
+class MDIOPool:
+    """ Pool of MDIO buses, each driven by its own worker.
+        Operations on one bus run in order; operations on different buses run concurrently.
+        Thread workers suit MDIOSPI and FtdiMDIO, whose device I/O releases the GIL, and the native
+        MDIO backend, which releases it only while clocking each frame (Python work in between still serializes).
+        Process workers suit pure-Python bit-bang (cdev backend), which holds the GIL throughout.
+    """
+    MODE_THREAD = 'thread'
+    MODE_PROCESS = 'process'
+
+    def __init__(self, mode: str = MODE_THREAD):
+        """
+        Args:
+            mode (str, optional): Worker type, 'thread' or 'process'. Defaults to 'thread'.
+        """
+        if mode not in (MDIOPool.MODE_THREAD, MDIOPool.MODE_PROCESS):
+            raise ValueError(f'Invalid mode, can be: "{MDIOPool.MODE_THREAD}", "{MDIOPool.MODE_PROCESS}".')
+        self.mode = mode
+        self._workers: Dict[str, Tuple[Executor, Optional[MDIOBase]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def __len__(self):
+        return len(self._workers)
+
+    @property
+    def names(self) -> List[str]:
+        """ Names of buses in pool. """
+        return list(self._workers)
+
+    def add_bus(self, name: str, factory: Callable[..., MDIOBase], *args, **kwargs):
+        """ Add bus to pool. Bus is created by factory(*args, **kwargs) and opened in its worker.
+            Process mode requires factory and arguments to be picklable (e.g. MDIO class itself).
+            Args:
+                name (str): Bus name used to submit operations
+                factory (Callable): Bus constructor, e.g. MDIO or MDIOSPI
+        """
+        if name in self._workers:
+            raise ValueError(f'Bus {name} already in pool.')
+        if self.mode == MDIOPool.MODE_PROCESS:
+            executor: Executor = ProcessPoolExecutor(max_workers=1, initializer=_worker_init, initargs=(factory, args, kwargs))
+        else:
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f'mdio-{name}')
+        try:
+            if self.mode == MDIOPool.MODE_PROCESS:
+                # Start worker now so bus errors surface here
+                executor.submit(int).result()
+                bus = None
+            else:
+                bus = executor.submit(_open_bus, factory, args, kwargs).result()
+        except BaseException:
+            executor.shutdown(wait=True)
+            raise
+        self._workers[name] = (executor, bus)
+
+    def submit(self, name: str, ops: Sequence[Op]) -> Future:
+        """ Execute op list on bus as one batch (see MDIOBase.batch).
+            Args:
+                name (str): Bus name
+                ops (Sequence[Op]): Ops as (method, *args), method one of OPS
+            Returns:
+                Future: Resolves to list of results in op order
+        """
+        for op in ops:
+            check_op(op)
+        return self.call(name, run_ops, list(ops))
+
+    def submit_all(self, ops_by_bus: Dict[str, Sequence[Op]]) -> Dict[str, Future]:
+        """ Execute op lists on several buses concurrently.
+            Args:
+                ops_by_bus (Dict[str, Sequence[Op]]): Op list per bus name
+            Returns:
+                Dict[str, Future]: Future per bus name
+        """
+        return {name: self.submit(name, ops) for name, ops in ops_by_bus.items()}
+
+    def call(self, name: str, fn: Callable, *args) -> Future:
+        """ Run fn(bus, *args) in bus worker. Process mode requires fn to be picklable.
+            Args:
+                name (str): Bus name
+                fn (Callable): Function taking bus as first argument
+            Returns:
+                Future: Resolves to return value of fn
+        """
+        executor, bus = self._workers[name]
+        return executor.submit(_worker_call, bus, fn, args)
+
+    def close(self):
+        """ Close all buses and stop workers. Every bus is closed even if some fail.
+            Raises:
+                Exception: First bus close error, once all workers are stopped
+        """
+        workers, self._workers = self._workers, {}
+        errors = []
+        for executor, bus in workers.values():
+            try:
+                executor.submit(_worker_call, bus, _close_bus, ()).result()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                executor.shutdown(wait=True)
+        if errors:
+            raise errors[0]
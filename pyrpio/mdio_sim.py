@@ -0,0 +1,460 @@
+""" Software MDIO PHY simulator for hardware-free testing and benchmarking.
+    MDIOSimBus models MDC/MDIO wires (MDIO pulled up) with any number of simulated PHYs attached.
+    Connect MDIO via SimGPIOPair (CdevGPIOPair compatible), MDIOSPI via SimSPI or FtdiMDIO via SimMPSSE:
+        sim = MDIOSimBus([MDIOSimPHY(pad=1, c22={2: 0x0141})])
+        bus = MDIO(clk_pin=0, data_pin=1, path='sim', gpio=sim.gpio_pair(), clock_delay=0, setup_delay=0, read_delay=0)
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from pyrpio.spi import ByteLike
+
+# Decoded frame: (st, op, pad, dad, val), val of None for reads
+SimFrame = Tuple[int, int, int, int, Optional[int]]
+
+
+class MDIOSimPHY:
+    """ MDIO managed device state machine with CLAUSE22/CLAUSE45 register file.
+        Decodes preamble, start, opcode, addresses and turnaround on MDC rising edges and
+        drives turnaround + read value like a PHY. Supports C45 post-read-increment and
+        C22 indirect MMD access (registers 13/14). Two consecutive address frames select a 32-bit
+        register of c45_dword, accessed by following read/write frames LSB first.
+    """
+    MMD_CTRL = 0x0D
+    MMD_DATA = 0x0E
+
+    def __init__(self, pad: int, c22: Optional[Dict[int, int]] = None, c45: Optional[Dict[Tuple[int, int], int]] = None,
+                 preamble_suppression: bool = False, default: int = 0x0000,
+                 c45_dword: Optional[Dict[Tuple[int, int], int]] = None):
+        """
+        Args:
+            pad (int): 5-bit physical address
+            c22 (Dict[int, int], optional): CLAUSE22 register values
+            c45 (Dict[Tuple[int, int], int], optional): CLAUSE45 register values by (dad, reg)
+            preamble_suppression (bool, optional): Accept frames after single idle bit once synced. Defaults to False.
+            default (int, optional): Value of registers not in register file. Defaults to 0x0000.
+            c45_dword (Dict[Tuple[int, int], int], optional): CLAUSE45 32-bit register values by (dad, reg)
+        """
+        self.pad = pad
+        self.c22: Dict[int, int] = dict(c22 or {})
+        self.c45: Dict[Tuple[int, int], int] = dict(c45 or {})
+        self.c45_dword: Dict[Tuple[int, int], int] = dict(c45_dword or {})
+        self.addrs: Dict[int, int] = {}
+        self.preamble_suppression = preamble_suppression
+        self.default = default
+        self.frames: List[SimFrame] = []
+        self.out: Optional[int] = None
+        self._ones = 0
+        self._synced = False
+        self._bits: Optional[int] = None
+        self._nbits = 0
+        self._read_bits: Optional[List[int]] = None
+        # Selected 32-bit register as (dad, reg, next 16-bit half)
+        self._dword: Optional[Tuple[int, int, int]] = None
+
+    def rising(self, level: int):
+        """ Process MDC rising edge with sampled MDIO level. """
+        if self._read_bits is not None:
+            # Drive turnaround 0 then value, release after last bit
+            if self._read_bits:
+                self.out = self._read_bits.pop()
+            else:
+                self.out = None
+                self._read_bits = None
+            return
+        if self._bits is None:
+            if level:
+                self._ones += 1
+                return
+            if self._ones >= 32 or (self.preamble_suppression and self._synced and self._ones >= 1):
+                self._synced = True
+                self._bits = 0
+                self._nbits = 1
+            self._ones = 0
+            return
+        self._bits = (self._bits << 1) | level
+        self._nbits += 1
+        if self._nbits == 14:
+            st, op = self._bits >> 12, (self._bits >> 10) & 0x3
+            pad, dad = (self._bits >> 5) & 0x1F, self._bits & 0x1F
+            if (st == 1 and op == 2) or (st == 0 and op in (2, 3)):
+                self._bits = None
+                if pad != self.pad:
+                    return
+                self.frames.append((st, op, pad, dad, None))
+                val = self._read(st, op, dad)
+                # Popped from end: turnaround 0, then MSB first
+                self._read_bits = [(val >> i) & 1 for i in range(16)] + [0]
+        elif self._nbits == 32:
+            st, op = self._bits >> 30, (self._bits >> 28) & 0x3
+            pad, dad, val = (self._bits >> 23) & 0x1F, (self._bits >> 18) & 0x1F, self._bits & 0xFFFF
+            self._bits = None
+            if pad == self.pad:
+                self.frames.append((st, op, pad, dad, val))
+                self._write(st, op, dad, val)
+
+    def _mmd(self) -> Tuple[int, int]:
+        ctrl = self.c22.get(MDIOSimPHY.MMD_CTRL, 0)
+        return ctrl >> 14, ctrl & 0x1F
+
+    def _read(self, st: int, op: int, dad: int) -> int:
+        if st == 1:
+            if dad == MDIOSimPHY.MMD_DATA:
+                func, mmd = self._mmd()
+                if func == 0:
+                    return self.addrs.get(mmd, 0)
+                val = self.c45.get((mmd, self.addrs.get(mmd, 0)), self.default)
+                if func == 2:
+                    self.addrs[mmd] = (self.addrs.get(mmd, 0) + 1) & 0xFFFF
+                return val
+            return self.c22.get(dad, self.default)
+        half = self._dword_access(dad)
+        if half is not None:
+            key, shift = half
+            default = self.default << 16 | self.default
+            return (self.c45_dword.get(key, default) >> shift) & 0xFFFF
+        addr = self.addrs.get(dad, 0)
+        if op == 2:
+            self.addrs[dad] = (addr + 1) & 0xFFFF
+        return self.c45.get((dad, addr), self.default)
+
+    def _write(self, st: int, op: int, dad: int, val: int):
+        if st == 1:
+            if dad == MDIOSimPHY.MMD_DATA:
+                func, mmd = self._mmd()
+                if func == 0:
+                    self.addrs[mmd] = val
+                    return
+                self.c45[(mmd, self.addrs.get(mmd, 0))] = val
+                if func in (2, 3):
+                    self.addrs[mmd] = (self.addrs.get(mmd, 0) + 1) & 0xFFFF
+                return
+            self.c22[dad] = val
+        elif op == 0:
+            prev = self.frames[-2] if len(self.frames) > 1 else (1, 0, 0, 0, None)
+            if prev[:2] == (0, 0) and prev[3] == dad and self._dword is None:
+                # Second address frame holds MSB of 32-bit register address
+                self._dword = (dad, val << 16 | (prev[4] or 0), 0)
+            else:
+                self._dword = None
+            self.addrs[dad] = val
+        elif op == 1:
+            half = self._dword_access(dad)
+            if half is not None:
+                key, shift = half
+                self.c45_dword[key] = (self.c45_dword.get(key, 0) & ~(0xFFFF << shift)) | val << shift
+                return
+            self.c45[(dad, self.addrs.get(dad, 0))] = val
+
+    def _dword_access(self, dad: int) -> Optional[Tuple[Tuple[int, int], int]]:
+        """ Selected 32-bit register and bit shift of accessed half, None if not selected. """
+        if self._dword is None or self._dword[0] != dad:
+            self._dword = None
+            return None
+        dad, reg, half = self._dword
+        self._dword = (dad, reg, 1) if half == 0 else None
+        return (dad, reg), 16 * half
+
+
+class MDIOSimBus:
+    """ MDC/MDIO wires shared by station (pins or SPI) and simulated PHYs. MDIO is pulled up. """
+
+    def __init__(self, phys: Iterable[MDIOSimPHY] = ()):
+        self.phys: Dict[int, MDIOSimPHY] = {}
+        for phy in phys:
+            self.add_phy(phy)
+        self.mdc = 0
+        self.sta: Optional[int] = 1
+        self.edges = 0
+
+    def add_phy(self, phy: MDIOSimPHY):
+        """ Attach PHY to bus. """
+        self.phys[phy.pad] = phy
+
+    @property
+    def mdio(self) -> int:
+        """ MDIO level: PHY drive, else station drive, else pull-up. """
+        for phy in self.phys.values():
+            if phy.out is not None:
+                return phy.out
+        return 1 if self.sta is None else self.sta
+
+    def set_mdc(self, level: int):
+        """ Drive MDC, PHYs sample MDIO on rising edge. """
+        if level and not self.mdc:
+            sample = self.mdio
+            self.edges += 1
+            for phy in self.phys.values():
+                phy.rising(sample)
+        self.mdc = 1 if level else 0
+
+    def set_mdio(self, level: Optional[int]):
+        """ Drive MDIO from station (None releases it). """
+        self.sta = level
+
+    def gpio(self, line: str) -> 'SimGPIO':
+        """ CdevGPIO compatible pin on 'mdc' or 'mdio' wire. """
+        return SimGPIO(self, line)
+
+    def gpio_pair(self) -> 'SimGPIOPair':
+        """ CdevGPIOPair compatible MDC/MDIO pin pair. """
+        return SimGPIOPair(self)
+
+    def spi(self) -> 'SimSPI':
+        """ SPI compatible 3-wire bus (mode 0) on MDC/MDIO wires. """
+        return SimSPI(self)
+
+    def mpsse(self) -> 'SimMPSSE':
+        """ FTDI MPSSE engine with SK on MDC and DO/DI tied to MDIO. """
+        return SimMPSSE(self)
+
+
+class SimGPIO:
+    """ CdevGPIO compatible pin driving a simulated wire. """
+
+    def __init__(self, bus: MDIOSimBus, line: str, direction: str = "high"):
+        if line not in ('mdc', 'mdio'):
+            raise ValueError('Invalid line, can be: "mdc", "mdio".')
+        self._bus = bus
+        self._line = line
+        self._direction = "out"
+        self.direction = direction
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def read(self) -> bool:
+        """ Read wire level. """
+        return bool(self._bus.mdc if self._line == 'mdc' else self._bus.mdio)
+
+    def write(self, value: bool):
+        """ Drive wire level. """
+        if not isinstance(value, bool):
+            raise TypeError("Invalid value type, should be bool.")
+        if self._direction != "out":
+            raise ValueError("Invalid direction, pin is input.")
+        if self._line == 'mdc':
+            self._bus.set_mdc(int(value))
+        else:
+            self._bus.set_mdio(int(value))
+
+    def close(self):
+        """ Release pin. """
+
+    @property
+    def line(self) -> str:
+        """ Wire name. """
+        return self._line
+
+    @property
+    def direction(self) -> str:
+        """ Pin direction: "in" or "out" (set "high"/"low" to drive initial level). """
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction: str):
+        if direction not in ("in", "out", "high", "low"):
+            raise ValueError("Invalid direction, can be: \"in\", \"out\", \"high\", \"low\".")
+        if direction == "in" and self._line == 'mdio':
+            self._bus.set_mdio(None)
+        elif direction != "in":
+            level = {"high": 1, "low": 0}.get(direction, 0)
+            if self._line == 'mdc':
+                self._bus.set_mdc(level)
+            else:
+                self._bus.set_mdio(level)
+        self._direction = "in" if direction == "in" else "out"
+
+
+class SimGPIOPair:
+    """ CdevGPIOPair compatible MDC/MDIO pin pair driving simulated wires. """
+    CLK = 0x2
+    DATA = 0x1
+
+    def __init__(self, bus: MDIOSimBus):
+        self._bus = bus
+        self._state = SimGPIOPair.DATA
+        self._data_direction = "high"
+        bus.set_mdc(0)
+        bus.set_mdio(1)
+        self.writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.close()
+
+    def write(self, state: int):
+        """ Drive clock (bit 1) and data (bit 0) together. """
+        self.writes += 1
+        self._bus.set_mdio(state & SimGPIOPair.DATA)
+        self._bus.set_mdc(state & SimGPIOPair.CLK)
+        self._state = state
+
+    def write_clk(self, value: bool):
+        """ Drive clock only. """
+        self.writes += 1
+        self._bus.set_mdc(int(value))
+        self._state = (self._state & SimGPIOPair.DATA) | (SimGPIOPair.CLK if value else 0)
+
+    def read_data(self) -> bool:
+        """ Read data wire level. """
+        return bool(self._bus.mdio)
+
+    def close(self):
+        """ Release pins. """
+
+    @property
+    def devpath(self) -> str:
+        """ Simulated chip path. """
+        return 'sim'
+
+    @property
+    def fd(self) -> None:
+        """ No file descriptor. """
+        return None
+
+    @property
+    def state(self) -> int:
+        """ Last driven state. """
+        return self._state
+
+    @property
+    def data_direction(self) -> str:
+        """ Data pin direction: "in", "high" or "low". """
+        return self._data_direction
+
+    @data_direction.setter
+    def data_direction(self, direction: str):
+        if direction not in ("in", "high", "low"):
+            raise ValueError("Invalid direction, can be: \"in\", \"high\", \"low\".")
+        if direction == "in":
+            self._bus.set_mdio(None)
+        else:
+            level = int(direction == "high")
+            self._bus.set_mdio(level)
+            self._state = (self._state & SimGPIOPair.CLK) | level
+        self._data_direction = direction
+
+
+class SimSPI:
+    """ SPI compatible 3-wire bus (mode 0, MSB first): MOSI/MISO on MDIO, SCLK on MDC.
+        Transmit bits are driven by station, receive bits are released and sampled before each rising edge.
+    """
+
+    def __init__(self, bus: MDIOSimBus):
+        self._bus = bus
+        self.ioctls = 0
+        # Last SPIMessage transferred and its segments as (tx bytes or None, length)
+        self.message = None
+        self.segments: List[Tuple[Optional[bytes], int]] = []
+
+    def _shift(self, tx_data: Optional[ByteLike], nbytes: int) -> bytes:
+        rx = bytearray()
+        for i in range(nbytes):
+            rbyte = 0
+            for bit in range(7, -1, -1):
+                self._bus.set_mdio(None if tx_data is None else (tx_data[i] >> bit) & 1)
+                rbyte = (rbyte << 1) | self._bus.mdio
+                self._bus.set_mdc(1)
+                self._bus.set_mdc(0)
+            rx.append(rbyte)
+        # MOSI idles high
+        self._bus.set_mdio(1)
+        return bytes(rx)
+
+    def transfer(self, tx_data: Optional[ByteLike] = None, rx_data: Optional[ByteLike] = None,
+                 cs_change: bool = True) -> ByteLike:
+        """ Shift out tx_data (or release line) and return shifted in data. """
+        # pylint: disable=unused-argument
+        self.ioctls += 1
+        rx = self._shift(tx_data, len(tx_data) if tx_data else len(rx_data or []))
+        return rx if rx_data is not None else (tx_data or [0])
+
+    def transfer_message(self, message):
+        """ Perform transfers of a prepared SPIMessage (single ioctl). """
+        self.ioctls += 1
+        self.message = message
+        self.segments = []
+        for tx_offset, rx_offset, length in message.segments():
+            tx = None if tx_offset is None else bytes(message.tx[tx_offset:tx_offset + length])
+            self.segments.append((tx, length))
+            rx = self._shift(tx, length)
+            if rx_offset is not None:
+                message.rx[rx_offset:rx_offset + length] = rx
+
+    def close(self):
+        """ Close bus. """
+
+
+class SimMPSSE:
+    """ pyftdi Ftdi compatible MPSSE engine: ADBUS0 (SK) on MDC, ADBUS1 (DO) and ADBUS2 (DI) on MDIO.
+        Interprets commands used by FtdiMDIO: MSB first byte/bit writes on falling edge,
+        byte/bit reads on rising edge, SET_BITS_LOW and SEND_IMMEDIATE.
+    """
+
+    def __init__(self, bus: MDIOSimBus):
+        self._bus = bus
+        self._rx = bytearray()
+        self._dir = 0x03
+        self.writes = 0
+
+    def _clock(self, bit: Optional[int]) -> int:
+        if bit is not None and self._dir & 0x02:
+            self._bus.set_mdio(bit)
+        sample = self._bus.mdio
+        self._bus.set_mdc(1)
+        self._bus.set_mdc(0)
+        return sample
+
+    def write_data(self, data: ByteLike) -> int:
+        """ Execute MPSSE commands. """
+        self.writes += 1
+        data = bytes(data)
+        i = 0
+        while i < len(data):
+            opcode = data[i]
+            if opcode == 0x80:
+                value, self._dir = data[i + 1], data[i + 2]
+                self._bus.set_mdio((value >> 1) & 1 if self._dir & 0x02 else None)
+                self._bus.set_mdc(value & 1)
+                i += 3
+            elif opcode == 0x11:
+                count = (data[i + 1] | data[i + 2] << 8) + 1
+                for byte in data[i + 3:i + 3 + count]:
+                    for bit in range(7, -1, -1):
+                        self._clock((byte >> bit) & 1)
+                i += 3 + count
+            elif opcode == 0x13:
+                for bit in range(7, 6 - data[i + 1], -1):
+                    self._clock((data[i + 2] >> bit) & 1)
+                i += 3
+            elif opcode == 0x20:
+                for _ in range((data[i + 1] | data[i + 2] << 8) + 1):
+                    byte = 0
+                    for _ in range(8):
+                        byte = (byte << 1) | self._clock(None)
+                    self._rx.append(byte)
+                i += 3
+            elif opcode == 0x22:
+                byte = 0
+                for _ in range(data[i + 1] + 1):
+                    byte = (byte << 1) | self._clock(None)
+                self._rx.append(byte)
+                i += 2
+            elif opcode == 0x87:
+                i += 1
+            else:
+                raise ValueError(f'Unsupported MPSSE command 0x{opcode:02X}.')
+        return len(data)
+
+    def read_data_bytes(self, size: int, attempt: int = 1) -> bytes:
+        """ Read queued response bytes. """
+        # pylint: disable=unused-argument
+        rsp, self._rx = bytes(self._rx[:size]), self._rx[size:]
+        return rsp
+
+    def close(self):
+        """ Close device. """
@@ -0,0 +1,136 @@
+""" Poll MDIO registers in background and publish changes. """
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+from pyrpio.mdio import MDIOBase
+from pyrpio.mdio_cache import MDIOCache
+
+
+@dataclass
+class MDIOChange:
+    """ Register value change seen by MDIOWatcher. """
+    pad: int
+    dad: int
+    reg: int
+    old: int
+    new: int
+    timestamp: float
+
+
+class MDIOWatcher:
+    """ Background thread polling registers and publishing value changes.
+        Poll interval drops to fast_interval after a change, then backs off to interval while stable.
+        Registers of same (pad, dad) are read in one operation, consecutive CLAUSE45 registers
+        with post-read-increment, and a single watched CLAUSE45 register keeps its address frame elided.
+    """
+
+    def __init__(self, bus: MDIOBase, registers: List[Tuple[int, int, int]], interval: float = 1.0,
+                 fast_interval: float = 0.05, backoff: float = 2.0,
+                 callback: Optional[Callable[[MDIOChange], None]] = None,
+                 queue: Optional[asyncio.Queue] = None, loop: Optional[asyncio.AbstractEventLoop] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        """
+        Args:
+            bus (MDIOBase): Open bus. Do not use it from other threads while watcher runs.
+            registers (List[Tuple[int, int, int]]): (pad, dad, reg) to watch, dad of MDIOCache.C22 for CLAUSE22
+            interval (float, optional): Poll interval while stable in seconds. Defaults to 1.0.
+            fast_interval (float, optional): Poll interval after a change in seconds. Defaults to 0.05.
+            backoff (float, optional): Interval growth factor per stable poll. Defaults to 2.0.
+            callback (Callable, optional): Called with MDIOChange from watcher thread.
+            queue (asyncio.Queue, optional): Queue receiving MDIOChange on loop.
+            loop (asyncio.AbstractEventLoop, optional): Loop owning queue. Defaults to running loop.
+            on_error (Callable, optional): Called with bus exceptions. Defaults to stopping watcher.
+        """
+        if fast_interval <= 0 or interval < fast_interval:
+            raise ValueError('Intervals must satisfy 0 < fast_interval <= interval.')
+        if backoff <= 1:
+            raise ValueError('Backoff must be greater than 1.')
+        self.bus = bus
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.backoff = backoff
+        self.callback = callback
+        self.queue = queue
+        self.on_error = on_error
+        if queue is not None and loop is None:
+            loop = asyncio.get_running_loop()
+        self._loop = loop
+        self._groups: Dict[Tuple[int, int], List[int]] = {}
+        for pad, dad, reg in registers:
+            regs = self._groups.setdefault((pad, dad), [])
+            if reg not in regs:
+                regs.append(reg)
+        for regs in self._groups.values():
+            regs.sort()
+        self.values: Dict[Tuple[int, int, int], int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, t, value, traceback):
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """ Watcher thread is running. """
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """ Read baseline values and start watcher thread. """
+        if self.running:
+            return
+        self.poll()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='mdio-watcher', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """ Stop watcher thread. """
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def poll(self) -> List[MDIOChange]:
+        """ Read watched registers once and publish changes.
+            Returns:
+                List[MDIOChange]: Changes since previous poll
+        """
+        changes: List[MDIOChange] = []
+        for (pad, dad), regs in self._groups.items():
+            if dad == MDIOCache.C22:
+                vals = self.bus.read_c22_registers(pad, regs)
+            else:
+                vals = self.bus.read_c45_registers(pad, dad, regs)
+            now = time.monotonic()
+            for reg, val in zip(regs, vals):
+                old = self.values.get((pad, dad, reg))
+                self.values[(pad, dad, reg)] = val
+                if old is not None and old != val:
+                    changes.append(MDIOChange(pad, dad, reg, old, val, now))
+        for change in changes:
+            self._publish(change)
+        return changes
+
+    def _publish(self, change: MDIOChange):
+        if self.callback is not None:
+            self.callback(change)
+        if self.queue is not None:
+            self._loop.call_soon_threadsafe(self.queue.put_nowait, change)
+
+    def _run(self):
+        delay = self.interval
+        while not self._stop.wait(delay):
+            try:
+                changed = bool(self.poll())
+            except Exception as e:
+                if self.on_error is None:
+                    raise
+                self.on_error(e)
+                changed = False
+            delay = self.fast_interval if changed else min(delay * self.backoff, self.interval)
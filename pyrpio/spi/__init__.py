@@ -1,5 +1,5 @@
 """ I2C Interface """
 from .types import SPIError, SPIBase, ByteLike
-from .spi import SPI
+from .spi import SPI, SPIMessage
 
-__all__ = ['SPIError', 'SPIBase', 'SPI', 'ByteLike']
+__all__ = ['SPIError', 'SPIBase', 'SPI', 'SPIMessage', 'ByteLike']
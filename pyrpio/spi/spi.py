@@ -3,7 +3,8 @@ Adapted from python-periphery (https://github.com/vsergeev/python-periphery/blob
 Modified to support 3-wire mode (MOSI & MISO tied)
 '''
 import os
-from typing import Optional
+import struct
+from typing import List, Optional, Tuple
 import fcntl
 import array
 import ctypes
@@ -26,6 +27,10 @@ class _CSpiIocTransfer(ctypes.Structure):
     ]
 
 
+# SPI_IOC_MESSAGE(N) with the size field (bits 16-29) left to fill in
+_SPI_IOC_MESSAGE_0 = 0x40006b00
+
+
 class SPI(SPIBase):
     ''' SPI class interface. '''
     SPI_3WIRE = 0x10
@@ -40,6 +45,8 @@ class SPI(SPIBase):
     _SPI_IOC_WR_BITS_PER_WORD = 0x40016b03
     _SPI_IOC_RD_BITS_PER_WORD = 0x80016b03
     _SPI_IOC_MESSAGE_1 = 0x40206b00
+    # SPI_IOC_MESSAGE(N) size field is 14 bits
+    MAX_SEGMENTS = 0x3FFF // ctypes.sizeof(_CSpiIocTransfer)
 
     def __init__(self, devpath, mode, max_speed, bit_order="msb", bits_per_word=8, extra_flags=0):
         """Instantiate a SPI object and open the spidev device at the specified
@@ -197,6 +204,25 @@ class SPI(SPIBase):
             return rx_buf.tolist()
         return tx_data or [0]
 
+    def transfer_message(self, message: 'SPIMessage'):
+        """Perform transfers of a prepared message in a single SPI_IOC_MESSAGE(N) ioctl.
+        Received bytes are written into message.rx in place.
+        Args:
+            message (SPIMessage): prepared message
+
+        Raises:
+            SPIError: if an I/O or OS error occurs.
+
+        """
+        if self._fd is None:
+            raise SPIError('SPI bus is not open')
+        if not message.count:
+            return
+        try:
+            fcntl.ioctl(self._fd, message.request, message.xfers)
+        except (OSError, IOError) as e:
+            raise SPIError(e.errno, "SPI transfer: " + e.strerror) from e
+
     def close(self):
         """Close the spidev SPI device.
 
@@ -442,3 +468,80 @@ class SPI(SPIBase):
     def __str__(self):
         return "SPI (device={:s}, fd={:d}, mode={:d}, max_speed={:d}, bit_order={:s}, bits_per_word={:d}, extra_flags=0x{:02x})" \
             .format(self.devpath, self.fd, self.mode, self.max_speed, self.bit_order, self.bits_per_word, self.extra_flags)
+
+
+class SPIMessage:
+    """ Reusable SPI_IOC_MESSAGE(N) over preallocated tx/rx buffers.
+        Segments reference byte ranges of tx (transmit) or rx (receive) by offset and are packed
+        into a preallocated spi_ioc_transfer table, so messages can be rebuilt and sent repeatedly
+        without allocating buffers or ctypes structures. Consecutive transmit ranges merge into one segment.
+    """
+    # struct spi_ioc_transfer
+    _XFER = struct.Struct('=QQIIHBBBBH')
+    _LEN = struct.Struct('=I')
+    _LEN_OFFSET = 16
+
+    def __init__(self, size: int = 4096, max_segments: Optional[int] = None):
+        """
+        Args:
+            size (int, optional): tx/rx buffer size in bytes. Defaults to 4096.
+            max_segments (int, optional): Transfer table size. Defaults to SPI.MAX_SEGMENTS.
+        """
+        self.max_segments: int = min(max_segments or SPI.MAX_SEGMENTS, SPI.MAX_SEGMENTS)
+        self.tx = bytearray(size)
+        self.rx = bytearray(size)
+        self.xfers = bytearray(SPIMessage._XFER.size * self.max_segments)
+        # Exporting buffers pins them (bytearray can no longer be resized)
+        self._tx_ref = ctypes.c_char.from_buffer(self.tx)
+        self._rx_ref = ctypes.c_char.from_buffer(self.rx)
+        self._tx_addr = ctypes.addressof(self._tx_ref)
+        self._rx_addr = ctypes.addressof(self._rx_ref)
+        self.count = 0
+        self._tx_end = -1
+
+    def __len__(self):
+        return len(self.tx)
+
+    @property
+    def request(self) -> int:
+        """ SPI_IOC_MESSAGE(count) ioctl request. """
+        return _SPI_IOC_MESSAGE_0 | ((SPIMessage._XFER.size * self.count) << 16)
+
+    def clear(self):
+        """ Remove all segments (buffers keep their content). """
+        self.count = 0
+        self._tx_end = -1
+
+    def transmit(self, offset: int, length: int):
+        """ Append segment shifting out tx[offset:offset + length]. """
+        self._check(offset, length)
+        if offset == self._tx_end:
+            pos = SPIMessage._XFER.size * (self.count - 1) + SPIMessage._LEN_OFFSET
+            SPIMessage._LEN.pack_into(self.xfers, pos, SPIMessage._LEN.unpack_from(self.xfers, pos)[0] + length)
+        else:
+            self._append(self._tx_addr + offset, 0, length)
+        self._tx_end = offset + length
+
+    def receive(self, offset: int, length: int):
+        """ Append segment shifting in rx[offset:offset + length] (line released). """
+        self._check(offset, length)
+        self._append(0, self._rx_addr + offset, length)
+        self._tx_end = -1
+
+    def _check(self, offset: int, length: int):
+        if length <= 0 or offset < 0 or offset + length > len(self.tx):
+            raise ValueError("Segment must be within message buffer.")
+
+    def _append(self, tx_addr: int, rx_addr: int, length: int):
+        if self.count >= self.max_segments:
+            raise ValueError(f"Too many segments, must be at most {self.max_segments}.")
+        SPIMessage._XFER.pack_into(self.xfers, SPIMessage._XFER.size * self.count, tx_addr, rx_addr, length, 0, 0, 0, 0, 0, 0, 0)
+        self.count += 1
+
+    def segments(self) -> List[Tuple[Optional[int], Optional[int], int]]:
+        """ (tx_offset, rx_offset, length) per segment, offset None if unused. """
+        out: List[Tuple[Optional[int], Optional[int], int]] = []
+        for i in range(self.count):
+            tx_addr, rx_addr, length = SPIMessage._XFER.unpack_from(self.xfers, SPIMessage._XFER.size * i)[:3]
+            out.append((tx_addr - self._tx_addr if tx_addr else None, rx_addr - self._rx_addr if rx_addr else None, length))
+        return out
@@ -36,6 +36,18 @@ class SPIBase(ABC):
         """
         raise NotImplementedError()
 
+    def transfer_message(self, message) -> None:
+        """Perform transfers of a prepared SPIMessage as one message.
+        Received bytes are written into message.rx.
+        Args:
+            message (SPIMessage): prepared message
+
+        Raises:
+            SPIError: if an I/O or OS error occurs.
+
+        """
+        raise NotImplementedError()
+
     def close(self):
         """Close interface
         """
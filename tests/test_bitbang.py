@@ -0,0 +1,14 @@
+from pyrpio.bitbang import bit_states, byte_states, samples_to_int
+
+
+class TestBitBang:
+    def test_bit_states(self):
+        assert byte_states()[0xA5] == (1, 3, 0, 2, 1, 3, 0, 2, 0, 2, 1, 3, 0, 2, 1, 3)
+        assert bit_states(0b101, 3) == [1, 3, 0, 2, 1, 3]
+        assert bit_states(0x2BEEF, 18) == bit_states(0x2, 2) + list(byte_states()[0xBE] + byte_states()[0xEF])
+        assert bit_states(0x1, 1, clk=0x4, data=0x8) == [0x8, 0xC]
+
+    def test_samples_to_int(self):
+        assert samples_to_int(bytearray([1, 0, 1, 1])) == 0xB
+        assert samples_to_int([True] * 16) == 0xFFFF
+        assert samples_to_int(b'') == 0
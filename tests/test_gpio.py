@@ -0,0 +1,400 @@
+import errno
+import fcntl
+import os
+import struct
+import pytest
+from pyrpio.gpio import CdevGPIO, CdevGPIOPair, GPIOBank, GPIOError, GPIOPoller
+
+# Request codes from <linux/gpio.h>
+GPIO_GET_LINEHANDLE_IOCTL = 0xc16cb403
+GPIO_GET_LINEEVENT_IOCTL = 0xc030b404
+GPIOHANDLE_GET_LINE_VALUES_IOCTL = 0xc040b408
+GPIOHANDLE_SET_LINE_VALUES_IOCTL = 0xc040b409
+GPIOHANDLE_SET_CONFIG_IOCTL = 0xc054b40a
+GPIO_V2_GET_LINE_IOCTL = 0xc250b407
+GPIO_V2_LINE_GET_VALUES_IOCTL = 0xc010b40e
+GPIO_V2_LINE_SET_CONFIG_IOCTL = 0xc110b40d
+GPIO_V2_LINE_SET_VALUES_IOCTL = 0xc010b40f
+GPIO_V2_LINE_ATTR_ID_FLAGS = 1
+GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES = 2
+GPIOHANDLE_REQUEST_INPUT = 0x1
+GPIOHANDLE_REQUEST_OUTPUT = 0x2
+GPIOHANDLE_REQUEST_BIAS_PULL_UP = 0x20
+GPIO_V2_LINE_FLAG_INPUT = 0x4
+GPIO_V2_LINE_FLAG_OUTPUT = 0x8
+GPIO_V2_LINE_FLAG_BIAS_PULL_UP = 0x100
+
+# struct gpio_v2_line_event: timestamp_ns, id, offset, seqno, line_seqno, padding[6]
+V2_EVENT = struct.Struct('=QIIII24x')
+# struct gpioevent_data: timestamp, id
+V1_EVENT = struct.Struct('=QI4x')
+
+
+class FakeChip:
+    """ GPIO chip ioctls over a plain file. Line requests get the read end of a pipe as fd,
+        so tests can feed edge event records through the write end.
+        Line requests are logged as copies in `requests`, line config changes
+        as (line fd, config copy) in `configs`.
+    """
+
+    def __init__(self, path, v2=True, set_config=True):
+        self.path = path
+        self.v2 = v2
+        self.set_config = set_config
+        # Error of v2 line requests without v2 uAPI
+        self.v2_errno = errno.ENOTTY
+        # Line values, bit i for i-th requested line
+        self.state = 0
+        self.writers = []
+        self.requests = []
+        self.configs = []
+
+    def _line_fd(self):
+        rfd, wfd = os.pipe()
+        self.writers.append(wfd)
+        return rfd
+
+    def _set_outputs(self, config):
+        for attr in config.attrs[:config.num_attrs]:
+            if attr.attr.id == GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES:
+                self.state = (self.state & ~attr.mask) | (attr.attr.values & attr.mask)
+
+    def ioctl(self, fd, request, arg, mutate=True):
+        if request == GPIO_V2_GET_LINE_IOCTL:
+            if not self.v2:
+                raise OSError(self.v2_errno, os.strerror(self.v2_errno))
+            self.requests.append(type(arg).from_buffer_copy(arg))
+            self.state = 0
+            self._set_outputs(arg.config)
+            arg.fd = self._line_fd()
+        elif request == GPIO_V2_LINE_SET_CONFIG_IOCTL and self.set_config:
+            self.configs.append((fd, type(arg).from_buffer_copy(arg)))
+            self._set_outputs(arg)
+        elif request == GPIOHANDLE_SET_CONFIG_IOCTL and self.set_config:
+            self.configs.append((fd, type(arg).from_buffer_copy(arg)))
+            if arg.flags & GPIOHANDLE_REQUEST_OUTPUT:
+                self.state = sum(arg.default_values[i] << i for i in range(64))
+        elif request == GPIO_GET_LINEHANDLE_IOCTL:
+            self.requests.append(type(arg).from_buffer_copy(arg))
+            self.state = sum(arg.default_values[i] << i for i in range(arg.lines))
+            arg.fd = self._line_fd()
+        elif request == GPIO_GET_LINEEVENT_IOCTL:
+            arg.fd = self._line_fd()
+        elif request == GPIO_V2_LINE_GET_VALUES_IOCTL:
+            arg.bits = self.state & arg.mask
+        elif request == GPIO_V2_LINE_SET_VALUES_IOCTL:
+            self.state = (self.state & ~arg.mask) | (arg.bits & arg.mask)
+        elif request == GPIOHANDLE_GET_LINE_VALUES_IOCTL:
+            for i in range(64):
+                arg.values[i] = (self.state >> i) & 1
+        elif request == GPIOHANDLE_SET_LINE_VALUES_IOCTL:
+            self.state = sum(arg.values[i] << i for i in range(64))
+        else:
+            raise OSError(errno.ENOTTY, os.strerror(errno.ENOTTY))
+        return 0
+
+    def close(self):
+        for wfd in self.writers:
+            os.close(wfd)
+
+
+def make_chip(tmp_path, monkeypatch, v2, set_config=True):
+    path = tmp_path / 'gpiochip0'
+    path.touch()
+    fake = FakeChip(str(path), v2=v2, set_config=set_config)
+    monkeypatch.setattr(fcntl, 'ioctl', fake.ioctl)
+    return fake
+
+
+@pytest.fixture(params=[True, False], ids=['v2', 'v1'])
+def chip(request, tmp_path, monkeypatch):
+    fake = make_chip(tmp_path, monkeypatch, request.param)
+    yield fake
+    fake.close()
+
+
+@pytest.fixture
+def chip_v2(tmp_path, monkeypatch):
+    fake = make_chip(tmp_path, monkeypatch, True)
+    yield fake
+    fake.close()
+
+
+class TestGPIOBank:
+    def test_masks(self, chip):
+        with GPIOBank(chip.path, [5, 3, 9, 0], "low") as bank:
+            assert bank.uapi == ("v2" if chip.v2 else "v1")
+            bank.write_mask(0b0101, 0b1111)
+            assert chip.state == 0b0101
+            # Unmasked lines keep their value
+            bank.write_mask(0b0110, 0b0010)
+            assert chip.state == 0b0011
+            # Bits beyond last line are ignored
+            bank.write_mask(0xFF8, 0xFF8)
+            assert chip.state == 0b1011
+            assert bank.read_mask() == 0b1011
+            chip.state = 0b0100
+            assert bank.read_mask() == 0b0100
+
+    def test_uapi(self, chip):
+        chip.v2_errno = errno.EINVAL
+        with GPIOBank(chip.path, [1, 2], "low", uapi="AUTO") as bank:
+            assert bank.uapi == ("v2" if chip.v2 else "v1")
+        with GPIOBank(chip.path, [1, 2], "low", uapi="V1") as bank:
+            assert bank.uapi == "v1"
+
+    def test_64_lines(self, chip):
+        with GPIOBank(chip.path, list(range(64)), "high") as bank:
+            assert chip.state == bank.read_mask() == (1 << 64) - 1
+            bank.write_mask(1 << 63 | 1, 0)
+            assert chip.state == bank.read_mask() == (1 << 64) - 1 - (1 << 63 | 1)
+
+    def test_input(self, chip):
+        with GPIOBank(chip.path, [1, 2], "in") as bank:
+            chip.state = 0b10
+            assert bank.read_mask() == 0b10
+            with pytest.raises(IOError):
+                bank.write_mask(0b11, 0b11)
+
+    def test_direction(self, chip):
+        output, input_ = (GPIO_V2_LINE_FLAG_OUTPUT, GPIO_V2_LINE_FLAG_INPUT) if chip.v2 else \
+            (GPIOHANDLE_REQUEST_OUTPUT, GPIOHANDLE_REQUEST_INPUT)
+        with GPIOBank(chip.path, [1, 2, 3], "in") as bank:
+            fd = bank.fd
+            bank.direction = "high"
+            assert chip.state == 0b111 and bank.direction == "out"
+            bank.direction = "in"
+            bank.direction = "out"
+            assert bank.fd == fd and chip.state == 0b111
+        # Reconfigured in place on the same line fd
+        assert [(cfd, config.flags) for cfd, config in chip.configs] == [(fd, output), (fd, input_), (fd, output)]
+
+
+class TestCdevGPIO:
+    def test_uapi(self, chip):
+        with CdevGPIO(chip.path, 4, "in", edge="both") as gpio:
+            assert gpio.uapi == ("v2" if chip.v2 else "v1")
+        if not chip.v2:
+            with pytest.raises(GPIOError):
+                CdevGPIO(chip.path, 4, "in", debounce_us=100)
+        with CdevGPIO(chip.path, 4, "in", uapi="V1") as gpio:
+            assert gpio.uapi == "v1"
+
+    def test_uapi_einval(self, tmp_path, monkeypatch):
+        chip = make_chip(tmp_path, monkeypatch, False)
+        chip.v2_errno = errno.EINVAL
+        with CdevGPIO(chip.path, 4, "in", uapi="Auto") as gpio:
+            assert gpio.uapi == "v1"
+        # Rejected v2-only option is reported, not masked by v1 fallback
+        with pytest.raises(GPIOError) as exc_info:
+            CdevGPIO(chip.path, 4, "in", edge="both", debounce_us=100)
+        assert exc_info.value.errno == errno.EINVAL
+        chip.close()
+
+    def test_reconfigure(self, chip):
+        output, input_ = (GPIO_V2_LINE_FLAG_OUTPUT, GPIO_V2_LINE_FLAG_INPUT) if chip.v2 else \
+            (GPIOHANDLE_REQUEST_OUTPUT, GPIOHANDLE_REQUEST_INPUT)
+        with CdevGPIO(chip.path, 4, "in") as gpio:
+            fd = gpio.fd
+            gpio.direction = "high"
+            assert gpio.direction == "out" and chip.state == 1
+            gpio.direction = "in"
+            assert gpio.fd == fd
+        # Line stays requested, reconfigured in place
+        assert [(cfd, config.flags) for cfd, config in chip.configs] == [(fd, output), (fd, input_)]
+
+    def test_reconfigure_fallback(self, tmp_path, monkeypatch):
+        # Kernels before 5.5 lack GPIOHANDLE_SET_CONFIG_IOCTL, line is requested again
+        chip = make_chip(tmp_path, monkeypatch, False, set_config=False)
+        with CdevGPIO(chip.path, 4, "in") as gpio:
+            gpio.direction = "high"
+            assert gpio.direction == "out" and chip.state == 1
+        assert len(chip.writers) == 2 and chip.configs == []
+        chip.close()
+
+    def test_dropped_events(self, chip_v2):
+        with CdevGPIO(chip_v2.path, 4, "in", edge="both") as gpio:
+            wfd = chip_v2.writers[-1]
+            for ts, edge, seqno in ((100, 1, 1), (200, 2, 2), (500, 1, 5)):
+                os.write(wfd, V2_EVENT.pack(ts, edge, 4, seqno, seqno))
+            assert gpio.read_event() == ("rising", 100)
+            assert gpio.read_event() == ("falling", 200)
+            assert gpio.dropped_events == 0 and gpio.line_seqno == 2
+            # Line seqno 3 and 4 were lost in kernel FIFO
+            assert gpio.read_event() == ("rising", 500)
+            assert gpio.dropped_events == 2 and gpio.line_seqno == 5
+
+    def test_fast_path(self, chip):
+        with CdevGPIO(chip.path, 4, "low") as gpio:
+            assert chip.state == 0 and gpio.fast_read() is False
+            gpio.fast_write(1)
+            assert chip.state == 1 and gpio.fast_read() is True and gpio.read() is True
+            gpio.fast_write(0)
+            assert chip.state == 0 and gpio.fast_read() is False
+            gpio.write(True)
+            assert chip.state == 1
+
+    def test_read_events(self, chip):
+        with CdevGPIO(chip.path, 4, "in", edge="both") as gpio:
+            wfd = chip.writers[-1]
+            events = [(1000 + i, 1 + i % 2) for i in range(5)]
+            for seqno, (ts, edge) in enumerate(events, 1):
+                os.write(wfd, V2_EVENT.pack(ts, edge, 4, seqno, seqno) if chip.v2 else V1_EVENT.pack(ts, edge))
+            timestamps, edges = gpio.read_events(max_events=3)
+            assert timestamps.typecode == 'Q' and edges.typecode == 'B'
+            assert list(zip(timestamps, edges)) == events[:3]
+            timestamps, edges = gpio.read_events()
+            assert list(zip(timestamps, edges)) == events[3:]
+            assert list(edges) == [CdevGPIO.EDGE_FALLING, CdevGPIO.EDGE_RISING]
+            with pytest.raises(ValueError):
+                gpio.read_events(max_events=0)
+            with pytest.raises(TypeError):
+                gpio.read_events(max_events=2.0)
+
+    def test_read_events_dropped(self, chip_v2):
+        with CdevGPIO(chip_v2.path, 4, "in", edge="rising") as gpio:
+            wfd = chip_v2.writers[-1]
+            for seqno in (1, 2, 4, 5, 8):
+                os.write(wfd, V2_EVENT.pack(seqno * 10, 1, 4, seqno, seqno))
+            gpio.read_events(max_events=2)
+            assert gpio.dropped_events == 0 and gpio.line_seqno == 2
+            # Gap before batch and within batch
+            gpio.read_events()
+            assert gpio.dropped_events == 3 and gpio.line_seqno == 8
+
+    def test_read_events_numpy(self, chip_v2):
+        numpy = pytest.importorskip('numpy')
+        with CdevGPIO(chip_v2.path, 4, "in", edge="both") as gpio:
+            for seqno in (1, 2):
+                os.write(chip_v2.writers[-1], V2_EVENT.pack(seqno << 40, seqno, 4, seqno, seqno))
+            timestamps, edges = gpio.read_events(as_numpy=True)
+            assert timestamps.dtype == numpy.uint64 and timestamps.tolist() == [1 << 40, 2 << 40]
+            assert edges.tolist() == [1, 2]
+
+
+def v2_attrs(config):
+    return {attr.attr.id: attr for attr in config.attrs[:config.num_attrs]}
+
+
+class TestCdevGPIOPair:
+    def test_request(self, chip_v2):
+        with CdevGPIOPair(chip_v2.path, 7, 8) as pair:
+            # Data (bit 0) and clock (bit 1) in one v2 request
+            request, = chip_v2.requests
+            assert list(request.offsets[:request.num_lines]) == [8, 7]
+            assert request.config.flags == GPIO_V2_LINE_FLAG_OUTPUT
+            attrs = v2_attrs(request.config)
+            assert attrs[GPIO_V2_LINE_ATTR_ID_FLAGS].mask == CdevGPIOPair.DATA
+            assert attrs[GPIO_V2_LINE_ATTR_ID_FLAGS].attr.flags == GPIO_V2_LINE_FLAG_OUTPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+            assert attrs[GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES].mask == CdevGPIOPair.CLK | CdevGPIOPair.DATA
+            assert chip_v2.state == pair.state == CdevGPIOPair.DATA
+            pair.write(CdevGPIOPair.CLK)
+            assert chip_v2.state == CdevGPIOPair.CLK
+            pair.write_clk(False)
+            assert chip_v2.state == pair.state == 0
+            chip_v2.state = CdevGPIOPair.DATA
+            assert pair.read_data() is True
+            assert "type=cdev-v2" in str(pair)
+
+    def test_data_direction(self, chip_v2):
+        with CdevGPIOPair(chip_v2.path, 7, 8) as pair:
+            pair.write(CdevGPIOPair.CLK | CdevGPIOPair.DATA)
+            pair.data_direction = "in"
+            pair.data_direction = "in"
+            pair.data_direction = "low"
+            assert chip_v2.state == pair.state == CdevGPIOPair.CLK
+            fd = pair.fd
+        # Reconfigured in place on the same line fd, clock kept high
+        (in_fd, config_in), (low_fd, config_low) = chip_v2.configs
+        assert in_fd == low_fd == fd
+        attrs = v2_attrs(config_in)
+        assert attrs[GPIO_V2_LINE_ATTR_ID_FLAGS].mask == CdevGPIOPair.DATA
+        assert attrs[GPIO_V2_LINE_ATTR_ID_FLAGS].attr.flags == GPIO_V2_LINE_FLAG_INPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+        assert attrs[GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES].mask == CdevGPIOPair.CLK
+        assert attrs[GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES].attr.values == CdevGPIOPair.CLK
+        attrs = v2_attrs(config_low)
+        assert attrs[GPIO_V2_LINE_ATTR_ID_FLAGS].attr.flags == GPIO_V2_LINE_FLAG_OUTPUT | GPIO_V2_LINE_FLAG_BIAS_PULL_UP
+        assert attrs[GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES].mask == CdevGPIOPair.CLK | CdevGPIOPair.DATA
+        assert attrs[GPIO_V2_LINE_ATTR_ID_OUTPUT_VALUES].attr.values == CdevGPIOPair.CLK
+
+    @pytest.mark.parametrize('err', [errno.ENOTTY, errno.EINVAL], ids=['ENOTTY', 'EINVAL'])
+    def test_v1_fallback(self, tmp_path, monkeypatch, err):
+        chip = make_chip(tmp_path, monkeypatch, False)
+        chip.v2_errno = err
+        with CdevGPIOPair(chip.path, 7, 8) as pair:
+            assert pair.fd is None and "type=cdev)" in str(pair)
+            # Separate v1 handles, clock low and data high
+            clk, data = chip.requests
+            assert (clk.lineoffsets[0], clk.flags, clk.default_values[0]) == (7, GPIOHANDLE_REQUEST_OUTPUT, 0)
+            assert (data.lineoffsets[0], data.default_values[0]) == (8, 1)
+            assert data.flags == GPIOHANDLE_REQUEST_OUTPUT | GPIOHANDLE_REQUEST_BIAS_PULL_UP
+            pair.data_direction = "in"
+            assert chip.configs[-1][1].flags == GPIOHANDLE_REQUEST_INPUT | GPIOHANDLE_REQUEST_BIAS_PULL_UP
+        chip.close()
+
+    def test_open_error(self, tmp_path, monkeypatch):
+        chip = make_chip(tmp_path, monkeypatch, False)
+        chip.v2_errno = errno.EBUSY
+        with pytest.raises(GPIOError):
+            CdevGPIOPair(chip.path, 7, 8)
+        assert chip.requests == []
+        chip.close()
+
+
+class PipeLine:
+    """ Stand-in GPIO whose fd is the read end of a pipe. """
+
+    def __init__(self):
+        self.fd, self.wfd = os.pipe()
+
+    def close(self):
+        os.close(self.fd)
+        os.close(self.wfd)
+
+
+@pytest.fixture
+def lines():
+    pipes = [PipeLine() for _ in range(3)]
+    yield pipes
+    for line in pipes:
+        line.close()
+
+
+class TestGPIOPoller:
+    def test_events(self, lines):
+        with GPIOPoller(lines[:2]) as poller:
+            poller.add(lines[2])
+            assert len(poller) == 3 and lines[0] in poller and poller.gpios == lines
+            assert poller.events(timeout=0) == []
+            os.write(lines[1].wfd, b'x')
+            os.write(lines[2].wfd, b'x')
+            assert sorted(poller.events(timeout=0), key=lines.index) == lines[1:]
+            assert len(poller.events(timeout=0, max_events=1)) == 1
+            # Level-triggered: reported until drained
+            os.read(lines[1].fd, 1)
+            assert poller.events(timeout=0) == [lines[2]]
+            poller.remove(lines[2])
+            assert poller.events(timeout=0) == [] and lines[2] not in poller
+            with pytest.raises(KeyError):
+                poller.remove(lines[2])
+            with pytest.raises(GPIOError):
+                poller.add(lines[0])
+
+    def test_edge_triggered(self, lines):
+        with GPIOPoller(edge_triggered=True) as poller:
+            poller.add(lines[0])
+            poller.add(lines[1], edge_triggered=False)
+            os.write(lines[0].wfd, b'x')
+            os.write(lines[1].wfd, b'x')
+            assert len(poller.events(timeout=0)) == 2
+            # Edge-triggered line is reported again only after new data
+            assert poller.events(timeout=0) == [lines[1]]
+            os.write(lines[0].wfd, b'x')
+            assert len(poller.events(timeout=0)) == 2
+
+    def test_str_after_close(self, lines):
+        poller = GPIOPoller(lines)
+        assert "gpios=3" in str(poller) and "epoll_fd={:d}".format(poller.fileno()) in str(poller)
+        poller.close()
+        assert len(poller) == 0
+        assert str(poller) == "GPIO poller (closed, edge_triggered=False)"
@@ -1,9 +1,309 @@
+import io
+import types
+from array import array
 import pytest
-from pyrpio.mdio import MDIO
+from pyrpio import mdio
+from pyrpio.mdio import MDIO, MDIOSPI, MDIOCache
+from pyrpio.mdio_ftdi import FtdiMDIO
+from pyrpio.mdio_sim import MDIOSimBus, MDIOSimPHY
+
+PAD = 0x03
+
+
+def make_mdio(phy, **kwargs):
+    sim = MDIOSimBus([phy])
+    bus = MDIO(clk_pin=0, data_pin=1, path='sim', gpio=sim.gpio_pair(),
+               clock_delay=0, setup_delay=0, read_delay=0, **kwargs)
+    bus.open()
+    return bus
+
+
+def make_mdiospi(phy, **kwargs):
+    sim = MDIOSimBus([phy])
+    bus = MDIOSPI(spi=sim.spi(), **kwargs)
+    bus.open()
+    return bus
+
+
+def make_ftdimdio(phy, **kwargs):
+    sim = MDIOSimBus([phy])
+    bus = FtdiMDIO(ftdi=sim.mpsse(), **kwargs)
+    bus.open()
+    return bus
+
+
+@pytest.fixture(params=[make_mdio, make_mdiospi, make_ftdimdio], ids=['gpio', 'spi', 'ftdi'])
+def make_bus(request):
+    return request.param
+
 
 class TestMDIO:
-    def test_open(self):
-        assert True
+    def test_open(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141, 3: 0x0DD1})
+        bus = make_bus(phy)
+        assert bus.read_c22_registers(PAD, [2, 3]) == [0x0141, 0x0DD1]
+        bus.close()
+
+    def test_transfer(self, make_bus):
+        phy = MDIOSimPHY(PAD)
+        bus = make_bus(phy)
+        bus.write_c22_register(PAD, 4, 0x01E1)
+        bus.write_c45_register(PAD, 1, 0x8000, 0xBEEF)
+        assert phy.c22[4] == 0x01E1
+        assert phy.c45[(1, 0x8000)] == 0xBEEF
+        assert bus.read_c22_register(PAD, 4) == 0x01E1
+        assert bus.read_c45_register(PAD, 1, 0x8000) == 0xBEEF
+
+    def test_absent_phy(self, make_bus):
+        bus = make_bus(MDIOSimPHY(PAD))
+        assert bus.read_c22_register(PAD + 1, 2) == 0xFFFF
+
+    def test_c45_address_elision(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(1, 7): 0x1234})
+        bus = make_bus(phy)
+        for _ in range(3):
+            assert bus.read_c45_register(PAD, 1, 7) == 0x1234
+        assert [frame[1] for frame in phy.frames] == [MDIO.OP_C45_AD] + [MDIO.OP_C45_RD] * 3
+        bus.invalidate_address()
+        bus.read_c45_register(PAD, 1, 7)
+        assert phy.frames[-2][1] == MDIO.OP_C45_AD
+
+    def test_reset_invalidates_address(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(1, 7): 0x1234, (3, 0): 0x2040})
+        bus = make_bus(phy)
+
+        def address_frames(write):
+            bus.read_c45_register(PAD, 1, 7)
+            bus.read_c45_register(PAD, 3, 0)
+            del phy.frames[:]
+            write()
+            bus.read_c45_register(PAD, 1, 7)
+            bus.read_c45_register(PAD, 3, 0)
+            return sum(1 for frame in phy.frames if frame[1] == MDIO.OP_C45_AD)
+
+        # Unrelated writes keep tracked addresses
+        assert address_frames(lambda: bus.write_c22_register(PAD, 0, 0x1140)) == 0
+        assert address_frames(lambda: bus.write_c45_register(PAD, 3, 0, 0x2040)) == 0
+        # PHY reset and MMD reset (incl. via read-modify-write) forget all addresses of pad
+        assert address_frames(lambda: bus.write_c22_register(PAD, 0, 0x9140)) == 2
+        assert address_frames(lambda: bus.modify_c45_register(PAD, 3, 0, 0x8000, 0x8000)) == 2
+        assert address_frames(lambda: bus.write_c45_register(PAD, 3, 0, 0xA040)) == 2
+
+    def test_c45_dword(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45_dword={(1, 0x00012345): 0xDEADBEEF})
+        bus = make_bus(phy)
+        assert bus.read_c45_dword_register(PAD, 1, 0x00012345) == 0xDEADBEEF
+        bus.write_c45_dword_register(PAD, 1, 0x00050006, 0x12345678)
+        assert phy.c45_dword[(1, 0x00050006)] == 0x12345678
+        assert bus.read_c45_dword_registers(PAD, 1, [0x00050006, 0x00012345]) == [0x12345678, 0xDEADBEEF]
+
+    def test_c45_range(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg * 3 for reg in range(0x10, 0x20)})
+        bus = make_bus(phy)
+        assert bus.read_c45_range(PAD, 1, 0x10, 16) == [reg * 3 for reg in range(0x10, 0x20)]
+        assert [frame[1] for frame in phy.frames] == [MDIO.OP_C45_AD] + [MDIO.OP_C45_RD_INC] * 16
+        with pytest.raises(ValueError):
+            bus.read_c45_range(PAD, 1, 0xFFFF, 2)
+
+    def test_c45_registers_runs(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg for reg in range(16)})
+        bus = make_bus(phy)
+        assert bus.read_c45_registers(PAD, 1, [1, 2, 3, 9]) == [1, 2, 3, 9]
+        assert [frame[1] for frame in phy.frames] == [
+            MDIO.OP_C45_AD, MDIO.OP_C45_RD_INC, MDIO.OP_C45_RD_INC, MDIO.OP_C45_RD_INC, MDIO.OP_C45_AD, MDIO.OP_C45_RD
+        ]
+
+    def test_c22_indirect_mmd(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(7, 0x3C): 0x0006})
+        bus = make_bus(phy)
+        bus.read_c45_register(PAD, 7, 0x3C)
+        # Indirect access through registers 13/14 moves MMD address pointer
+        bus.write_c22_registers(PAD, [0x0D, 0x0E, 0x0D], [0x0007, 0x0010, 0x4007])
+        bus.write_c22_register(PAD, 0x0E, 0x00AA)
+        assert phy.c45[(7, 0x10)] == 0x00AA
+        assert bus.read_c45_register(PAD, 7, 0x3C) == 0x0006
+
+    def test_preamble_suppressed(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7969}, preamble_suppression=True)
+        bus = make_bus(phy, preamble=MDIO.PREAMBLE_SUPPRESSED, flush=False)
+        assert bus.c22_preamble_suppression(PAD)
+        assert bus.read_c22_registers(PAD, [1, 1]) == [0x7969, 0x7969]
+        # PHY without suppression only decodes first frame
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949})
+        bus = make_bus(phy, preamble=MDIO.PREAMBLE_SUPPRESSED, flush=False)
+        assert bus.read_c22_registers(PAD, [1, 1]) == [0x7949, 0xFFFF]
+
+    def test_batch(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={0: 0x1140}, c45={(1, 0): 0x2040})
+        bus = make_bus(phy)
+        with bus.batch() as b:
+            b.read_c22_register(PAD, 0)
+            b.write_c45_register(PAD, 1, 1, 0x0005)
+            b.modify_c22_register(PAD, 0, 0x0800, 0x0800)
+            b.modify_c45_register(PAD, 1, 0, 0x0040, 0x0040)
+            b.read_c45_register(PAD, 1, 1)
+        assert b.results == [0x1140, None, 0x1140, 0x2040, 0x0005]
+        assert phy.c22[0] == 0x1940
+        # Unchanged RMW skips write
+        assert not [frame for frame in phy.frames if frame[1] == MDIO.OP_C45_WR and frame[4] == 0x2040]
+
+    def test_modify(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={0: 0x1140}, c45={(1, 0x9000): 0x00F0})
+        bus = make_bus(phy, track_address=False)
+        assert bus.modify_c45_register(PAD, 1, 0x9000, 0x000F, 0x0005) == 0x00F0
+        assert phy.c45[(1, 0x9000)] == 0x00F5
+        assert [frame[1] for frame in phy.frames] == [MDIO.OP_C45_AD, MDIO.OP_C45_RD, MDIO.OP_C45_WR]
+        # Unchanged bits skip write
+        assert bus.modify_c22_register(PAD, 0, 0x1000, 0x1000) == 0x1140
+        assert phy.frames[-1] == (MDIO.C22_FRAME, MDIO.OP_C22_RD, PAD, 0, None)
+        assert bus.modify_c22_register(PAD, 0, 0x1000, 0x0000) == 0x1140
+        assert phy.c22[0] == 0x0140
+
+    def test_cache(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949, 2: 0x0141})
+        bus = make_bus(phy, cache=MDIOCache())
+        assert bus.read_c22_registers(PAD, [1, 2]) == [0x7949, 0x0141]
+        phy.c22.update({1: 0x796D, 2: 0x0000})
+        nframes = len(phy.frames)
+        assert bus.read_c22_registers(PAD, [1, 2]) == [0x796D, 0x0141]
+        assert len(phy.frames) == nframes + 1
+        bus.write_c22_register(PAD, 2, 0x0022)
+        assert bus.read_c22_register(PAD, 2) == 0x0022
+
+    def test_batch_cache_write_after_read(self, make_bus):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141}, c45={(1, 2): 0x0141})
+        bus = make_bus(phy, cache=MDIOCache())
+        with bus.batch() as b:
+            b.read_c22_register(PAD, 2)
+            b.write_c22_register(PAD, 2, 0x2222)
+            b.read_c45_register(PAD, 1, 2)
+            b.write_c45_register(PAD, 1, 2, 0x3333)
+        assert b.results == [0x0141, None, 0x0141, None]
+        assert bus.read_c22_register(PAD, 2) == phy.c22[2] == 0x2222
+        assert bus.read_c45_register(PAD, 1, 2) == phy.c45[(1, 2)] == 0x3333
+
+    def test_dump_mmd(self, make_bus):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg ^ 0xA5A5 for reg in range(0x100, 0x400)})
+        bus = make_bus(phy)
+        steps = []
+        out = bus.dump_mmd(PAD, 1, 0x100, 0x400, chunk=256, progress=lambda done, total: steps.append(done))
+        assert isinstance(out, array) and out.tolist() == [reg ^ 0xA5A5 for reg in range(0x100, 0x400)]
+        assert steps == [256, 512, 768]
+        assert sum(1 for frame in phy.frames if frame[1] == MDIO.OP_C45_AD) == 3
+        f = io.BytesIO()
+        bus.dump_mmd(PAD, 1, 0x3FE, 0x400, out=f)
+        assert f.getvalue() == bytes((0x5B, 0xA6, 0x5A, 0xA6))
+        with pytest.raises(ValueError):
+            bus.dump_mmd(PAD, 1, 0, 16, out=array('H', bytes(8)))
+
+
+class TestMDIOSPI:
+    def test_single_ioctl(self):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg for reg in range(64)})
+        sim = MDIOSimBus([phy])
+        spi = sim.spi()
+        bus = MDIOSPI(spi=spi, flush=True)
+        bus.open()
+        assert bus.read_c45_register(PAD, 1, 5) == 5
+        assert spi.ioctls == 1
+        assert bus.read_c45_registers(PAD, 1, list(range(0, 64, 2))) == list(range(0, 64, 2))
+        assert spi.ioctls == 2
+
+    def test_reused_message(self):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg for reg in range(8)})
+        sim = MDIOSimBus([phy])
+        spi = sim.spi()
+        bus = MDIOSPI(spi=spi)
+        bus.open()
+        bus.write_c45_register(PAD, 1, 3, 0x00AB)
+        message = spi.message
+        assert bus.read_c45_range(PAD, 1, 0, 8) == [0, 1, 2, 0x00AB, 4, 5, 6, 7]
+        assert spi.message is message
+        # Transmit phases of consecutive frames merge into one segment:
+        # preamble + address frame + preamble + read header, then 16-bit value
+        assert bus.read_c45_register(PAD, 1, 5) == 5
+        assert spi.message is message
+        assert phy.frames[-2:] == [(MDIO.C45_FRAME, MDIO.OP_C45_AD, PAD, 1, 5), (MDIO.C45_FRAME, MDIO.OP_C45_RD, PAD, 1, None)]
+        assert [(tx is not None, length) for tx, length in spi.segments] == [(True, 14), (False, 2)]
+        assert spi.segments[0][0][:4] == b'\xff' * 4
+
+
+class TestFtdiMDIO:
+    def test_single_usb_transfer(self):
+        phy = MDIOSimPHY(PAD, c45={(1, reg): reg for reg in range(256)})
+        sim = MDIOSimBus([phy])
+        mpsse = sim.mpsse()
+        bus = FtdiMDIO(ftdi=mpsse)
+        bus.open()
+        mpsse.writes = 0
+        with bus.batch() as b:
+            b.read_c45_register(PAD, 1, 5)
+            b.write_c22_register(PAD, 4, 0x01E1)
+            b.read_c22_register(PAD, 4)
+        assert b.results == [5, None, 0x01E1]
+        assert mpsse.writes == 1
+        # Reads split below device FIFO
+        assert bus.read_c45_range(PAD, 1, 0, 256) == list(range(256))
+        assert mpsse.writes == 1 + -(-256 // FtdiMDIO.MAX_READS_PER_XFER)
+
+
+class TestMDIOCalibrate:
+    def test_keeps_configured_delays(self):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141})
+        sim = MDIOSimBus([phy])
+        bus = MDIO(clk_pin=0, data_pin=1, path='sim', gpio=sim.gpio_pair(), setup_delay=7, read_delay=3)
+        bus.open()
+        achieved = bus.calibrate(mdc_hz=5000)
+        assert bus.mdc_hz == achieved and 0 < achieved <= 5000
+        assert bus.setup_delay == 7
+        assert bus.read_delay == max(3, bus.clock_delay)
+        assert bus.read_c22_register(PAD, 2) == 0x0141
+
+    def test_warns_when_target_missed(self, monkeypatch):
+        sim = MDIOSimBus([MDIOSimPHY(PAD)])
+        bus = MDIO(clk_pin=0, data_pin=1, path='sim', gpio=sim.gpio_pair())
+        # Every timed run takes 1 us, so bus never slows down to target
+        monkeypatch.setattr(MDIO, '_best_time_ns', staticmethod(lambda fn, arg, repeat=5: 1000.0))
+        with pytest.warns(RuntimeWarning):
+            achieved = bus.calibrate(mdc_hz=1000, max_rounds=3)
+        assert achieved > 1000
+        with pytest.raises(ValueError):
+            bus.calibrate(mdc_hz=1000, max_rounds=0)
+
+
+class TestMDIONative:
+    @pytest.fixture
+    def rpiolib(self, monkeypatch):
+        calls = []
+        lib = types.SimpleNamespace(ready=1, calls=calls, mdio_init=lambda gpiomem: calls.append(gpiomem) or lib.ready)
+        monkeypatch.setattr(mdio, '_native_ready', False)
+        monkeypatch.setattr(mdio, 'rpiolib', lib)
+        return lib
+
+    def make_native(self, phy, **kwargs):
+        sim = MDIOSimBus([phy])
+        return MDIO(clk_pin=0, data_pin=1, path='sim', gpio=sim.gpio_pair(), backend='native',
+                    clock_delay=0, setup_delay=0, read_delay=0, **kwargs)
+
+    def test_missing_extension(self, monkeypatch):
+        monkeypatch.setattr(mdio, 'rpiolib', None)
+        with pytest.warns(RuntimeWarning, match='falling back'):
+            bus = self.make_native(MDIOSimPHY(PAD, c22={2: 0x0141}))
+        assert bus.backend == 'cdev'
+        bus.open()
+        assert bus.read_c22_register(PAD, 2) == 0x0141
+
+    def test_init_failure(self, rpiolib):
+        rpiolib.ready = 0
+        with pytest.warns(RuntimeWarning, match='falling back'):
+            bus = self.make_native(MDIOSimPHY(PAD, c22={2: 0x0141}), gpiomem=False)
+        assert bus.backend == 'cdev' and rpiolib.calls == [0]
+        bus.open()
+        assert bus.read_c22_register(PAD, 2) == 0x0141
 
-    def test_transfer(self):
-        assert True
+    def test_init(self, rpiolib):
+        bus = self.make_native(MDIOSimPHY(PAD))
+        assert bus.backend == 'native' and rpiolib.calls == [1]
+        # Peripherals are mapped once per process
+        self.make_native(MDIOSimPHY(PAD))
+        assert rpiolib.calls == [1]
@@ -0,0 +1,104 @@
+import asyncio
+import pytest
+from pyrpio.mdio import MDIOSPI
+from pyrpio.mdio_async import AsyncMDIO
+from pyrpio.mdio_sim import MDIOSimBus, MDIOSimPHY
+
+PAD = 0x03
+
+
+def make_bus(phy, spi=None):
+    return MDIOSPI(spi=spi or MDIOSimBus([phy]).spi())
+
+
+class TestAsyncMDIO:
+    def test_merged_ops(self):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141}, c45={(1, reg): reg for reg in range(8)})
+        spi = MDIOSimBus([phy]).spi()
+
+        async def run():
+            async with AsyncMDIO(make_bus(phy, spi)) as bus:
+                ioctls = spi.ioctls
+                rst = await asyncio.gather(
+                    bus.read_c22_register(PAD, 2),
+                    bus.write_c45_register(PAD, 1, 3, 0x00AB),
+                    *(bus.read_c45_register(PAD, 1, reg) for reg in range(4)),
+                )
+                return rst, spi.ioctls - ioctls
+
+        rst, ioctls = asyncio.run(run())
+        assert rst == [0x0141, None, 0, 1, 2, 0x00AB]
+        assert ioctls == 1
+
+    def test_invalid_op_fails_alone(self):
+        phy = MDIOSimPHY(PAD, c22={4: 0x0001})
+
+        async def run():
+            async with AsyncMDIO(make_bus(phy)) as bus:
+                return await asyncio.gather(
+                    bus.write_c22_register(PAD, 4, 0x01E1),
+                    bus.write_c22_register(PAD, 0x20, 0x0000),
+                    bus.modify_c22_register(PAD, 4, 0x000F, None),
+                    bus.read_c22_register(PAD, 4),
+                    return_exceptions=True,
+                )
+
+        rst = asyncio.run(run())
+        assert rst[0] is None and rst[3] == 0x01E1
+        assert isinstance(rst[1], ValueError) and isinstance(rst[2], TypeError)
+        assert phy.c22[4] == 0x01E1
+
+    def test_call_error_isolated(self):
+        phy = MDIOSimPHY(PAD, c45={(1, 0x10): 0x1234})
+
+        def fail(bus):
+            raise IOError('boom')
+
+        async def run():
+            async with AsyncMDIO(make_bus(phy)) as bus:
+                return await asyncio.gather(
+                    bus.call(fail),
+                    bus.read_c45_range(PAD, 1, 0x10, 2),
+                    bus.write_c45_register(PAD, 1, 0x11, 0x5678),
+                    return_exceptions=True,
+                )
+
+        rst = asyncio.run(run())
+        assert isinstance(rst[0], IOError)
+        assert rst[1:] == [[0x1234, 0], None]
+        assert phy.c45[(1, 0x11)] == 0x5678
+
+    def test_use_after_close(self):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141})
+
+        async def run():
+            bus = AsyncMDIO(make_bus(phy))
+            await bus.open()
+            # Queued before close still runs
+            read = asyncio.ensure_future(bus.read_c22_register(PAD, 2))
+            await asyncio.sleep(0)
+            await bus.close()
+            with pytest.raises(RuntimeError):
+                await bus.read_c22_register(PAD, 2)
+            with pytest.raises(RuntimeError):
+                await bus.call(lambda bus: None)
+            return await read
+
+        assert asyncio.run(asyncio.wait_for(run(), 5.0)) == 0x0141
+
+    def test_executor_failure(self, monkeypatch):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141})
+
+        def shut_down(executor, fn, *args):
+            raise RuntimeError('cannot schedule new futures after shutdown')
+
+        async def run():
+            bus = AsyncMDIO(make_bus(phy))
+            monkeypatch.setattr(asyncio.get_running_loop(), 'run_in_executor', shut_down)
+            first = await asyncio.gather(bus.read_c22_register(PAD, 2), bus.call(lambda bus: None), return_exceptions=True)
+            # Queue is not left busy, later requests fail too instead of hanging
+            second = await asyncio.gather(bus.read_c22_register(PAD, 2), return_exceptions=True)
+            return first + second
+
+        rst = asyncio.run(asyncio.wait_for(run(), 5.0))
+        assert len(rst) == 3 and all(isinstance(e, RuntimeError) for e in rst)
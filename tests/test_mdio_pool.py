@@ -0,0 +1,85 @@
+import threading
+import pytest
+from pyrpio.mdio import MDIOSPI
+from pyrpio.mdio_pool import MDIOPool
+from pyrpio.mdio_sim import MDIOSimBus, MDIOSimPHY
+
+PAD = 0x03
+
+
+class FailingOpen(MDIOSPI):
+    def open(self):
+        raise IOError('open failed')
+
+
+class FailingClose(MDIOSPI):
+    def close(self):
+        raise IOError('close failed')
+
+
+def sim_spi(phy):
+    return MDIOSimBus([phy]).spi()
+
+
+class TestMDIOPool:
+    def test_submit(self):
+        phy = MDIOSimPHY(PAD, c22={2: 0x0141}, c45={(1, 5): 0x1234})
+        with MDIOPool() as pool:
+            pool.add_bus('a', MDIOSPI, spi=sim_spi(phy))
+            assert pool.names == ['a'] and len(pool) == 1
+            rst = pool.submit('a', [
+                ('read_c22_register', PAD, 2),
+                ('write_c45_register', PAD, 1, 6, 0x5678),
+                ('read_c45_register', PAD, 1, 5),
+                ('modify_c45_register', PAD, 1, 6, 0x00FF, 0x0011),
+            ]).result()
+        assert rst == [0x0141, None, 0x1234, 0x5678]
+        assert phy.c45[(1, 6)] == 0x5611
+        assert len(pool) == 0
+
+    def test_submit_all(self):
+        phys = {name: MDIOSimPHY(PAD, c22={2: pad}) for pad, name in enumerate('abc')}
+        with MDIOPool() as pool:
+            for name, phy in phys.items():
+                pool.add_bus(name, MDIOSPI, spi=sim_spi(phy))
+            futures = pool.submit_all({name: [('read_c22_register', PAD, 2), ('write_c22_register', PAD, 4, 0x01E1)]
+                                       for name in phys})
+            assert {name: future.result() for name, future in futures.items()} == {
+                'a': [0, None], 'b': [1, None], 'c': [2, None]}
+        assert all(phy.c22[4] == 0x01E1 for phy in phys.values())
+
+    def test_errors(self):
+        phy = MDIOSimPHY(PAD, c22={4: 0x0001})
+        with MDIOPool() as pool:
+            pool.add_bus('a', MDIOSPI, spi=sim_spi(phy))
+            with pytest.raises(ValueError):
+                pool.add_bus('a', MDIOSPI, spi=sim_spi(phy))
+            # Invalid ops are rejected before any op runs
+            with pytest.raises(ValueError):
+                pool.submit('a', [('write_c22_register', PAD, 4, 0x01E1), ('read_c22_register', PAD, 0x20)])
+            with pytest.raises(TypeError):
+                pool.submit('a', [('read_c45_register', PAD, 1)])
+            assert phy.c22[4] == 0x0001
+            with pytest.raises(KeyError):
+                pool.submit('b', [])
+            # Error raised by bus function is delivered through future
+            with pytest.raises(AttributeError):
+                pool.call('a', lambda bus: bus.unknown()).result()
+            assert pool.call('a', lambda bus: bus.read_c22_register(PAD, 4)).result() == 0x0001
+
+    def test_add_bus_failure(self):
+        pool = MDIOPool()
+        with pytest.raises(IOError):
+            pool.add_bus('bad', FailingOpen, spi=sim_spi(MDIOSimPHY(PAD)))
+        assert len(pool) == 0
+        # Worker of failed bus is stopped
+        assert not any(t.name.startswith('mdio-bad') for t in threading.enumerate())
+
+    def test_close_failure(self):
+        pool = MDIOPool()
+        pool.add_bus('a', FailingClose, spi=sim_spi(MDIOSimPHY(PAD)))
+        pool.add_bus('b', MDIOSPI, spi=sim_spi(MDIOSimPHY(PAD)))
+        with pytest.raises(IOError, match='close failed'):
+            pool.close()
+        assert len(pool) == 0
+        assert not any(t.name.startswith('mdio-') for t in threading.enumerate())
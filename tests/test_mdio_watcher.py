@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from pyrpio.mdio import MDIOSPI
+from pyrpio.mdio_cache import MDIOCache
+from pyrpio.mdio_sim import MDIOSimBus, MDIOSimPHY
+from pyrpio.mdio_watcher import MDIOWatcher
+
+PAD = 0x03
+
+
+class PollLog(MDIOSPI):
+    """ MDIOSPI recording time of each CLAUSE22 poll. """
+
+    def __init__(self, phy, polls=0):
+        super().__init__(spi=MDIOSimBus([phy]).spi())
+        self.times = []
+        self.polled = threading.Event()
+        self._polls = polls
+
+    def read_c22_registers(self, pad, regs):
+        vals = super().read_c22_registers(pad, regs)
+        self.times.append(time.monotonic())
+        if len(self.times) >= self._polls:
+            self.polled.set()
+        return vals
+
+
+class TestMDIOWatcher:
+    def test_callback(self):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949}, c45={(1, 1): 0x0002, (1, 2): 0x0000})
+        bus = PollLog(phy)
+        bus.open()
+        changes = []
+        seen = threading.Event()
+
+        def callback(change):
+            changes.append(change)
+            seen.set()
+
+        registers = [(PAD, MDIOCache.C22, 1), (PAD, 1, 1), (PAD, 1, 2)]
+        with MDIOWatcher(bus, registers, interval=0.01, fast_interval=0.01, callback=callback) as watcher:
+            assert watcher.running and not changes
+            assert watcher.values == {(PAD, MDIOCache.C22, 1): 0x7949, (PAD, 1, 1): 0x0002, (PAD, 1, 2): 0x0000}
+            phy.c45[(1, 1)] = 0x0006
+            assert seen.wait(1.0)
+        assert [(c.pad, c.dad, c.reg, c.old, c.new) for c in changes] == [(PAD, 1, 1, 0x0002, 0x0006)]
+        assert watcher.values[(PAD, 1, 1)] == 0x0006
+
+    def test_queue(self):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949})
+        bus = PollLog(phy)
+        bus.open()
+
+        async def run():
+            queue = asyncio.Queue()
+            with MDIOWatcher(bus, [(PAD, MDIOCache.C22, 1)], interval=0.01, fast_interval=0.01, queue=queue):
+                phy.c22[1] = 0x796D
+                return await asyncio.wait_for(queue.get(), 1.0)
+
+        change = asyncio.run(run())
+        assert (change.reg, change.old, change.new) == (1, 0x7949, 0x796D)
+
+    def test_intervals(self):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949})
+        # Baseline, change seen after interval, then fast_interval backing off to interval
+        bus = PollLog(phy, polls=5)
+        bus.open()
+        with MDIOWatcher(bus, [(PAD, MDIOCache.C22, 1)], interval=0.32, fast_interval=0.02, backoff=4):
+            phy.c22[1] = 0x796D
+            assert bus.polled.wait(5.0)
+        gaps = [b - a for a, b in zip(bus.times, bus.times[1:])]
+        assert gaps[0] > 0.3
+        assert 0.015 < gaps[1] < gaps[2] < gaps[3]
+        assert gaps[2] > 0.07 and gaps[3] > 0.3
+
+    def test_stop_on_exit(self):
+        phy = MDIOSimPHY(PAD, c22={1: 0x7949})
+        bus = PollLog(phy, polls=3)
+        bus.open()
+        changes = []
+        with MDIOWatcher(bus, [(PAD, MDIOCache.C22, 1)], interval=0.01, fast_interval=0.01,
+                         callback=changes.append) as watcher:
+            assert bus.polled.wait(1.0)
+        assert not watcher.running
+        assert not any(t.name == 'mdio-watcher' for t in threading.enumerate())
+        polls = len(bus.times)
+        phy.c22[1] = 0x796D
+        time.sleep(0.05)
+        assert len(bus.times) == polls and not changes